@@ -0,0 +1,82 @@
+"""
+Per-endpoint query budgets with cancellation on client disconnect.
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, TypeVar
+
+from fastapi import HTTPException, Request
+
+from ..config import get_settings
+from ..database import QueryTimeoutError, query_timeout
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Non-standard status used by proxies for requests closed by the client
+CLIENT_CLOSED_REQUEST = 499
+
+
+def endpoint_timeout(operation: str) -> float:
+    """Return the query timeout configured for an endpoint operation."""
+    settings = get_settings()
+    return getattr(settings, f"{operation}_query_timeout", settings.neo4j_query_timeout)
+
+
+async def run_with_budget(
+    request: Request, operation: str, awaitable: Awaitable[T]
+) -> T:
+    """
+    Run a database-bound awaitable within the endpoint's query budget.
+
+    Every query issued by ``awaitable`` carries the transaction timeout
+    configured for ``operation`` (``<operation>_query_timeout``), so Neo4j
+    terminates it server-side. If the HTTP client disconnects first, the task
+    is cancelled, which closes the driver connection and rolls back the
+    transaction. A timed-out query becomes a structured 504 response.
+    """
+    settings = get_settings()
+    timeout = endpoint_timeout(operation)
+    started = time.perf_counter()
+
+    # The task copies the current context, including the query timeout
+    with query_timeout(timeout):
+        task = asyncio.ensure_future(awaitable)
+
+    try:
+        while True:
+            done, _ = await asyncio.wait(
+                {task}, timeout=settings.disconnect_poll_interval
+            )
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                logger.warning(
+                    f"Client disconnected, cancelled {operation} after "
+                    f"{time.perf_counter() - started:.2f}s"
+                )
+                raise HTTPException(
+                    status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request"
+                )
+    except QueryTimeoutError as e:
+        logger.warning(f"{operation} exceeded its query budget: {e}")
+        raise HTTPException(
+            status_code=504,
+            detail={
+                "error": "query_timeout",
+                "operation": operation,
+                "message": str(e),
+                "timeout_seconds": e.timeout,
+                "elapsed_seconds": round(time.perf_counter() - started, 3),
+                "partial_progress": {
+                    "rows_received": e.rows_received,
+                    "query_elapsed_seconds": round(e.elapsed, 3),
+                },
+            },
+        )
+    finally:
+        if not task.done():
+            task.cancel()
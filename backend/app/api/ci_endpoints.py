@@ -2,19 +2,21 @@
 Configuration Item API endpoints.
 """
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 
-from fastapi import APIRouter, HTTPException, Depends, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from pydantic import BaseModel, Field
 
-from ..models.ci import CI, CIType
+from ..models.ci import CI, CI_SUMMARY_FIELDS, CISearchResult, CISummary, CIType
 from ..models.base import CriticalityLevel, EnvironmentType, LifecycleState
 from ..models.relationships import RelationshipType
+from ..config import get_settings
+from ..services import queries
 from ..services.ci_service import get_ci_service, CIService
-from ..services.relationship_service import (
-    get_relationship_service,
-    RelationshipService,
-)
+from ..services.pagination import InvalidCursorError
+from .budget import run_with_budget
+from .responses import FastJSONResponse
+from .streaming import ndjson_response
 
 logger = logging.getLogger(__name__)
 
@@ -75,107 +77,192 @@ class CIUpdateRequest(BaseModel):
     custom_attributes: Optional[Dict[str, Any]] = None
 
 
+class CIBulkCreateRequest(BaseModel):
+    """Request model for creating many CIs at once."""
+
+    # Items are validated one by one, so one invalid CI does not reject the batch
+    cis: List[Dict[str, Any]] = Field(..., min_length=1)
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of a single item of a bulk request."""
+
+    index: int
+    id: Optional[str] = None
+    status: str
+    error: Optional[str] = None
+
+
+class CIBulkCreateResponse(BaseModel):
+    """Response model for bulk CI creation."""
+
+    total: int
+    created: int
+    failed: int
+    results: List[BulkItemResult]
+
+
+class CIBatchGetRequest(BaseModel):
+    """Request model for getting many CIs by ID."""
+
+    ids: List[str] = Field(..., min_length=1)
+
+
+class CIBatchGetResponse(BaseModel):
+    """Response model for getting many CIs by ID."""
+
+    cis: List[CI]
+    missing: List[str]
+
+
 class CIListResponse(BaseModel):
     """Response model for CI list."""
 
-    cis: List[CI]
-    total_count: int
+    # CISummary comes first: it forbids extra fields, so whole CIs never match it
+    cis: List[Union[CISummary, CI]]
+    total_count: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
+
+
+class FacetValue(BaseModel):
+    """Number of CIs having one value of a facet."""
+
+    value: Optional[str]
+    count: int
+
+
+class CIFacetsResponse(BaseModel):
+    """Response model for CI facet counts."""
+
+    facets: Dict[str, List[FacetValue]]
+    total_count: int
+    graph_version: int
+
+
+_FIELDS_DESCRIPTION = (
+    "Comma-separated CI fields to return instead of whole CIs (id and name are "
+    "always included): " + ", ".join(CI_SUMMARY_FIELDS)
+)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a sparse fieldset parameter, rejecting unknown fields with a 400."""
+    if fields is None:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in CI_SUMMARY_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return names
 
 
 @router.post("/", response_model=CI, status_code=201)
 async def create_ci(
     ci_data: CICreateRequest,
     ci_service: CIService = Depends(get_ci_service),
-    relationship_service: RelationshipService = Depends(get_relationship_service),
 ) -> CI:
     """Create a new Configuration Item with optional relationships."""
     try:
         # Séparer les relations des données du CI
-        relationships = ci_data.relationships
         ci_dict = ci_data.model_dump(exclude_unset=True, exclude={"relationships"})
+        if not ci_data.relationships:
+            return await ci_service.create_ci(ci_dict)
 
-        # Créer le CI
-        ci = await ci_service.create_ci(ci_dict)
-
-        # Créer les relations si spécifiées
-        if relationships:
-            for rel_data in relationships:
-                try:
-                    await relationship_service.create_relationship(
-                        from_ci_id=ci.id,
-                        to_ci_id=rel_data.target_ci_id,
-                        relationship_type=rel_data.relationship_type,
-                        properties={"description": rel_data.description}
-                        if rel_data.description
-                        else None,
-                    )
-                except Exception as rel_error:
-                    logger.warning(
-                        f"Failed to create relationship from {ci.id} to {rel_data.target_ci_id}: {rel_error}"
-                    )
-                    # Continue creating other relationships even if one fails
-
-        return ci
+        # Créer le CI et ses relations dans une seule transaction
+        relationships = [rel.model_dump() for rel in ci_data.relationships]
+        result = await ci_service.create_ci_with_relationships(ci_dict, relationships)
+        return result["ci"]
     except Exception as e:
         logger.error(f"Error creating CI: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to create CI: {str(e)}")
 
 
+@router.post("/bulk", response_model=CIBulkCreateResponse)
+async def create_cis_bulk(
+    bulk_data: CIBulkCreateRequest,
+    ci_service: CIService = Depends(get_ci_service),
+) -> CIBulkCreateResponse:
+    """
+    Create many Configuration Items in batched transactions.
+
+    Each item takes the same fields as ``POST /cis/``; relationships are not
+    created, use ``POST /relationships/bulk`` once the CIs exist. Invalid or
+    failed items are reported per item without aborting the rest of the batch.
+    """
+    max_items = get_settings().bulk_max_items
+    if len(bulk_data.cis) > max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many CIs in one request: {len(bulk_data.cis)} > {max_items}",
+        )
+
+    try:
+        results = await ci_service.create_cis(bulk_data.cis)
+        created = sum(1 for result in results if result["status"] == "created")
+        return CIBulkCreateResponse(
+            total=len(results),
+            created=created,
+            failed=len(results) - created,
+            results=results,
+        )
+    except Exception as e:
+        logger.error(f"Error bulk creating CIs: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to create CIs: {str(e)}")
+
+
+@router.post("/batch-get", response_model=CIBatchGetResponse)
+async def get_cis_batch(
+    request: Request,
+    batch: CIBatchGetRequest,
+    ci_service: CIService = Depends(get_ci_service),
+) -> CIBatchGetResponse:
+    """
+    Get many Configuration Items by ID in a single query.
+
+    CIs are returned in the order of the requested IDs, each ID once; IDs
+    that do not exist are listed in ``missing``.
+    """
+    max_ids = get_settings().batch_get_max_ids
+    if len(batch.ids) > max_ids:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many IDs in one request: {len(batch.ids)} > {max_ids}",
+        )
+
+    try:
+        cis, missing = await run_with_budget(
+            request, "list", ci_service.get_cis(batch.ids)
+        )
+        return FastJSONResponse({"cis": cis, "missing": missing})
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting CIs by ID: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve CIs: {str(e)}")
+
+
 @router.post("/with-relationships", response_model=Dict[str, Any], status_code=201)
 async def create_ci_with_relationships(
     ci_data: CICreateRequest,
     ci_service: CIService = Depends(get_ci_service),
-    relationship_service: RelationshipService = Depends(get_relationship_service),
 ) -> Dict[str, Any]:
     """Create a new Configuration Item with relationships in a single transaction."""
-    created_relationships = []
-    failed_relationships = []
-
     try:
         # Séparer les relations des données du CI
-        relationships = ci_data.relationships
         ci_dict = ci_data.model_dump(exclude_unset=True, exclude={"relationships"})
+        relationships = [rel.model_dump() for rel in ci_data.relationships]
 
-        # Créer le CI
-        ci = await ci_service.create_ci(ci_dict)
-
-        # Créer les relations si spécifiées
-        if relationships:
-            for rel_data in relationships:
-                try:
-                    relationship = await relationship_service.create_relationship(
-                        from_ci_id=ci.id,
-                        to_ci_id=rel_data.target_ci_id,
-                        relationship_type=rel_data.relationship_type,
-                        properties={"description": rel_data.description}
-                        if rel_data.description
-                        else None,
-                    )
-                    created_relationships.append(
-                        {
-                            "target_ci_id": rel_data.target_ci_id,
-                            "relationship_type": rel_data.relationship_type.value,
-                            "description": rel_data.description,
-                        }
-                    )
-                except Exception as rel_error:
-                    logger.warning(
-                        f"Failed to create relationship from {ci.id} to {rel_data.target_ci_id}: {rel_error}"
-                    )
-                    failed_relationships.append(
-                        {
-                            "target_ci_id": rel_data.target_ci_id,
-                            "relationship_type": rel_data.relationship_type.value,
-                            "error": str(rel_error),
-                        }
-                    )
+        # Créer le CI et ses relations dans une seule transaction
+        result = await ci_service.create_ci_with_relationships(ci_dict, relationships)
 
         return {
-            "ci": ci.model_dump(),
-            "created_relationships": created_relationships,
-            "failed_relationships": failed_relationships,
+            "ci": result["ci"].model_dump(),
+            "created_relationships": result["created_relationships"],
+            "failed_relationships": result["failed_relationships"],
             "success": True,
         }
     except Exception as e:
@@ -185,6 +272,7 @@ async def create_ci_with_relationships(
 
 @router.get("/", response_model=CIListResponse)
 async def get_cis(
+    request: Request,
     ci_type: Optional[CIType] = Query(None, description="Filter by CI type"),
     environment: Optional[EnvironmentType] = Query(
         None, description="Filter by environment"
@@ -193,44 +281,168 @@ async def get_cis(
         None, description="Filter by criticality"
     ),
     limit: int = Query(100, ge=1, le=1000, description="Number of CIs to return"),
-    offset: int = Query(0, ge=0, description="Number of CIs to skip"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the next_cursor field of the previous page"
+    ),
+    offset: int = Query(
+        0,
+        ge=0,
+        deprecated=True,
+        description="Number of CIs to skip, use cursor instead",
+    ),
+    count: str = Query(
+        "exact",
+        pattern="^(none|exact|estimated)$",
+        description="How to count matching CIs: none, exact or estimated",
+    ),
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
     ci_service: CIService = Depends(get_ci_service),
 ) -> CIListResponse:
-    """Get all Configuration Items with optional filters."""
-    try:
-        cis = await ci_service.get_all_cis(
-            ci_type=ci_type,
-            environment=environment,
-            criticality=criticality,
-            limit=limit,
-            offset=offset,
+    """
+    Get all Configuration Items with optional filters.
+
+    CIs are ordered by name. Follow ``next_cursor`` to get the next page;
+    ``offset`` still works but deep offsets are slow on large inventories.
+
+    ``total_count`` counts the CIs matching the filters. ``count=exact``
+    computes it in the same query as the page, ``count=estimated`` reads it
+    from database statistics in constant time and ``count=none`` omits it.
+    With ``fields``, each CI only holds the requested fields.
+    """
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=400, detail="Use either cursor or offset, not both"
         )
+    field_names = _parse_fields(fields)
 
-        total_count = await ci_service.get_ci_count()
+    try:
+        cis, next_cursor, total_count = await run_with_budget(
+            request,
+            "list",
+            ci_service.get_all_cis(
+                ci_type=ci_type,
+                environment=environment,
+                criticality=criticality,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                count=count,
+                fields=field_names,
+            ),
+        )
 
-        return CIListResponse(
-            cis=cis, total_count=total_count, limit=limit, offset=offset
+        # Shaped like CIListResponse, rendered without revalidating every CI
+        return FastJSONResponse(
+            {
+                "cis": cis,
+                "total_count": total_count,
+                "limit": limit,
+                "offset": offset,
+                "next_cursor": next_cursor,
+            }
         )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting CIs: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve CIs: {str(e)}")
 
 
-@router.get("/search", response_model=List[CI])
+@router.get("/search", response_model=List[Union[CISummary, CISearchResult]])
 async def search_cis(
+    request: Request,
+    response: Response,
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(50, ge=1, le=100, description="Number of results to return"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header of the previous page"
+    ),
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
     ci_service: CIService = Depends(get_ci_service),
-) -> List[CI]:
-    """Search Configuration Items by text."""
+) -> List[Union[CISummary, CISearchResult]]:
+    """
+    Search Configuration Items by text, most relevant first.
+
+    Matches name, description, hostname, FQDN, IP address, vendor and serial
+    number, with prefix and fuzzy matching. When more results are available
+    the ``X-Next-Cursor`` response header holds the cursor of the next page.
+    With ``fields``, each result only holds the requested fields and its score.
+
+    Paging is best-effort: the cursor holds the relevance score of the last
+    result, and scores shift as CIs are written and the index changes, so
+    paging while CIs are written can skip or repeat results.
+    """
+    field_names = _parse_fields(fields)
+
     try:
-        cis = await ci_service.search_cis(q, limit)
+        cis, next_cursor = await run_with_budget(
+            request, "search", ci_service.search_cis(q, limit, cursor, field_names)
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return cis
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error searching CIs: {e}")
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
+@router.get("/facets", response_model=CIFacetsResponse)
+async def get_ci_facets(
+    request: Request,
+    facet: Optional[List[str]] = Query(
+        None,
+        description="Facets to count, repeat for several (default: all of "
+        + ", ".join(queries.CI_FACETS)
+        + ")",
+    ),
+    ci_type: Optional[CIType] = Query(None, description="Filter by CI type"),
+    environment: Optional[EnvironmentType] = Query(
+        None, description="Filter by environment"
+    ),
+    criticality: Optional[CriticalityLevel] = Query(
+        None, description="Filter by criticality"
+    ),
+    ci_service: CIService = Depends(get_ci_service),
+) -> CIFacetsResponse:
+    """
+    Count Configuration Items by value of each facet, with optional filters.
+
+    All facets are computed in a single pass; results are cached until the
+    next write to the graph.
+    """
+    unknown = [name for name in facet or [] if name not in queries.CI_FACETS]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown facets: {', '.join(unknown)}"
+        )
+
+    try:
+        facet_counts = await run_with_budget(
+            request,
+            "list",
+            ci_service.get_ci_facets(
+                facets=facet,
+                ci_type=ci_type,
+                environment=environment,
+                criticality=criticality,
+            ),
+        )
+        return CIFacetsResponse(**facet_counts)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error counting CI facets: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to count facets: {str(e)}"
+        )
+
+
 @router.get("/count", response_model=Dict[str, int])
 async def get_ci_count(
     ci_service: CIService = Depends(get_ci_service),
@@ -244,6 +456,31 @@ async def get_ci_count(
         raise HTTPException(status_code=500, detail=f"Failed to get count: {str(e)}")
 
 
+@router.get("/stream")
+async def stream_cis(
+    ci_type: Optional[CIType] = Query(None, description="Filter by CI type"),
+    environment: Optional[EnvironmentType] = Query(
+        None, description="Filter by environment"
+    ),
+    criticality: Optional[CriticalityLevel] = Query(
+        None, description="Filter by criticality"
+    ),
+    batch_size: Optional[int] = Query(
+        None, ge=1, le=10000, description="Records fetched per round trip"
+    ),
+    ci_service: CIService = Depends(get_ci_service),
+):
+    """Stream all matching Configuration Items as newline-delimited JSON."""
+    return ndjson_response(
+        ci_service.stream_all_cis(
+            ci_type=ci_type,
+            environment=environment,
+            criticality=criticality,
+            batch_size=batch_size,
+        )
+    )
+
+
 @router.get("/{ci_id}", response_model=CI)
 async def get_ci(ci_id: str, ci_service: CIService = Depends(get_ci_service)) -> CI:
     """Get a Configuration Item by ID."""
@@ -4,14 +4,19 @@ Relationship and Impact Analysis API endpoints.
 import logging
 from typing import List, Optional, Dict, Any
 
-from fastapi import APIRouter, HTTPException, Depends, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from pydantic import BaseModel, Field, field_validator
 
+from ..config import get_settings
 from ..models.relationships import RelationshipType, Relationship
+from ..services.pagination import InvalidCursorError
 from ..services.relationship_service import (
     get_relationship_service,
     RelationshipService,
 )
+from .budget import run_with_budget
+from .responses import FastJSONResponse
+from .streaming import ndjson_response
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +34,67 @@ class RelationshipCreateRequest(BaseModel):
     description: Optional[str] = None
 
 
+# Values Neo4j can store as a property, alone or in a list of one type
+_PROPERTY_TYPES = (bool, int, float, str)
+
+
+def _is_property_value(value: Any) -> bool:
+    """Whether a value can be stored as a Neo4j property (null removes it)."""
+    if value is None or isinstance(value, _PROPERTY_TYPES):
+        return True
+    if isinstance(value, list):
+        kinds = {type(item) for item in value}
+        return len(kinds) <= 1 and kinds <= set(_PROPERTY_TYPES)
+    return False
+
+
+class RelationshipBulkItem(BaseModel):
+    """A single edge of a bulk relationship request."""
+
+    from_ci_id: str
+    to_ci_id: str
+    relationship_type: RelationshipType
+    description: Optional[str] = None
+    properties: Dict[str, Any] = {}
+
+    @field_validator("properties")
+    @classmethod
+    def validate_properties(cls, v):
+        # One unstorable value would make Neo4j reject the item's whole chunk
+        invalid = [key for key, value in v.items() if not _is_property_value(value)]
+        if invalid:
+            raise ValueError(
+                "Property values must be strings, numbers, booleans or lists of "
+                f"one of those types: {', '.join(invalid)}"
+            )
+        return v
+
+
+class RelationshipBulkCreateRequest(BaseModel):
+    """Request model for creating many relationships at once."""
+
+    relationships: List[RelationshipBulkItem] = Field(..., min_length=1)
+
+
+class RelationshipBulkItemResult(BaseModel):
+    """Outcome of a single edge of a bulk relationship request."""
+
+    index: int
+    id: Optional[str] = None
+    status: str
+    missing: List[str] = []
+    error: Optional[str] = None
+
+
+class RelationshipBulkCreateResponse(BaseModel):
+    """Response model for bulk relationship creation."""
+
+    total: int
+    created: int
+    failed: int
+    results: List[RelationshipBulkItemResult]
+
+
 class ImpactAnalysisResponse(BaseModel):
     """Response model for impact analysis."""
 
@@ -40,6 +106,24 @@ class ImpactAnalysisResponse(BaseModel):
     max_depth_analyzed: int
 
 
+class ImpactBatchRequest(BaseModel):
+    """Request model for the impact analysis of several failing CIs."""
+
+    ci_ids: List[str] = Field(..., min_length=1)
+    max_depth: int = Field(3, ge=1, le=5)
+
+
+class ImpactBatchResponse(BaseModel):
+    """Response model for the impact analysis of several failing CIs."""
+
+    source_cis: List[str]
+    total_impacted: int
+    impacted_cis: List[Dict[str, Any]]
+    criticality_breakdown: Dict[str, int]
+    risk_score: float
+    max_depth_analyzed: int
+
+
 class DependencyAnalysisResponse(BaseModel):
     """Response model for dependency analysis."""
 
@@ -60,52 +144,45 @@ class BusFactorResponse(BaseModel):
 # Relationship management endpoints
 @router.get("/relationships", response_model=List[Dict[str, Any]])
 async def get_all_relationships(
+    request: Request,
     limit: int = Query(
         100, ge=1, le=1000, description="Maximum number of relationships to return"
     ),
-    offset: int = Query(0, ge=0, description="Number of relationships to skip"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header of the previous page"
+    ),
+    offset: int = Query(
+        0,
+        ge=0,
+        deprecated=True,
+        description="Number of relationships to skip, use cursor instead",
+    ),
     relationship_service: RelationshipService = Depends(get_relationship_service),
 ):
-    """Get all relationships in the system."""
-    try:
-        connection = await relationship_service._get_connection()
-
-        query = """
-        MATCH (from_ci:CI)-[r:RELATED]->(to_ci:CI)
-        RETURN r.id as rel_id, r.type as rel_type, r.created_at as rel_created_at,
-               from_ci.id as from_ci_id, from_ci.name as from_ci_name,
-               to_ci.id as to_ci_id, to_ci.name as to_ci_name
-        ORDER BY r.created_at DESC
-        SKIP $offset LIMIT $limit
-        """
-
-        result = await connection.execute_query(
-            query, {"offset": offset, "limit": limit}
-        )
-        relationships = []
-
-        for record in result:
-            relationships.append(
-                {
-                    "id": record.get("rel_id"),
-                    "type": record.get("rel_type"),
-                    "from_ci": {
-                        "id": record.get("from_ci_id"),
-                        "name": record.get("from_ci_name"),
-                    },
-                    "to_ci": {
-                        "id": record.get("to_ci_id"),
-                        "name": record.get("to_ci_name"),
-                    },
-                    "created_at": str(record.get("rel_created_at"))
-                    if record.get("rel_created_at")
-                    else None,
-                }
-            )
+    """
+    Get all relationships in the system, most recent first.
 
-        logger.info(f"Retrieved {len(relationships)} relationships")
-        return relationships
+    When more relationships are available the ``X-Next-Cursor`` response
+    header holds the cursor of the next page. The listing shares the CI
+    listing's query budget (``list_query_timeout``).
+    """
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=400, detail="Use either cursor or offset, not both"
+        )
 
+    try:
+        relationships, next_cursor = await run_with_budget(
+            request,
+            "list",
+            relationship_service.get_all_relationships(limit, offset, cursor),
+        )
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return FastJSONResponse(relationships, headers=headers)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting all relationships: {e}")
         raise HTTPException(
@@ -113,6 +190,19 @@ async def get_all_relationships(
         )
 
 
+@router.get("/relationships/stream")
+async def stream_all_relationships(
+    batch_size: Optional[int] = Query(
+        None, ge=1, le=10000, description="Records fetched per round trip"
+    ),
+    relationship_service: RelationshipService = Depends(get_relationship_service),
+):
+    """Stream all relationships in the system as newline-delimited JSON."""
+    return ndjson_response(
+        relationship_service.stream_all_relationships(batch_size=batch_size)
+    )
+
+
 @router.post("/relationships", response_model=Dict[str, str], status_code=201)
 async def create_relationship(
     relationship_data: RelationshipCreateRequest,
@@ -139,6 +229,57 @@ async def create_relationship(
         )
 
 
+@router.post("/relationships/bulk", response_model=RelationshipBulkCreateResponse)
+async def create_relationships_bulk(
+    bulk_data: RelationshipBulkCreateRequest,
+    relationship_service: RelationshipService = Depends(get_relationship_service),
+) -> RelationshipBulkCreateResponse:
+    """
+    Create many relationships in batched transactions.
+
+    Edges whose source or target CI does not exist are reported per item
+    (status ``missing_endpoints``) without aborting the rest of the batch.
+    """
+    max_items = get_settings().bulk_max_items
+    if len(bulk_data.relationships) > max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                "Too many relationships in one request: "
+                f"{len(bulk_data.relationships)} > {max_items}"
+            ),
+        )
+
+    try:
+        edges = []
+        for item in bulk_data.relationships:
+            properties = dict(item.properties)
+            if item.description:
+                properties["description"] = item.description
+            edges.append(
+                {
+                    "from_ci_id": item.from_ci_id,
+                    "to_ci_id": item.to_ci_id,
+                    "relationship_type": item.relationship_type,
+                    "properties": properties,
+                }
+            )
+
+        results = await relationship_service.create_relationships(edges)
+        created = sum(1 for result in results if result["status"] == "created")
+        return RelationshipBulkCreateResponse(
+            total=len(results),
+            created=created,
+            failed=len(results) - created,
+            results=results,
+        )
+    except Exception as e:
+        logger.error(f"Error bulk creating relationships: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to create relationships: {str(e)}"
+        )
+
+
 @router.get("/cis/{ci_id}/relationships", response_model=List[Dict[str, Any]])
 async def get_ci_relationships(
     ci_id: str,
@@ -178,12 +319,57 @@ async def delete_relationship(
 
 
 # Impact analysis endpoints
+@router.post("/impact/batch", response_model=ImpactBatchResponse)
+async def analyze_impact_batch(
+    request: Request,
+    batch: ImpactBatchRequest,
+    relationship_service: RelationshipService = Depends(get_relationship_service),
+):
+    """
+    Analyze the combined impact of several CIs failing together.
+
+    Computes the blast radius of an incident spanning several CIs (a rack, a
+    switch and its hosts) in one traversal. Each impacted CI is returned and
+    counted in the risk score once, with its minimal distance to any failing
+    CI and the ``sources`` among them that reach it. Failing CIs are not
+    listed as impacted.
+    """
+    max_sources = get_settings().impact_batch_max_sources
+    if len(batch.ci_ids) > max_sources:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many CIs in one request: {len(batch.ci_ids)} > {max_sources}",
+        )
+
+    try:
+        analysis = await run_with_budget(
+            request,
+            "impact",
+            relationship_service.get_batch_impact_analysis(
+                batch.ci_ids, batch.max_depth
+            ),
+        )
+        return FastJSONResponse(analysis)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error performing impact analysis for CIs {batch.ci_ids}: {e}")
+        raise HTTPException(status_code=500, detail=f"Impact analysis failed: {str(e)}")
+
+
 @router.get("/impact/{ci_id}", response_model=ImpactAnalysisResponse)
 async def analyze_impact(
     ci_id: str,
+    request: Request,
     max_depth: int = Query(
         3, ge=1, le=5, description="Maximum relationship depth to analyze"
     ),
+    traversal: str = Query(
+        "paths",
+        pattern="^(paths|distinct)$",
+        description="paths: one entry per dependency path; "
+        "distinct: each CI once, at its minimal distance",
+    ),
     relationship_service: RelationshipService = Depends(get_relationship_service),
 ):
     """
@@ -191,21 +377,58 @@ async def analyze_impact(
 
     This endpoint analyzes what other CIs would be affected if the specified CI fails.
     It follows dependency chains to understand the blast radius of potential outages.
+    Use ``traversal=distinct`` on dense graphs: each impacted CI is returned and
+    counted in the risk score once, instead of once per path.
     """
     try:
-        analysis = await relationship_service.get_impact_analysis(ci_id, max_depth)
-        return ImpactAnalysisResponse(**analysis)
+        analysis = await run_with_budget(
+            request,
+            "impact",
+            relationship_service.get_impact_analysis(ci_id, max_depth, traversal),
+        )
+        return FastJSONResponse(analysis)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error performing impact analysis for CI {ci_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Impact analysis failed: {str(e)}")
 
 
+@router.get("/impact/{ci_id}/stream")
+async def stream_impact(
+    ci_id: str,
+    max_depth: int = Query(
+        3, ge=1, le=5, description="Maximum relationship depth to analyze"
+    ),
+    batch_size: Optional[int] = Query(
+        None, ge=1, le=10000, description="Records fetched per round trip"
+    ),
+    relationship_service: RelationshipService = Depends(get_relationship_service),
+):
+    """
+    Stream the CIs impacted by a CI failure as newline-delimited JSON.
+
+    Emits one line per traversal path without sorting or aggregation, for
+    blast radiuses too large to return in a single response.
+    """
+    return ndjson_response(
+        relationship_service.stream_impact_analysis(ci_id, max_depth, batch_size)
+    )
+
+
 @router.get("/dependencies/{ci_id}", response_model=DependencyAnalysisResponse)
 async def analyze_dependencies(
     ci_id: str,
+    request: Request,
     max_depth: int = Query(
         3, ge=1, le=5, description="Maximum relationship depth to analyze"
     ),
+    traversal: str = Query(
+        "paths",
+        pattern="^(paths|distinct)$",
+        description="paths: one entry per dependency path; "
+        "distinct: each CI once, at its minimal distance",
+    ),
     relationship_service: RelationshipService = Depends(get_relationship_service),
 ):
     """
@@ -213,10 +436,17 @@ async def analyze_dependencies(
 
     This endpoint shows what other CIs this CI depends on to function properly.
     Useful for understanding potential single points of failure.
+    ``traversal=distinct`` returns each dependency once.
     """
     try:
-        analysis = await relationship_service.get_dependencies(ci_id, max_depth)
-        return DependencyAnalysisResponse(**analysis)
+        analysis = await run_with_budget(
+            request,
+            "dependencies",
+            relationship_service.get_dependencies(ci_id, max_depth, traversal),
+        )
+        return FastJSONResponse(analysis)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error performing dependency analysis for CI {ci_id}: {e}")
         raise HTTPException(
@@ -224,8 +454,26 @@ async def analyze_dependencies(
         )
 
 
+@router.get("/dependencies/{ci_id}/stream")
+async def stream_dependencies(
+    ci_id: str,
+    max_depth: int = Query(
+        3, ge=1, le=5, description="Maximum relationship depth to analyze"
+    ),
+    batch_size: Optional[int] = Query(
+        None, ge=1, le=10000, description="Records fetched per round trip"
+    ),
+    relationship_service: RelationshipService = Depends(get_relationship_service),
+):
+    """Stream the dependencies of a CI as newline-delimited JSON."""
+    return ndjson_response(
+        relationship_service.stream_dependencies(ci_id, max_depth, batch_size)
+    )
+
+
 @router.get("/busfactor", response_model=BusFactorResponse)
 async def analyze_busfactor(
+    request: Request,
     relationship_service: RelationshipService = Depends(get_relationship_service),
 ):
     """
@@ -235,8 +483,12 @@ async def analyze_busfactor(
     single points of failure. Higher dependency counts indicate higher risk.
     """
     try:
-        analysis = await relationship_service.get_busfactor_analysis()
+        analysis = await run_with_budget(
+            request, "busfactor", relationship_service.get_busfactor_analysis()
+        )
         return BusFactorResponse(**analysis)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error performing bus factor analysis: {e}")
         raise HTTPException(
@@ -246,44 +498,16 @@ async def analyze_busfactor(
 
 @router.get("/graph/stats", response_model=Dict[str, Any])
 async def get_graph_statistics(
+    request: Request,
     relationship_service: RelationshipService = Depends(get_relationship_service),
 ):
     """Get overall graph statistics."""
     try:
-        connection = await relationship_service._get_connection()
-
-        # Get basic counts
-        stats_query = """
-        MATCH (ci:CI)
-        OPTIONAL MATCH (ci)-[r:RELATED]-()
-        RETURN 
-            count(DISTINCT ci) as total_cis,
-            count(r) as total_relationships,
-            count(DISTINCT r.type) as relationship_types
-        """
-
-        result = await connection.execute_query(stats_query)
-        stats = result[0] if result else {}
-
-        # Get relationship type breakdown
-        type_query = """
-        MATCH ()-[r:RELATED]-()
-        RETURN r.type as relationship_type, count(r) as count
-        ORDER BY count DESC
-        """
-
-        type_result = await connection.execute_query(type_query)
-        relationship_breakdown = {
-            record["relationship_type"]: record["count"] for record in type_result
-        }
-
-        return {
-            "total_cis": stats.get("total_cis", 0),
-            "total_relationships": stats.get("total_relationships", 0),
-            "unique_relationship_types": stats.get("relationship_types", 0),
-            "relationship_type_breakdown": relationship_breakdown,
-        }
-
+        return await run_with_budget(
+            request, "graph_stats", relationship_service.get_graph_statistics()
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting graph statistics: {e}")
         raise HTTPException(
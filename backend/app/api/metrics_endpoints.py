@@ -0,0 +1,230 @@
+"""
+Metrics API endpoints.
+"""
+import logging
+from typing import Dict, Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from ..database import get_neo4j_connection, Neo4jConnection
+from ..metrics import render_prometheus
+from ..services.graph_projection import graph_projection
+from ..services.relationship_service import (
+    get_relationship_service,
+    RelationshipService,
+)
+
+logger = logging.getLogger(__name__)
+
+# API Router
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+def _database_metrics(connection: Neo4jConnection) -> Dict[str, Any]:
+    """Collect pool, acquisition and executor metrics for the connection."""
+    return {
+        "execution_mode": connection.execution_mode,
+        "pool": connection.pool_stats(),
+        **connection.metrics.snapshot(),
+        "executor": connection.executor_stats.snapshot(),
+    }
+
+
+def _render_database_metrics(metrics: Dict[str, Any]) -> str:
+    """Render database metrics in the Prometheus text format."""
+    pool = metrics["pool"]
+    gauges = [
+        (
+            "constellation_neo4j_pool_connections",
+            "Driver pool connections by state",
+            {"address": address, "state": state},
+            counts[state],
+        )
+        for address, counts in pool["addresses"].items()
+        for state in ("in_use", "idle")
+    ]
+    if pool["max_pool_size"] is not None:
+        gauges.append(
+            (
+                "constellation_neo4j_pool_max_size",
+                "Maximum connections per server address",
+                None,
+                pool["max_pool_size"],
+            )
+        )
+    gauges.append(
+        (
+            "constellation_neo4j_executor_in_flight",
+            "Queries admitted to the executor thread pool",
+            None,
+            metrics["executor"]["in_flight"],
+        )
+    )
+
+    counters = [
+        (
+            "constellation_neo4j_acquisition_timeouts_total",
+            "Connection acquisitions that timed out",
+            metrics["acquisition_timeouts"],
+        ),
+        (
+            "constellation_neo4j_query_timeouts_total",
+            "Transactions terminated by their timeout",
+            metrics["query_timeouts"],
+        ),
+        (
+            "constellation_neo4j_query_errors_total",
+            "Queries that raised an error",
+            metrics["query_errors"],
+        ),
+    ]
+
+    histograms = [
+        (
+            "constellation_neo4j_acquisition_wait_seconds",
+            "Time waiting for a connection and transaction start",
+            metrics["acquisition_wait_seconds"],
+        ),
+        (
+            "constellation_neo4j_query_duration_seconds",
+            "Time spent running transaction functions",
+            metrics["query_duration_seconds"],
+        ),
+    ]
+
+    return render_prometheus(gauges, counters, histograms)
+
+
+def _render_impact_cache_metrics(stats: Dict[str, Any]) -> str:
+    """Render impact cache metrics in the Prometheus text format."""
+    gauges = [
+        (
+            "constellation_impact_cache_entries",
+            "Traversal results currently cached",
+            None,
+            stats["entries"],
+        )
+    ]
+    counters = [
+        (
+            "constellation_impact_cache_hits_total",
+            "Traversals answered from the cache",
+            stats["hits"],
+        ),
+        (
+            "constellation_impact_cache_misses_total",
+            "Traversals not found in the cache or no longer valid",
+            stats["misses"],
+        ),
+        (
+            "constellation_impact_cache_evictions_total",
+            "Results evicted to make room for newer ones",
+            stats["evictions"],
+        ),
+        (
+            "constellation_impact_cache_invalidations_total",
+            "Results dropped because a write changed them",
+            stats["invalidations"],
+        ),
+        (
+            "constellation_impact_cache_expirations_total",
+            "Results dropped after the cache TTL",
+            stats["expirations"],
+        ),
+    ]
+    return render_prometheus(gauges, counters, [])
+
+
+@router.get("/db")
+async def get_database_metrics(
+    format: str = Query("json", pattern="^(json|prometheus)$"),
+    connection: Neo4jConnection = Depends(get_neo4j_connection),
+):
+    """
+    Get database connection pool metrics.
+
+    Reports in-use and idle connections, the connection acquisition wait
+    histogram, acquisition timeouts and query durations. Use
+    ``format=prometheus`` for the Prometheus text exposition format.
+    """
+    try:
+        metrics = _database_metrics(connection)
+        if format == "prometheus":
+            return PlainTextResponse(
+                _render_database_metrics(metrics),
+                media_type="text/plain; version=0.0.4",
+            )
+        return metrics
+    except Exception as e:
+        logger.error(f"Error collecting database metrics: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to collect metrics: {str(e)}"
+        )
+
+
+@router.get("/graph-projection")
+async def get_graph_projection_status():
+    """
+    Get the state of the in-memory dependency graph projection.
+
+    Reports whether it is enabled, built and current (up to date with the
+    writes made through this worker), its CI and edge counts and the changes
+    pending compaction.
+    """
+    try:
+        return graph_projection.stats()
+    except Exception as e:
+        logger.error(f"Error collecting graph projection status: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to collect status: {str(e)}"
+        )
+
+
+@router.post("/graph-projection/check")
+async def check_graph_projection(
+    sample_size: int = Query(
+        100, ge=1, le=10000, description="CIs compared edge by edge"
+    ),
+):
+    """
+    Compare the in-memory graph projection with Neo4j.
+
+    Compares CI and edge counts and the dependencies of ``sample_size``
+    random CIs. A projection found inconsistent is marked stale: traversals
+    use Cypher until it has been rebuilt.
+    """
+    try:
+        return await graph_projection.check_consistency(sample_size)
+    except Exception as e:
+        logger.error(f"Error checking graph projection: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to check graph projection: {str(e)}"
+        )
+
+
+@router.get("/impact-cache")
+async def get_impact_cache_metrics(
+    format: str = Query("json", pattern="^(json|prometheus)$"),
+    relationship_service: RelationshipService = Depends(get_relationship_service),
+):
+    """
+    Get the impact and dependency result cache metrics.
+
+    Reports the cached entries and the hit, miss, eviction and invalidation
+    counters of this worker. Use ``format=prometheus`` for the Prometheus
+    text exposition format.
+    """
+    try:
+        stats = relationship_service.get_impact_cache_stats()
+        if format == "prometheus":
+            return PlainTextResponse(
+                _render_impact_cache_metrics(stats),
+                media_type="text/plain; version=0.0.4",
+            )
+        return stats
+    except Exception as e:
+        logger.error(f"Error collecting impact cache metrics: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to collect metrics: {str(e)}"
+        )
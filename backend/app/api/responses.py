@@ -0,0 +1,32 @@
+"""
+Fast JSON responses for large payloads.
+
+Endpoints returning thousands of rows build their payload from dicts and
+models the services already shaped, so FastAPI's ``jsonable_encoder`` pass
+and the revalidation against ``response_model`` are pure overhead. Returning
+a ``FastJSONResponse`` skips both: FastAPI sends a returned ``Response`` as
+is, and the payload is rendered in one pass by orjson. The endpoint keeps its
+``response_model`` for the OpenAPI schema.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# Datetimes in UTC end with "Z", as in Pydantic's own JSON output
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Serialize the values orjson does not handle natively."""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    return str(value)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, without response model validation."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
@@ -0,0 +1,32 @@
+"""
+Streaming response helpers for large result sets.
+"""
+import json
+import logging
+from typing import Any, AsyncIterator
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def _ndjson_lines(items: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """Encode items as newline-delimited JSON."""
+    try:
+        async for item in items:
+            if isinstance(item, BaseModel):
+                yield (item.model_dump_json() + "\n").encode()
+            else:
+                yield (json.dumps(item, default=str) + "\n").encode()
+    except Exception as e:
+        # Headers are already sent, so the error can only be logged
+        logger.error(f"Streaming response aborted: {e}")
+        raise
+
+
+def ndjson_response(items: AsyncIterator[Any]) -> StreamingResponse:
+    """Stream an async iterator of models or dicts as NDJSON."""
+    return StreamingResponse(_ndjson_lines(items), media_type=NDJSON_MEDIA_TYPE)
@@ -2,7 +2,7 @@
 Configuration settings for the Constellation CMDB application.
 """
 import os
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, field_validator
 
 
@@ -18,6 +18,86 @@ class Settings(BaseModel):
     neo4j_uri: str = "bolt://neo4j:7687"
     neo4j_username: str = "neo4j"
     neo4j_password: str = "constellation123"
+    # Optional neo4j:// URIs of cluster members; reads are spread across replicas
+    neo4j_routing_uris: List[str] = []
+
+    # Neo4j driver connection pool
+    neo4j_max_connection_pool_size: int = 50
+    neo4j_max_connection_lifetime: float = 30 * 60  # seconds
+    neo4j_connection_acquisition_timeout: float = 30.0  # seconds
+    neo4j_connection_timeout: float = 30.0  # seconds
+    neo4j_liveness_check_timeout: Optional[float] = None  # seconds, None = never
+    neo4j_keep_alive: bool = True
+    neo4j_fetch_size: int = 1000  # records per batch pulled from the server
+
+    # Query timeouts (seconds): default transaction timeout, per-endpoint budgets
+    # and how often long-running endpoints check for client disconnects
+    neo4j_query_timeout: float = 60.0
+    list_query_timeout: float = 10.0
+    search_query_timeout: float = 5.0
+    impact_query_timeout: float = 15.0
+    dependencies_query_timeout: float = 15.0
+    busfactor_query_timeout: float = 20.0
+    graph_stats_query_timeout: float = 10.0
+    disconnect_poll_interval: float = 0.5
+
+    # Bulk ingestion: rows written per transaction and items accepted per request
+    bulk_chunk_size: int = 1000
+    bulk_max_items: int = 50000
+
+    # IDs accepted by one POST /cis/batch-get request
+    batch_get_max_ids: int = 1000
+
+    # Failing CIs accepted by one POST /impact/batch request
+    impact_batch_max_sources: int = 100
+
+    # Facet counts cached per graph version (entries per filter/facet set, 0 = off)
+    # and expired after facet_cache_ttl seconds, since writes not made through
+    # this worker do not change the version
+    facet_cache_size: int = 256
+    facet_cache_ttl: float = 30.0
+
+    # Impact and dependency results cached per worker (entries, 0 = off; larger
+    # results are not cached). Invalidation: "version" drops every result on
+    # any write, "targeted" only the results that reached a CI the write touched.
+    # Writes not made through this worker are only seen once an entry expires
+    impact_cache_size: int = 256
+    impact_cache_max_records: int = 10000
+    impact_cache_invalidation: str = "version"
+    impact_cache_ttl: float = 30.0
+
+    # Validate every CI read back from Neo4j instead of trusting stored rows
+    strict_hydration: bool = False
+
+    # Relationship storage: "dual" reads legacy RELATED edges and native typed
+    # edges, "native" reads native edges only (once migrated). New edges are
+    # always native. The migration runs at startup when enabled
+    relationship_storage: str = "dual"
+    relationship_migration_enabled: bool = False
+    relationship_migration_batch_size: int = 10000
+
+    # In-memory CSR projection of the dependency graph answering distinct
+    # impact and dependency traversals: built at startup when enabled, its
+    # change overlay compacted past max_delta changes, and rebuilt at most
+    # once per rebuild_interval seconds when stale
+    graph_projection_enabled: bool = False
+    graph_projection_max_delta: int = 10000
+    graph_projection_rebuild_interval: float = 30.0
+
+    # Create constraints and indexes at startup (idempotent)
+    schema_bootstrap_enabled: bool = True
+
+    # Query plan warm-up at startup: total time budget and how long startup
+    # waits for it before serving requests (the rest continues in background)
+    query_warmup_enabled: bool = True
+    query_warmup_timeout: float = 30.0
+    query_warmup_readiness_deadline: float = 5.0
+
+    # Query execution: "async" uses the native async driver, "executor" runs the
+    # blocking driver on a dedicated thread pool with bounded concurrency
+    neo4j_execution_mode: str = "async"
+    neo4j_executor_pool_size: int = 8
+    neo4j_executor_queue_depth: int = 32
 
     # API Configuration
     api_prefix: str = "/api/v1"
@@ -39,6 +119,75 @@ class Settings(BaseModel):
             raise ValueError("Neo4j URI must start with bolt:// or neo4j://")
         return v
 
+    @field_validator("neo4j_routing_uris", mode="before")
+    @classmethod
+    def validate_neo4j_routing_uris(cls, v):
+        if isinstance(v, str):
+            v = [uri.strip() for uri in v.split(",") if uri.strip()]
+        for uri in v:
+            if not uri.startswith(("neo4j://", "neo4j+s://", "neo4j+ssc://")):
+                raise ValueError("Neo4j routing URIs must start with neo4j://")
+        return v
+
+    @field_validator("neo4j_execution_mode")
+    @classmethod
+    def validate_neo4j_execution_mode(cls, v):
+        if v not in ("async", "executor"):
+            raise ValueError("Neo4j execution mode must be 'async' or 'executor'")
+        return v
+
+    @field_validator("neo4j_executor_pool_size")
+    @classmethod
+    def validate_neo4j_executor_pool_size(cls, v):
+        if v < 1:
+            raise ValueError("Executor pool size must be at least 1")
+        return v
+
+    @field_validator("neo4j_executor_queue_depth")
+    @classmethod
+    def validate_neo4j_executor_queue_depth(cls, v):
+        if v < 0:
+            raise ValueError("Executor queue depth must not be negative")
+        return v
+
+    @field_validator("relationship_storage")
+    @classmethod
+    def validate_relationship_storage(cls, v):
+        if v not in ("dual", "native"):
+            raise ValueError("Relationship storage must be 'dual' or 'native'")
+        return v
+
+    @field_validator("impact_cache_invalidation")
+    @classmethod
+    def validate_impact_cache_invalidation(cls, v):
+        if v not in ("version", "targeted"):
+            raise ValueError(
+                "Impact cache invalidation must be 'version' or 'targeted'"
+            )
+        return v
+
+    @field_validator("facet_cache_ttl", "impact_cache_ttl")
+    @classmethod
+    def validate_cache_ttl(cls, v):
+        if v <= 0:
+            raise ValueError("Cache TTLs must be positive")
+        return v
+
+    @field_validator(
+        "bulk_chunk_size",
+        "bulk_max_items",
+        "batch_get_max_ids",
+        "impact_batch_max_sources",
+        "relationship_migration_batch_size",
+        "graph_projection_max_delta",
+        "impact_cache_max_records",
+    )
+    @classmethod
+    def validate_bulk_sizes(cls, v):
+        if v < 1:
+            raise ValueError("Bulk and batch sizes must be positive")
+        return v
+
     @field_validator("secret_key")
     @classmethod
     def validate_secret_key(cls, v):
@@ -46,6 +195,20 @@ class Settings(BaseModel):
             print("WARNING: Using default secret key. Change this in production!")
         return v
 
+    def neo4j_driver_options(self) -> Dict[str, Any]:
+        """Driver pool and session options derived from the settings."""
+        return {
+            "max_connection_pool_size": self.neo4j_max_connection_pool_size,
+            "max_connection_lifetime": self.neo4j_max_connection_lifetime,
+            "connection_acquisition_timeout": (
+                self.neo4j_connection_acquisition_timeout
+            ),
+            "connection_timeout": self.neo4j_connection_timeout,
+            "liveness_check_timeout": self.neo4j_liveness_check_timeout,
+            "keep_alive": self.neo4j_keep_alive,
+            "fetch_size": self.neo4j_fetch_size,
+        }
+
     def __init__(self, **kwargs):
         # Load from environment variables
         env_values = {}
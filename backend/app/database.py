@@ -1,37 +1,206 @@
 """
 Neo4j database connection and session management.
 """
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List, cast, TYPE_CHECKING
+from contextvars import ContextVar
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable, AsyncIterator
+from contextlib import asynccontextmanager, contextmanager
 
-if TYPE_CHECKING:
-    from neo4j import Query
-else:
-    Query = str
-from contextlib import asynccontextmanager
+from neo4j import (
+    AsyncGraphDatabase,
+    AsyncDriver,
+    GraphDatabase,
+    Driver,
+    Address,
+    READ_ACCESS,
+    WRITE_ACCESS,
+    unit_of_work,
+)
+from neo4j.exceptions import ServiceUnavailable, AuthError, ClientError
 
-from neo4j import GraphDatabase, Driver
-from neo4j.exceptions import ServiceUnavailable, AuthError
+from .metrics import DatabaseMetrics
 
 logger = logging.getLogger(__name__)
 
+# Supported query execution modes
+EXECUTION_MODE_ASYNC = "async"
+EXECUTION_MODE_EXECUTOR = "executor"
+EXECUTION_MODES = (EXECUTION_MODE_ASYNC, EXECUTION_MODE_EXECUTOR)
+
+# Transaction timeout (seconds) for queries issued in the current context
+_query_timeout: ContextVar[Optional[float]] = ContextVar(
+    "neo4j_query_timeout", default=None
+)
+
+
+@contextmanager
+def query_timeout(seconds: Optional[float]):
+    """
+    Apply a transaction timeout to every query issued within the block.
+
+    The timeout is sent to Neo4j with each transaction, so the server
+    terminates queries that run longer. Tasks created inside the block
+    inherit the timeout.
+    """
+    token = _query_timeout.set(seconds)
+    try:
+        yield
+    finally:
+        _query_timeout.reset(token)
+
+
+class QueryTimeoutError(Exception):
+    """Raised when Neo4j terminates a query that exceeded its timeout."""
+
+    def __init__(
+        self, timeout: Optional[float], elapsed: float, rows_received: int = 0
+    ):
+        self.timeout = timeout
+        self.elapsed = elapsed
+        self.rows_received = rows_received
+        super().__init__(
+            f"Query exceeded its {timeout}s timeout after {elapsed:.2f}s "
+            f"({rows_received} rows received)"
+        )
+
+
+class ExecutorStats:
+    """
+    Queue wait statistics for the thread-pool execution mode.
+
+    Admission wait is the time spent waiting on the in-flight semaphore, pool
+    wait is the time between submission to the thread pool and the start of
+    the driver call. A growing admission wait means the queue depth is
+    exhausted, a growing pool wait means the threads are saturated, and a
+    growing run time with flat waits points at Neo4j itself.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.in_flight = 0
+        self.total_admission_wait = 0.0
+        self.total_pool_wait = 0.0
+        self.total_run_time = 0.0
+        self.max_admission_wait = 0.0
+        self.max_pool_wait = 0.0
+
+    def record(self, admission_wait: float, pool_wait: float, run_time: float):
+        """Record the timings (in seconds) of a completed query."""
+        with self._lock:
+            self.queries += 1
+            self.total_admission_wait += admission_wait
+            self.total_pool_wait += pool_wait
+            self.total_run_time += run_time
+            self.max_admission_wait = max(self.max_admission_wait, admission_wait)
+            self.max_pool_wait = max(self.max_pool_wait, pool_wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current statistics as a dictionary (times in ms)."""
+        with self._lock:
+            count = self.queries or 1
+            return {
+                "queries": self.queries,
+                "in_flight": self.in_flight,
+                "avg_admission_wait_ms": self.total_admission_wait / count * 1000,
+                "avg_pool_wait_ms": self.total_pool_wait / count * 1000,
+                "avg_run_time_ms": self.total_run_time / count * 1000,
+                "max_admission_wait_ms": self.max_admission_wait * 1000,
+                "max_pool_wait_ms": self.max_pool_wait * 1000,
+            }
+
 
 class Neo4jConnection:
     """
     Neo4j database connection manager with connection pooling.
+
+    By default the native asyncio driver is used so that queries never block
+    the event loop of the API worker. The ``executor`` mode is a fallback that
+    uses the synchronous driver and runs every driver call on a dedicated,
+    size-limited thread pool, with an asyncio semaphore capping the number of
+    in-flight queries.
+
+    Reads run in managed read transactions (``READ_ACCESS``) and writes in
+    managed write transactions, so that with a ``neo4j://`` routing URI the
+    driver sends reads to followers and read replicas and only writes to the
+    cluster leader.
     """
 
     def __init__(self):
-        self._driver: Optional[Driver] = None
+        self._driver: Optional[AsyncDriver] = None
+        self._sync_driver: Optional[Driver] = None
         self._uri: Optional[str] = None
         self._username: Optional[str] = None
         self._password: Optional[str] = None
+        self._routing_uris: List[str] = []
+        self._execution_mode = EXECUTION_MODE_ASYNC
+        self._executor_pool_size = 8
+        self._executor_queue_depth = 32
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.executor_stats = ExecutorStats()
+        self.metrics = DatabaseMetrics()
+        self._driver_options: Dict[str, Any] = {}
+        self._query_timeout: Optional[float] = None
+
+    def configure(
+        self,
+        uri: str,
+        username: str,
+        password: str,
+        execution_mode: str = EXECUTION_MODE_ASYNC,
+        executor_pool_size: int = 8,
+        executor_queue_depth: int = 32,
+        routing_uris: Optional[List[str]] = None,
+        driver_options: Optional[Dict[str, Any]] = None,
+        query_timeout: Optional[float] = None,
+    ):
+        """
+        Configure connection parameters.
+
+        ``routing_uris`` is an optional list of ``neo4j://`` URIs of cluster
+        members used as initial routers. When given, the driver connects
+        through the first one and falls back to the others when resolving the
+        routing table.
+
+        ``driver_options`` are passed to the driver as-is and hold the pool
+        tuning knobs (pool size, connection lifetime, acquisition timeout,
+        fetch size, keep-alive, liveness check timeout...).
+
+        ``query_timeout`` is the default transaction timeout in seconds, used
+        unless a ``query_timeout()`` block sets a budget for the caller.
+        """
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(
+                f"Unknown execution mode '{execution_mode}', "
+                f"expected one of {EXECUTION_MODES}"
+            )
+
+        routing_uris = list(routing_uris or [])
+        for routing_uri in routing_uris:
+            if not routing_uri.startswith(("neo4j://", "neo4j+s://", "neo4j+ssc://")):
+                raise ValueError(
+                    f"Routing URI must use the neo4j:// scheme: {routing_uri}"
+                )
 
-    def configure(self, uri: str, username: str, password: str):
-        """Configure connection parameters."""
-        self._uri = uri
+        self._uri = routing_uris[0] if routing_uris else uri
+        self._routing_uris = routing_uris
         self._username = username
         self._password = password
+        self._execution_mode = execution_mode
+        self._executor_pool_size = executor_pool_size
+        self._executor_queue_depth = executor_queue_depth
+        self._driver_options = dict(driver_options or {})
+        self._query_timeout = query_timeout
+
+    @property
+    def execution_mode(self) -> str:
+        """Return the configured query execution mode."""
+        return self._execution_mode
 
     async def connect(self):
         """Establish connection to Neo4j database."""
@@ -40,18 +209,37 @@ class Neo4jConnection:
                 "Database connection not configured. Call configure() first."
             )
 
+        driver_config: Dict[str, Any] = {
+            **self._driver_options,
+            "auth": (self._username, self._password),
+        }
+        if len(self._routing_uris) > 1:
+            driver_config["resolver"] = self._resolve_routers
+
         try:
-            self._driver = GraphDatabase.driver(
-                self._uri,  # type: ignore
-                auth=(self._username, self._password),  # type: ignore
-                max_connection_lifetime=30 * 60,  # 30 minutes
-                max_connection_pool_size=50,
-                connection_acquisition_timeout=30,  # 30 seconds
-            )
+            if self._execution_mode == EXECUTION_MODE_EXECUTOR:
+                self._sync_driver = GraphDatabase.driver(
+                    self._uri, **driver_config  # type: ignore
+                )
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._executor_pool_size,
+                    thread_name_prefix="neo4j-query",
+                )
+                # In-flight queries: one per worker thread plus the queue depth
+                self._semaphore = asyncio.Semaphore(
+                    self._executor_pool_size + self._executor_queue_depth
+                )
+            else:
+                self._driver = AsyncGraphDatabase.driver(
+                    self._uri, **driver_config  # type: ignore
+                )
 
             # Test the connection
             await self.verify_connectivity()
-            logger.info(f"Successfully connected to Neo4j at {self._uri}")
+            logger.info(
+                f"Successfully connected to Neo4j at {self._uri} "
+                f"({self._execution_mode} mode)"
+            )
 
         except (ServiceUnavailable, AuthError) as e:
             logger.error(f"Failed to connect to Neo4j: {e}")
@@ -63,79 +251,434 @@ class Neo4jConnection:
     async def disconnect(self):
         """Close the database connection."""
         if self._driver:
-            self._driver.close()
+            await self._driver.close()
             self._driver = None
             logger.info("Disconnected from Neo4j")
 
+        if self._sync_driver:
+            self._sync_driver.close()
+            self._sync_driver = None
+            logger.info("Disconnected from Neo4j")
+
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._semaphore = None
+
+    def _resolve_routers(self, address):
+        """Resolve the initial router address to all configured routing URIs."""
+        for routing_uri in self._routing_uris:
+            host_port = routing_uri.split("://", 1)[1].split("/", 1)[0]
+            yield Address.parse(host_port, default_port=7687)
+
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking driver call on the query thread pool.
+
+        Waits for an in-flight slot first, then records how long the call
+        waited for admission and for a worker thread.
+        """
+        if not self._executor or not self._semaphore:
+            raise RuntimeError("No active connection to Neo4j")
+
+        loop = asyncio.get_running_loop()
+        timings: Dict[str, float] = {}
+
+        def _timed_call():
+            timings["started"] = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                timings["finished"] = time.perf_counter()
+
+        admission_start = time.perf_counter()
+        async with self._semaphore:
+            submitted = time.perf_counter()
+            self.executor_stats.in_flight += 1
+            try:
+                return await loop.run_in_executor(self._executor, _timed_call)
+            finally:
+                self.executor_stats.in_flight -= 1
+                if "started" in timings:
+                    admission_wait = submitted - admission_start
+                    pool_wait = timings["started"] - submitted
+                    run_time = timings["finished"] - timings["started"]
+                    self.executor_stats.record(admission_wait, pool_wait, run_time)
+                    logger.debug(
+                        f"Query waited {admission_wait * 1000:.1f}ms for admission "
+                        f"and {pool_wait * 1000:.1f}ms for a worker thread, "
+                        f"ran {run_time * 1000:.1f}ms"
+                    )
+
     async def verify_connectivity(self):
         """Verify that the connection to Neo4j is working."""
-        if not self._driver:
+        if not self.is_connected:
             raise RuntimeError("No active connection to Neo4j")
 
         try:
-            with self._driver.session() as session:
-                result = session.run("RETURN 1 as test")
-                record = result.single()
-                if record and record["test"] != 1:
-                    raise RuntimeError("Connectivity test failed")
-                logger.debug("Neo4j connectivity verified")
+            if self._execution_mode == EXECUTION_MODE_EXECUTOR:
+                records = await self._run_blocking(
+                    self._transaction_sync, READ_ACCESS, "RETURN 1 as test", None
+                )
+                record = records[0] if records else None
+            else:
+                async with self.get_session(READ_ACCESS) as session:
+                    result = await session.run("RETURN 1 as test")
+                    record = await result.single()
+            if record and record["test"] != 1:
+                raise RuntimeError("Connectivity test failed")
+            logger.debug("Neo4j connectivity verified")
         except Exception as e:
             logger.error(f"Neo4j connectivity check failed: {e}")
             raise
 
     @asynccontextmanager
-    async def get_session(self):
-        """Get a Neo4j session with automatic cleanup."""
+    async def get_session(self, access_mode: str = WRITE_ACCESS):
+        """Get an async Neo4j session with automatic cleanup."""
         if not self._driver:
-            raise RuntimeError("No active connection to Neo4j")
+            raise RuntimeError("No active async connection to Neo4j")
 
-        session = self._driver.session()
+        session = self._driver.session(default_access_mode=access_mode)
         try:
             yield session
         finally:
-            session.close()
+            await session.close()
 
-    async def execute_query(
-        self, query: str, parameters: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
-        """Execute a Cypher query and return results."""
-        if not self._driver:
+    def _acquisition_observer(self) -> Callable[[], float]:
+        """
+        Return a callable marking the start of a transaction function.
+
+        Its first call records the time elapsed since the observer was created
+        as connection acquisition wait (routing, pool checkout and ``BEGIN``).
+        Retries of the transaction function are not counted again.
+        """
+        started = time.perf_counter()
+        acquired = False
+
+        def _observe_start() -> float:
+            nonlocal acquired
+            now = time.perf_counter()
+            if not acquired:
+                acquired = True
+                self.metrics.observe_acquisition(now - started)
+            return now
+
+        return _observe_start
+
+    def _effective_timeout(self) -> Optional[float]:
+        """Return the timeout for the current query (context budget or default)."""
+        timeout = _query_timeout.get()
+        return timeout if timeout is not None else self._query_timeout
+
+    def _transaction_sync(
+        self,
+        access_mode: str,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        timeout: Optional[float] = None,
+        progress: Optional[Dict[str, int]] = None,
+        with_plan: bool = False,
+    ) -> Any:
+        """
+        Run a managed transaction with the synchronous driver (executor mode).
+
+        Returns the records, or the query plan when ``with_plan`` is set.
+        """
+        observe_start = self._acquisition_observer()
+        progress = progress if progress is not None else {}
+
+        @unit_of_work(timeout=timeout)
+        def _run_query(tx, query_str, params):
+            begin = observe_start()
+            progress["rows"] = 0
+            records = []
+            result = tx.run(query_str, params or {})
+            for record in result:
+                records.append(record.data())
+                progress["rows"] += 1
+            self.metrics.observe_query(time.perf_counter() - begin)
+            return result.consume().plan if with_plan else records
+
+        with self._sync_driver.session(  # type: ignore[union-attr]
+            default_access_mode=access_mode
+        ) as session:
+            if access_mode == READ_ACCESS:
+                return session.execute_read(_run_query, query, parameters)
+            return session.execute_write(_run_query, query, parameters)
+
+    async def _transaction_async(
+        self,
+        access_mode: str,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        timeout: Optional[float] = None,
+        progress: Optional[Dict[str, int]] = None,
+        with_plan: bool = False,
+    ) -> Any:
+        """
+        Run a managed transaction with the async driver.
+
+        Returns the records, or the query plan when ``with_plan`` is set.
+        """
+        observe_start = self._acquisition_observer()
+        progress = progress if progress is not None else {}
+
+        @unit_of_work(timeout=timeout)
+        async def _run_query(tx, query_str, params):
+            begin = observe_start()
+            progress["rows"] = 0
+            records = []
+            result = await tx.run(query_str, params or {})
+            async for record in result:
+                records.append(record.data())
+                progress["rows"] += 1
+            self.metrics.observe_query(time.perf_counter() - begin)
+            if with_plan:
+                return (await result.consume()).plan
+            return records
+
+        async with self.get_session(access_mode) as session:
+            if access_mode == READ_ACCESS:
+                return await session.execute_read(_run_query, query, parameters)
+            return await session.execute_write(_run_query, query, parameters)
+
+    def _translate_error(
+        self,
+        error: Exception,
+        timeout: Optional[float],
+        started: float,
+        progress: Dict[str, int],
+    ) -> Exception:
+        """Record a failed query and map transaction timeouts to QueryTimeoutError."""
+        if isinstance(error, ClientError):
+            if "TransactionTimedOut" in (error.code or ""):
+                self.metrics.record_error(query_timeout=True)
+                return QueryTimeoutError(
+                    timeout=timeout,
+                    elapsed=time.perf_counter() - started,
+                    rows_received=progress.get("rows", 0),
+                )
+            # Raised by the driver itself, with the text in args, not message
+            self.metrics.record_error(
+                acquisition_timeout=str(error).startswith(
+                    "failed to obtain a connection from the pool"
+                )
+            )
+            return error
+
+        self.metrics.record_error()
+        return error
+
+    async def _execute(
+        self,
+        access_mode: str,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        with_plan: bool = False,
+    ) -> Any:
+        """Run a query in a managed transaction using the configured mode."""
+        if not self.is_connected:
             raise RuntimeError("No active connection to Neo4j")
 
-        async with self.get_session() as session:
-            try:
-                result = session.run(query, parameters or {})  # type: ignore[arg-type]
-                return [record.data() for record in result]
-            except Exception as e:
-                logger.error(f"Query execution failed: {e}")
-                logger.error(f"Query: {query}")
-                logger.error(f"Parameters: {parameters}")
+        timeout = self._effective_timeout()
+        progress: Dict[str, int] = {"rows": 0}
+        started = time.perf_counter()
+
+        try:
+            if self._execution_mode == EXECUTION_MODE_EXECUTOR:
+                return await self._run_blocking(
+                    self._transaction_sync,
+                    access_mode,
+                    query,
+                    parameters,
+                    timeout,
+                    progress,
+                    with_plan,
+                )
+            return await self._transaction_async(
+                access_mode, query, parameters, timeout, progress, with_plan
+            )
+        except Exception as e:
+            error = self._translate_error(e, timeout, started, progress)
+            if error is e:
                 raise
+            raise error from e
+
+    async def execute_query(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Execute a read-only Cypher query in a managed read transaction."""
+        try:
+            return await self._execute(READ_ACCESS, query, parameters)
+        except Exception as e:
+            logger.error(f"Query execution failed: {e}")
+            logger.error(f"Query: {query}")
+            logger.error(f"Parameters: {parameters}")
+            raise
 
     async def execute_write_query(
         self, query: str, parameters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """Execute a write Cypher query in a transaction."""
-        if not self._driver:
+        try:
+            return await self._execute(WRITE_ACCESS, query, parameters)
+        except Exception as e:
+            logger.error(f"Write query execution failed: {e}")
+            logger.error(f"Query: {query}")
+            logger.error(f"Parameters: {parameters}")
+            raise
+
+    async def explain(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        access_mode: str = READ_ACCESS,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Plan a query with ``EXPLAIN`` without executing it.
+
+        Neo4j caches the resulting execution plan, so later runs of the same
+        query text skip planning. Returns the plan as a dictionary, whose
+        ``args`` include the planner's ``EstimatedRows``.
+        """
+        return await self._execute(
+            access_mode, f"EXPLAIN {query}", parameters, with_plan=True
+        )
+
+    async def stream_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream the records of a read-only query in batches.
+
+        Records are pulled from the server ``batch_size`` at a time (defaults
+        to the configured fetch size) inside a read transaction, so memory
+        stays bounded by one batch regardless of the result size. Closing the
+        generator early rolls the transaction back.
+        """
+        if not self.is_connected:
             raise RuntimeError("No active connection to Neo4j")
 
-        def _run_query(tx, query_str, params):
-            result = tx.run(query_str, params or {})
-            return [record.data() for record in result]
+        batch_size = batch_size or self._driver_options.get("fetch_size") or 1000
+        timeout = self._effective_timeout()
+        batch_stream = (
+            self._stream_sync(query, parameters, batch_size, timeout)
+            if self._execution_mode == EXECUTION_MODE_EXECUTOR
+            else self._stream_async(query, parameters, batch_size, timeout)
+        )
+        progress: Dict[str, int] = {"rows": 0}
+        started = time.perf_counter()
 
-        async with self.get_session() as session:
-            try:
-                return session.write_transaction(_run_query, query, parameters)
-            except Exception as e:
-                logger.error(f"Write query execution failed: {e}")
-                logger.error(f"Query: {query}")
-                logger.error(f"Parameters: {parameters}")
+        try:
+            async for batch in batch_stream:
+                progress["rows"] += len(batch)
+                yield batch
+        except Exception as e:
+            logger.error(f"Streaming query failed: {e}")
+            logger.error(f"Query: {query}")
+            logger.error(f"Parameters: {parameters}")
+            error = self._translate_error(e, timeout, started, progress)
+            if error is e:
                 raise
+            raise error from e
+        finally:
+            await batch_stream.aclose()
+
+    async def _stream_async(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        batch_size: int,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream batches with the async driver."""
+        observe_start = self._acquisition_observer()
+        session = self._driver.session(  # type: ignore[union-attr]
+            default_access_mode=READ_ACCESS, fetch_size=batch_size
+        )
+        try:
+            tx = await session.begin_transaction(timeout=timeout)
+            try:
+                begin = observe_start()
+                result = await tx.run(query, parameters or {})  # type: ignore[arg-type]
+                while True:
+                    records = await result.fetch(batch_size)
+                    if not records:
+                        break
+                    yield [record.data() for record in records]
+                self.metrics.observe_query(time.perf_counter() - begin)
+            finally:
+                await tx.close()
+        finally:
+            await session.close()
+
+    async def _stream_sync(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        batch_size: int,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream batches with the synchronous driver, one pool call per batch."""
+        observe_start = self._acquisition_observer()
+        session = self._sync_driver.session(  # type: ignore[union-attr]
+            default_access_mode=READ_ACCESS, fetch_size=batch_size
+        )
+
+        def _fetch(result) -> List[Dict[str, Any]]:
+            return [record.data() for record in result.fetch(batch_size)]
+
+        try:
+            tx = await self._run_blocking(session.begin_transaction, None, timeout)
+            try:
+                begin = observe_start()
+                result = await self._run_blocking(tx.run, query, parameters or {})
+                while True:
+                    batch = await self._run_blocking(_fetch, result)
+                    if not batch:
+                        break
+                    yield batch
+                self.metrics.observe_query(time.perf_counter() - begin)
+            finally:
+                await self._run_blocking(tx.close)
+        finally:
+            await self._run_blocking(session.close)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Return in-use and idle connection counts per server address.
+
+        The driver does not expose its pool publicly, so this reads the
+        private ``_pool.connections`` map and each connection's ``in_use``
+        flag. test_database checks that layout against the installed driver,
+        and this still returns empty figures if it changes.
+        """
+        driver = self._driver or self._sync_driver
+        pool = getattr(driver, "_pool", None)
+        connections = getattr(pool, "connections", None) or {}
+
+        addresses = {}
+        for address, address_connections in list(connections.items()):
+            in_use = sum(1 for cx in list(address_connections) if cx.in_use)
+            addresses[str(address)] = {
+                "in_use": in_use,
+                "idle": len(address_connections) - in_use,
+            }
+
+        return {
+            "max_pool_size": self._driver_options.get("max_connection_pool_size"),
+            "in_use": sum(a["in_use"] for a in addresses.values()),
+            "idle": sum(a["idle"] for a in addresses.values()),
+            "addresses": addresses,
+        }
 
     @property
     def is_connected(self) -> bool:
         """Check if there's an active connection."""
-        return self._driver is not None
+        return self._driver is not None or self._sync_driver is not None
 
 
 # Global connection instance
@@ -1,6 +1,7 @@
 """
 Constellation CMDB - FastAPI Backend Application
 """
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -9,7 +10,11 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from .config import get_settings
 from .database import neo4j_connection
-from .api import ci_endpoints, impact_endpoints
+from .api import ci_endpoints, impact_endpoints, metrics_endpoints
+from .services.graph_projection import graph_projection
+from .services.relationship_service import relationship_service
+from .services.schema import ensure_schema
+from .services.warmup import warm_up_query_plans
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,16 +32,57 @@ async def lifespan(app: FastAPI):
             uri=settings.neo4j_uri,
             username=settings.neo4j_username,
             password=settings.neo4j_password,
+            execution_mode=settings.neo4j_execution_mode,
+            executor_pool_size=settings.neo4j_executor_pool_size,
+            executor_queue_depth=settings.neo4j_executor_queue_depth,
+            routing_uris=settings.neo4j_routing_uris,
+            driver_options=settings.neo4j_driver_options(),
+            query_timeout=settings.neo4j_query_timeout,
         )
         await neo4j_connection.connect()
-        logger.info("Application startup complete")
     except Exception as e:
         logger.error(f"Failed to start application: {e}")
         raise
 
+    # Constraints and indexes must exist before plans are cached
+    if settings.schema_bootstrap_enabled:
+        await ensure_schema(neo4j_connection)
+
+    # Warm the query plan cache, without delaying readiness past the deadline
+    warmup_task = None
+    if settings.query_warmup_enabled:
+        warmup_task = asyncio.create_task(
+            warm_up_query_plans(neo4j_connection, settings.query_warmup_timeout)
+        )
+        await asyncio.wait(
+            {warmup_task}, timeout=settings.query_warmup_readiness_deadline
+        )
+        if not warmup_task.done():
+            logger.info(
+                "Query warm-up still running after "
+                f"{settings.query_warmup_readiness_deadline}s, continuing in background"
+            )
+
+    # Rewrite legacy relationships to native types while serving requests
+    migration_task = None
+    if settings.relationship_migration_enabled:
+        migration_task = asyncio.create_task(
+            relationship_service.migrate_relationship_types()
+        )
+
+    # Build the dependency graph projection in the background; traversals
+    # use Cypher until it is ready
+    projection_task = None
+    if settings.graph_projection_enabled:
+        projection_task = asyncio.create_task(graph_projection.rebuild())
+    logger.info("Application startup complete")
+
     yield
 
     # Shutdown
+    for task in (warmup_task, migration_task, projection_task):
+        if task and not task.done():
+            task.cancel()
     await neo4j_connection.disconnect()
     logger.info("Application shutdown complete")
 
@@ -56,12 +102,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include API routers
 # Include routers
 app.include_router(ci_endpoints.router, prefix=settings.api_prefix)
 app.include_router(impact_endpoints.router, prefix=settings.api_prefix)
+app.include_router(metrics_endpoints.router, prefix=settings.api_prefix)
 
 
 @app.get("/")
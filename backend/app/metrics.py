@@ -0,0 +1,156 @@
+"""
+In-process metrics for the database layer.
+
+Metrics are kept in memory per worker and exposed through the
+``/api/v1/metrics/db`` endpoint, either as JSON or in the Prometheus text
+exposition format.
+"""
+import threading
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+# Histogram buckets (seconds) for connection acquisition and query durations
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds, Prometheus style."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self._lock = threading.Lock()
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """Record a single observation."""
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    self.counts[index] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the histogram as a dictionary of cumulative bucket counts."""
+        with self._lock:
+            return {
+                "count": self.count,
+                "sum": self.sum,
+                "buckets": {
+                    str(upper_bound): count
+                    for upper_bound, count in zip(self.buckets, self.counts)
+                },
+            }
+
+
+class DatabaseMetrics:
+    """
+    Counters and histograms describing driver pool usage.
+
+    Acquisition wait is measured from the moment a query asks the driver for
+    a transaction until the transaction function starts, which covers routing,
+    connection acquisition from the pool and ``BEGIN``. Query duration is the
+    time the transaction function itself runs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquisition_wait = Histogram()
+        self.query_duration = Histogram()
+        self.acquisition_timeouts = 0
+        self.query_timeouts = 0
+        self.query_errors = 0
+
+    def observe_acquisition(self, seconds: float):
+        """Record the time spent waiting for a connection."""
+        self.acquisition_wait.observe(seconds)
+
+    def observe_query(self, seconds: float):
+        """Record the execution time of a transaction function."""
+        self.query_duration.observe(seconds)
+
+    def record_error(
+        self, acquisition_timeout: bool = False, query_timeout: bool = False
+    ):
+        """Count a failed query, flagging acquisition and transaction timeouts."""
+        with self._lock:
+            self.query_errors += 1
+            if acquisition_timeout:
+                self.acquisition_timeouts += 1
+            if query_timeout:
+                self.query_timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all metrics as a dictionary."""
+        with self._lock:
+            counters = {
+                "acquisition_timeouts": self.acquisition_timeouts,
+                "query_timeouts": self.query_timeouts,
+                "query_errors": self.query_errors,
+            }
+        return {
+            **counters,
+            "acquisition_wait_seconds": self.acquisition_wait.snapshot(),
+            "query_duration_seconds": self.query_duration.snapshot(),
+        }
+
+
+def _format_labels(labels: Optional[Dict[str, Any]]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return "{" + pairs + "}"
+
+
+def render_prometheus(
+    gauges: List[Tuple[str, str, Optional[Dict[str, Any]], float]],
+    counters: List[Tuple[str, str, float]],
+    histograms: List[Tuple[str, str, Dict[str, Any]]],
+) -> str:
+    """
+    Render metrics in the Prometheus text exposition format.
+
+    ``gauges`` are ``(name, help, labels, value)`` tuples, ``counters`` are
+    ``(name, help, value)`` tuples and ``histograms`` are ``(name, help,
+    snapshot)`` tuples where ``snapshot`` comes from ``Histogram.snapshot``.
+    """
+    lines: List[str] = []
+    documented = set()
+
+    for name, help_text, labels, value in gauges:
+        if name not in documented:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            documented.add(name)
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    for name, help_text, value in counters:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {value}")
+
+    for name, help_text, snapshot in histograms:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for upper_bound, count in snapshot["buckets"].items():
+            lines.append(f'{name}_bucket{{le="{upper_bound}"}} {count}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {snapshot["count"]}')
+        lines.append(f"{name}_sum {snapshot['sum']}")
+        lines.append(f"{name}_count {snapshot['count']}")
+
+    return "\n".join(lines) + "\n"
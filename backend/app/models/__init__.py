@@ -7,7 +7,7 @@ in the graph database.
 """
 
 from .base import BaseAsset, TimestampMixin
-from .ci import CI, CIType
+from .ci import CI, CISearchResult, CISummary, CIType
 from .relationships import RelationshipType, Relationship
 from .human import HumanAsset, Team, Role, Skill, HumanSkillRelation
 from .governance import Policy, Risk, Process, Control, Vendor, Contract
@@ -16,6 +16,8 @@ __all__ = [
     "BaseAsset",
     "TimestampMixin",
     "CI",
+    "CISearchResult",
+    "CISummary",
     "CIType",
     "RelationshipType",
     "Relationship",
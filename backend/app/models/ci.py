@@ -5,12 +5,13 @@ This module defines the core Configuration Item types and their
 specialized variants for different asset categories.
 """
 
+from datetime import datetime
 from enum import Enum
 from typing import Optional, Dict, Any
 
-from pydantic import Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_serializer
 
-from .base import BaseAsset
+from .base import BaseAsset, CriticalityLevel, EnvironmentType, LifecycleState
 
 
 class CIType(str, Enum):
@@ -95,3 +96,50 @@ class CI(BaseAsset):
     def __repr__(self) -> str:
         """Debug representation."""
         return f"CI(id='{self.id}', name='{self.name}', type='{self.ci_type}')"
+
+
+class CISearchResult(CI):
+    """Configuration Item returned by full-text search, with its relevance."""
+
+    score: Optional[float] = Field(None, description="Full-text relevance score")
+
+
+class CISummary(BaseModel):
+    """
+    Lightweight projection of a Configuration Item for list views.
+
+    Only the requested fields are set, and only set fields are serialized;
+    ``id`` and ``name`` are always present.
+    """
+
+    id: str
+    name: str
+    description: Optional[str] = None
+    ci_type: Optional[CIType] = None
+    environment: Optional[EnvironmentType] = None
+    criticality: Optional[CriticalityLevel] = None
+    lifecycle_state: Optional[LifecycleState] = None
+    status: Optional[str] = None
+    owner: Optional[str] = None
+    hostname: Optional[str] = None
+    ip_address: Optional[str] = None
+    fqdn: Optional[str] = None
+    vendor: Optional[str] = None
+    location: Optional[str] = None
+    cost_center: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    score: Optional[float] = Field(None, description="Full-text relevance score")
+
+    model_config = ConfigDict(use_enum_values=True, extra="forbid")
+
+    @model_serializer(mode="wrap")
+    def _serialize_set_fields(self, handler):
+        data = handler(self)
+        return {
+            key: value for key, value in data.items() if key in self.model_fields_set
+        }
+
+
+# CI fields that can be requested as a sparse fieldset
+CI_SUMMARY_FIELDS = tuple(name for name in CISummary.model_fields if name != "score")
@@ -1,22 +1,70 @@
 """
 CRUD operations for Configuration Items in Neo4j.
 """
+import json
 import logging
-from typing import List, Optional, Dict, Any
+import re
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple, Union
 from uuid import uuid4
 
+from pydantic import ValidationError
+
+from . import queries
+from .graph_projection import graph_projection
+from .graph_version import graph_version
+from .hydration import ModelHydrator
+from .impact_cache import ResultCache
+from .pagination import decode_cursor, encode_cursor
+from ..config import get_settings
 from ..database import get_neo4j_connection
-from ..models.ci import CI, CIType
+from ..models.ci import CI, CI_SUMMARY_FIELDS, CISearchResult, CISummary, CIType
 from ..models.base import CriticalityLevel, EnvironmentType, LifecycleState
 
 logger = logging.getLogger(__name__)
 
+# How get_all_cis counts the CIs matching the filters
+COUNT_NONE = "none"
+COUNT_EXACT = "exact"
+COUNT_ESTIMATED = "estimated"
+COUNT_MODES = (COUNT_NONE, COUNT_EXACT, COUNT_ESTIMATED)
+
+# Characters with a special meaning in the Lucene query syntax
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/&|])')
+
+# Terms shorter than this are matched by prefix only, fuzzy matching them is noise
+_FUZZY_MIN_LENGTH = 4
+
+# Read-path model builders, see STRICT_HYDRATION in the settings
+_hydrate_ci = ModelHydrator(CI)
+_hydrate_search_result = ModelHydrator(CISearchResult)
+_hydrate_summary = ModelHydrator(CISummary)
+
+
+def build_fulltext_query(text: str) -> str:
+    """
+    Build a Lucene query matching every term of ``text``.
+
+    Each term matches exactly (boosted), as a prefix, or fuzzily within an
+    edit distance of one. Lucene operators in the input are escaped, so user
+    input is always treated as plain text.
+    """
+    clauses = []
+    for term in text.lower().split():
+        escaped = _LUCENE_SPECIAL.sub(r"\\\1", term)
+        options = [f"{escaped}^2", f"{escaped}*"]
+        if len(term) >= _FUZZY_MIN_LENGTH:
+            options.append(f"{escaped}~1")
+        clauses.append("(" + " OR ".join(options) + ")")
+    return " AND ".join(clauses)
+
 
 class CIService:
     """Service for Configuration Item operations."""
 
     def __init__(self):
         self.connection = None
+        # Facet counts keyed by filters and facets
+        self._facet_cache = ResultCache("facet_cache")
 
     async def _get_connection(self):
         """Get Neo4j connection."""
@@ -36,36 +84,17 @@ class CIService:
         ci = CI(**ci_data)
 
         # Convert to dict for Neo4j - ensure all values are primitive types
-        ci_dict = ci.model_dump()
-
-        # Convert enum values to strings and handle special cases
-        for key, value in ci_dict.items():
-            if hasattr(value, "value"):  # Enum
-                ci_dict[key] = value.value if hasattr(value, "value") else str(value)
-            elif isinstance(value, dict):  # Dict - convert to JSON string if not empty
-                if value:  # Non-empty dict
-                    import json
-
-                    ci_dict[key] = json.dumps(value)
-                else:  # Empty dict - remove it
-                    ci_dict[key] = None
-            elif isinstance(value, list) and not value:  # Empty list
-                ci_dict[key] = None
-            elif value is None:
-                ci_dict[key] = None
-
-        # Remove None values to avoid Neo4j issues
-        ci_dict = {k: v for k, v in ci_dict.items() if v is not None}
-
-        query = """
-        CREATE (ci:CI)
-        SET ci = $properties
-        RETURN ci
-        """
+        ci_dict = self._to_neo4j_properties(ci.model_dump())
 
         try:
             result = await connection.execute_write_query(
-                query, {"properties": ci_dict}
+                queries.CREATE_CI, {"properties": ci_dict}
+            )
+            graph_projection.add_ci(
+                graph_version.bump([ci.id]),
+                ci.id,
+                ci_dict.get("name"),
+                ci_dict.get("criticality"),
             )
             logger.info(f"Created CI: {ci.id}")
             return ci
@@ -73,45 +102,273 @@ class CIService:
             logger.error(f"Failed to create CI: {e}")
             raise
 
-    def _convert_neo4j_data(self, neo4j_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert Neo4j data types to Python types."""
-        from neo4j.time import DateTime
-        import json
-
-        converted = {}
-        for key, value in neo4j_data.items():
-            if isinstance(value, DateTime):
-                # Convert Neo4j DateTime to Python datetime
-                converted[key] = value.to_native()
-            elif isinstance(value, str) and key == "custom_attributes":
-                # Try to parse JSON string back to dict
-                try:
-                    converted[key] = json.loads(value) if value else {}
-                except (json.JSONDecodeError, TypeError):
-                    converted[key] = {}
+    async def create_ci_with_relationships(
+        self, ci_data: Dict[str, Any], relationships: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Create a Configuration Item and its outgoing relationships atomically.
+
+        The CI and every edge are written by one statement in one transaction,
+        so a failure leaves no partial state. Each relationship is a dict with
+        ``target_ci_id``, ``relationship_type`` and optional ``description``;
+        relationships whose target does not exist are reported in
+        ``failed_relationships`` while the CI and the other edges are created.
+        """
+        connection = await self._get_connection()
+
+        # Generate ID if not provided
+        if "id" not in ci_data:
+            ci_data["id"] = str(uuid4())
+
+        # Create CI object to validate data
+        ci = CI(**ci_data)
+
+        rows = []
+        for index, relationship in enumerate(relationships):
+            relationship_type = relationship["relationship_type"]
+            description = relationship.get("description")
+            rows.append(
+                {
+                    "index": index,
+                    "id": str(uuid4()),
+                    "target_ci_id": relationship["target_ci_id"],
+                    "type": getattr(relationship_type, "value", relationship_type),
+                    "properties": {"description": description} if description else {},
+                }
+            )
+
+        ci_properties = self._to_neo4j_properties(ci.model_dump())
+        try:
+            result = await connection.execute_write_query(
+                queries.CREATE_CI_WITH_RELATIONSHIPS,
+                {"properties": ci_properties, "relationships": rows},
+            )
+        except Exception as e:
+            logger.error(f"Failed to create CI with relationships: {e}")
+            raise
+        version = graph_version.bump([ci.id] + [row["target_ci_id"] for row in rows])
+        graph_projection.add_ci(
+            version, ci.id, ci_properties.get("name"), ci_properties.get("criticality")
+        )
+
+        outcomes = {
+            outcome["index"]: outcome["created"]
+            for outcome in (result[0]["outcomes"] if result else [])
+        }
+        created_relationships = []
+        failed_relationships = []
+        for row, relationship in zip(rows, relationships):
+            if outcomes.get(row["index"]):
+                graph_projection.add_relationship(
+                    version, ci.id, row["target_ci_id"], row["type"]
+                )
+                created_relationships.append(
+                    {
+                        "target_ci_id": row["target_ci_id"],
+                        "relationship_type": row["type"],
+                        "description": relationship.get("description"),
+                    }
+                )
             else:
-                converted[key] = value
-        return converted
+                failed_relationships.append(
+                    {
+                        "target_ci_id": row["target_ci_id"],
+                        "relationship_type": row["type"],
+                        "error": f"Target CI not found: {row['target_ci_id']}",
+                    }
+                )
+
+        logger.info(
+            f"Created CI: {ci.id} with {len(created_relationships)} relationships"
+        )
+        if failed_relationships:
+            logger.warning(
+                f"Skipped {len(failed_relationships)} relationships from {ci.id}: "
+                "target CIs not found"
+            )
+        return {
+            "ci": ci,
+            "created_relationships": created_relationships,
+            "failed_relationships": failed_relationships,
+        }
+
+    async def create_cis(
+        self, items: List[Dict[str, Any]], chunk_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Create many Configuration Items in chunked ``UNWIND`` transactions.
+
+        Every item is validated first; invalid items are reported and skipped.
+        Valid items are written ``chunk_size`` rows per transaction, so a
+        failing chunk (for example a duplicate id) only fails its own items.
+        Returns one result per input item, in input order, with its ``index``,
+        ``id``, ``status`` (``created``, ``invalid`` or ``failed``) and
+        ``error``.
+        """
+        connection = await self._get_connection()
+        chunk_size = chunk_size or get_settings().bulk_chunk_size
+
+        results: List[Dict[str, Any]] = []
+        pending: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+
+        for index, ci_data in enumerate(items):
+            ci_data = dict(ci_data)
+            ci_data.setdefault("id", str(uuid4()))
+            result = {
+                "index": index,
+                "id": ci_data["id"],
+                "status": "created",
+                "error": None,
+            }
+            results.append(result)
+            try:
+                ci = CI(**ci_data)
+            except ValidationError as e:
+                result.update(status="invalid", error=str(e))
+                continue
+            pending.append((result, self._to_neo4j_properties(ci.model_dump())))
+
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start : start + chunk_size]
+            try:
+                await connection.execute_write_query(
+                    queries.BULK_CREATE_CIS,
+                    {"rows": [properties for _, properties in chunk]},
+                )
+                version = graph_version.bump(
+                    properties["id"] for _, properties in chunk
+                )
+                for _, properties in chunk:
+                    graph_projection.add_ci(
+                        version,
+                        properties["id"],
+                        properties.get("name"),
+                        properties.get("criticality"),
+                    )
+            except Exception as e:
+                logger.error(
+                    f"Failed to create CI chunk {start // chunk_size} "
+                    f"({len(chunk)} CIs): {e}"
+                )
+                for result, _ in chunk:
+                    result.update(status="failed", error=str(e))
+
+        created = sum(1 for result in results if result["status"] == "created")
+        logger.info(f"Bulk created {created}/{len(items)} CIs")
+        return results
+
+    def _to_neo4j_properties(
+        self, data: Dict[str, Any], keep_empty: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Convert CI fields to primitive Neo4j property values.
+
+        Empty values (``None``, ``{}`` and ``[]``) are left out, or kept as
+        ``None`` with ``keep_empty`` so that ``SET +=`` removes them.
+        """
+        properties = {}
+        for key, value in data.items():
+            if hasattr(value, "value"):  # Enum
+                value = value.value
+            elif isinstance(value, dict):  # Dict - convert to JSON string if not empty
+                value = json.dumps(value) if value else None
+            elif isinstance(value, list) and not value:  # Empty list
+                value = None
+
+            # Skip None values to avoid Neo4j issues
+            if value is not None or keep_empty:
+                properties[key] = value
+        return properties
+
+    def _build_ci(self, neo4j_data: Dict[str, Any]) -> CI:
+        """Build a CI model from a Neo4j node."""
+        return _hydrate_ci(neo4j_data, strict=get_settings().strict_hydration)
+
+    def _projection_fields(self, fields: List[str]) -> List[str]:
+        """
+        Validate a sparse fieldset and return the properties to project.
+
+        ``id`` and ``name`` always come first: pages are keyed on them.
+        """
+        unknown = [field for field in fields if field not in CI_SUMMARY_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown CI fields: {unknown}")
+        return list(dict.fromkeys(["id", "name", *fields]))
+
+    def _build_summary(
+        self, fields: List[str], values: List[Any], **extra: Any
+    ) -> CISummary:
+        """Build a CI summary from the projected property values."""
+        return _hydrate_summary(
+            dict(zip(fields, values)), strict=get_settings().strict_hydration, **extra
+        )
+
+    def _build_filters(
+        self,
+        ci_type: Optional[CIType],
+        environment: Optional[EnvironmentType],
+        criticality: Optional[CriticalityLevel],
+    ) -> Dict[str, Any]:
+        """
+        Build the parameters for CI list filters.
+
+        Only active filters are included, so the parameter names select the
+        matching canonical query in ``queries``.
+        """
+        parameters: Dict[str, Any] = {}
+
+        if ci_type:
+            parameters["ci_type"] = ci_type.value
+
+        if environment:
+            parameters["environment"] = environment.value
+
+        if criticality:
+            parameters["criticality"] = criticality.value
+
+        return parameters
 
     async def get_ci(self, ci_id: str) -> Optional[CI]:
         """Get a Configuration Item by ID."""
         connection = await self._get_connection()
 
-        query = """
-        MATCH (ci:CI {id: $ci_id})
-        RETURN ci
-        """
-
         try:
-            result = await connection.execute_query(query, {"ci_id": ci_id})
+            result = await connection.execute_query(queries.GET_CI, {"ci_id": ci_id})
             if result:
-                ci_data = self._convert_neo4j_data(result[0]["ci"])
-                return CI(**ci_data)
+                return self._build_ci(result[0]["ci"])
             return None
         except Exception as e:
             logger.error(f"Failed to get CI {ci_id}: {e}")
             raise
 
+    async def get_cis(self, ids: List[str]) -> Tuple[List[CI], List[str]]:
+        """
+        Get many Configuration Items by ID in a single query.
+
+        Returns the CIs found, in the order of ``ids`` (each ID once), and the
+        IDs that do not exist.
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return [], []
+
+        connection = await self._get_connection()
+
+        try:
+            result = await connection.execute_query(queries.GET_CIS, {"ids": ids})
+            found = {}
+            for record in result:
+                ci = self._build_ci(record["ci"])
+                found[ci.id] = ci
+
+            cis = [found[ci_id] for ci_id in ids if ci_id in found]
+            missing = [ci_id for ci_id in ids if ci_id not in found]
+            logger.info(f"Retrieved {len(cis)}/{len(ids)} CIs by ID")
+            return cis, missing
+        except Exception as e:
+            logger.error(f"Failed to get CIs by ID: {e}")
+            raise
+
     async def get_all_cis(
         self,
         ci_type: Optional[CIType] = None,
@@ -119,48 +376,143 @@ class CIService:
         criticality: Optional[CriticalityLevel] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> List[CI]:
-        """Get all Configuration Items with optional filters."""
+        cursor: Optional[str] = None,
+        count: str = COUNT_NONE,
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[List[Union[CI, CISummary]], Optional[str], Optional[int]]:
+        """
+        Get a page of Configuration Items with optional filters.
+
+        CIs are ordered by ``(name, id)``. Pass the returned cursor to get the
+        next page; it continues from the last CI with an index seek, so deep
+        pages cost the same as the first one. ``offset`` is kept for older
+        clients and skips rows on the server.
+
+        ``count`` selects how the CIs matching the filters are counted:
+        ``none`` skips counting, ``exact`` counts in the same query as the
+        page, ``estimated`` uses Neo4j statistics (see ``estimate_ci_count``).
+        With ``fields``, only those properties are read and each CI is
+        returned as a ``CISummary``.
+        Returns the page, the cursor of the next page (``None`` on the last
+        page) and the count (``None`` with ``count=none``).
+        """
+        if count not in COUNT_MODES:
+            raise ValueError(
+                f"Unknown count mode '{count}', expected one of {COUNT_MODES}"
+            )
+        if fields is not None:
+            fields = self._projection_fields(fields)
+
         connection = await self._get_connection()
 
-        # Build dynamic query based on filters
-        where_clauses = []
-        parameters: Dict[str, Any] = {"limit": limit, "offset": offset}
+        # Pick the canonical query for the active filters
+        filters = self._build_filters(ci_type, environment, criticality)
+        query = queries.list_cis_query(
+            filters,
+            after_cursor=cursor is not None,
+            with_count=count == COUNT_EXACT,
+            projected=fields is not None,
+        )
+
+        # Fetch one extra row to know whether another page exists
+        parameters = dict(filters, limit=limit + 1)
+        if fields is not None:
+            parameters["fields"] = fields
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            parameters.update(
+                {"cursor_name": position.get("name"), "cursor_id": position.get("id")}
+            )
+        else:
+            parameters["offset"] = offset
+
+        try:
+            result = await connection.execute_query(query, parameters)
 
-        if ci_type:
-            where_clauses.append("ci.ci_type = $ci_type")
-            parameters["ci_type"] = ci_type.value
+            total_count = None
+            if count == COUNT_EXACT:
+                nodes = result[0]["cis"] if result else []
+                total_count = result[0]["total_count"] if result else 0
+            else:
+                nodes = [record["ci"] for record in result]
+            if fields is not None:
+                cis = [self._build_summary(fields, values) for values in nodes[:limit]]
+            else:
+                cis = [self._build_ci(node) for node in nodes[:limit]]
 
-        if environment:
-            where_clauses.append("ci.environment = $environment")
-            parameters["environment"] = environment.value
+            next_cursor = None
+            if len(nodes) > limit:
+                next_cursor = encode_cursor({"name": cis[-1].name, "id": cis[-1].id})
 
-        if criticality:
-            where_clauses.append("ci.criticality = $criticality")
-            parameters["criticality"] = criticality.value
+            if count == COUNT_ESTIMATED:
+                total_count = await self.estimate_ci_count(
+                    ci_type, environment, criticality
+                )
 
-        where_clause = " AND ".join(where_clauses) if where_clauses else "true"
+            logger.info(f"Retrieved {len(cis)} CIs")
+            return cis, next_cursor, total_count
+        except Exception as e:
+            logger.error(f"Failed to get CIs: {e}")
+            raise
 
-        query = f"""
-        MATCH (ci:CI)
-        WHERE {where_clause}
-        RETURN ci
-        ORDER BY ci.name
-        SKIP $offset
-        LIMIT $limit
+    async def estimate_ci_count(
+        self,
+        ci_type: Optional[CIType] = None,
+        environment: Optional[EnvironmentType] = None,
+        criticality: Optional[CriticalityLevel] = None,
+    ) -> int:
         """
+        Estimate the number of CIs matching the filters in constant time.
+
+        Without filters the label count store gives the exact count. With
+        filters, the planner's row estimate for the filtered match is used
+        (from index selectivity statistics), obtained with ``EXPLAIN`` so no
+        CI is read.
+        """
+        connection = await self._get_connection()
+        filters = self._build_filters(ci_type, environment, criticality)
 
         try:
-            result = await connection.execute_query(query, parameters)
-            cis = []
-            for record in result:
-                ci_data = self._convert_neo4j_data(record["ci"])
-                cis.append(CI(**ci_data))
+            if not filters:
+                result = await connection.execute_query(queries.COUNT_CIS)
+                return result[0]["total_count"] if result else 0
 
-            logger.info(f"Retrieved {len(cis)} CIs")
-            return cis
+            plan = await connection.explain(queries.stream_cis_query(filters), filters)
+            estimated_rows = ((plan or {}).get("args") or {}).get("EstimatedRows", 0)
+            return int(round(estimated_rows))
         except Exception as e:
-            logger.error(f"Failed to get CIs: {e}")
+            logger.error(f"Failed to estimate CI count: {e}")
+            raise
+
+    async def stream_all_cis(
+        self,
+        ci_type: Optional[CIType] = None,
+        environment: Optional[EnvironmentType] = None,
+        criticality: Optional[CriticalityLevel] = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[CI]:
+        """
+        Stream all Configuration Items matching the optional filters.
+
+        Records are fetched ``batch_size`` at a time, so memory stays flat
+        regardless of the inventory size. Results are not sorted, to avoid
+        an eager sort on the server.
+        """
+        connection = await self._get_connection()
+
+        parameters = self._build_filters(ci_type, environment, criticality)
+        query = queries.stream_cis_query(parameters)
+
+        try:
+            streamed = 0
+            async for batch in connection.stream_query(query, parameters, batch_size):
+                for record in batch:
+                    yield self._build_ci(record["ci"])
+                streamed += len(batch)
+
+            logger.info(f"Streamed {streamed} CIs")
+        except Exception as e:
+            logger.error(f"Failed to stream CIs: {e}")
             raise
 
     async def update_ci(self, ci_id: str, update_data: Dict[str, Any]) -> Optional[CI]:
@@ -170,31 +522,23 @@ class CIService:
         # Remove id from update data if present
         update_data.pop("id", None)
 
-        # Build SET clause dynamically
-        set_clauses = []
-        parameters: Dict[str, Any] = {"ci_id": ci_id}
+        # Properties are merged into the node with a single parameter map;
+        # cleared fields are sent as null, which removes them
+        properties = self._to_neo4j_properties(update_data, keep_empty=True)
 
-        for key, value in update_data.items():
-            set_clauses.append(f"ci.{key} = ${key}")
-            parameters[key] = value
-
-        if not set_clauses:
+        if not properties:
             # No updates to perform
             return await self.get_ci(ci_id)
 
-        set_clause = ", ".join(set_clauses)
-
-        query = f"""
-        MATCH (ci:CI {{id: $ci_id}})
-        SET {set_clause}
-        RETURN ci
-        """
-
         try:
-            result = await connection.execute_write_query(query, parameters)
+            result = await connection.execute_write_query(
+                queries.UPDATE_CI, {"ci_id": ci_id, "properties": properties}
+            )
             if result:
-                ci_data = self._convert_neo4j_data(result[0]["ci"])
-                updated_ci = CI(**ci_data)
+                graph_projection.update_ci(
+                    graph_version.bump([ci_id]), ci_id, properties
+                )
+                updated_ci = self._build_ci(result[0]["ci"])
                 logger.info(f"Updated CI: {ci_id}")
                 return updated_ci
             return None
@@ -206,17 +550,14 @@ class CIService:
         """Delete a Configuration Item."""
         connection = await self._get_connection()
 
-        query = """
-        MATCH (ci:CI {id: $ci_id})
-        DETACH DELETE ci
-        RETURN count(ci) as deleted_count
-        """
-
         try:
-            result = await connection.execute_write_query(query, {"ci_id": ci_id})
+            result = await connection.execute_write_query(
+                queries.DELETE_CI, {"ci_id": ci_id}
+            )
             deleted_count = result[0]["deleted_count"] if result else 0
 
             if deleted_count > 0:
+                graph_projection.remove_ci(graph_version.bump([ci_id]), ci_id)
                 logger.info(f"Deleted CI: {ci_id}")
                 return True
 
@@ -226,47 +567,137 @@ class CIService:
             logger.error(f"Failed to delete CI {ci_id}: {e}")
             raise
 
-    async def search_cis(self, query_text: str, limit: int = 50) -> List[CI]:
-        """Search Configuration Items by text."""
+    async def search_cis(
+        self,
+        query_text: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[List[Union[CISearchResult, CISummary]], Optional[str]]:
+        """
+        Search Configuration Items by text, most relevant first.
+
+        Uses the ``ci_search`` full-text index with prefix and fuzzy matching.
+        With ``fields``, only those properties are read and each result is a
+        ``CISummary`` with its score.
+        Returns the page of results and the cursor of the next page, or
+        ``None`` when there are no more results. The cursor is the score and
+        id of the last result; scores change with the index, so pages read
+        while CIs are written may skip or repeat results.
+        """
+        if fields is not None:
+            fields = self._projection_fields(fields)
+
         connection = await self._get_connection()
 
-        query = """
-        MATCH (ci:CI)
-        WHERE toLower(ci.name) CONTAINS toLower($query_text)
-           OR toLower(ci.description) CONTAINS toLower($query_text)
-           OR toLower(ci.hostname) CONTAINS toLower($query_text)
-        RETURN ci
-        ORDER BY ci.name
-        LIMIT $limit
-        """
+        search_query = build_fulltext_query(query_text)
+        if not search_query:
+            return [], None
 
-        try:
-            result = await connection.execute_query(
-                query, {"query_text": query_text, "limit": limit}
-            )
+        position = decode_cursor(cursor) if cursor else {}
 
-            cis = []
-            for record in result:
-                ci_data = self._convert_neo4j_data(record["ci"])
-                cis.append(CI(**ci_data))
+        try:
+            # Fetch one extra row to know whether another page exists
+            parameters = {
+                "search_query": search_query,
+                "cursor_score": position.get("score"),
+                "cursor_id": position.get("id"),
+                "limit": limit + 1,
+            }
+            if fields is not None:
+                parameters["fields"] = fields
+                result = await connection.execute_query(
+                    queries.SEARCH_CIS_PROJECTED, parameters
+                )
+                cis = [
+                    self._build_summary(fields, record["ci"], score=record["score"])
+                    for record in result[:limit]
+                ]
+            else:
+                result = await connection.execute_query(queries.SEARCH_CIS, parameters)
+                strict = get_settings().strict_hydration
+                cis = [
+                    _hydrate_search_result(
+                        record["ci"], strict=strict, score=record["score"]
+                    )
+                    for record in result[:limit]
+                ]
+            next_cursor = None
+            if len(result) > limit:
+                last = cis[-1]
+                next_cursor = encode_cursor({"score": last.score, "id": last.id})
 
             logger.info(f"Search found {len(cis)} CIs for query: {query_text}")
-            return cis
+            return cis, next_cursor
         except Exception as e:
             logger.error(f"Failed to search CIs: {e}")
             raise
 
+    async def get_ci_facets(
+        self,
+        facets: Optional[List[str]] = None,
+        ci_type: Optional[CIType] = None,
+        environment: Optional[EnvironmentType] = None,
+        criticality: Optional[CriticalityLevel] = None,
+    ) -> Dict[str, Any]:
+        """
+        Count the CIs matching the filters by value of each requested facet.
+
+        All facets are counted in one pass over the matching CIs. Results are
+        cached until the next write to the graph (see ``graph_version``) or
+        for at most ``facet_cache_ttl`` seconds.
+        Returns ``facets``, mapping each facet to its ``value``/``count``
+        pairs by decreasing count (CIs without the property count under a
+        ``None`` value), the number of matching CIs as ``total_count`` and
+        the ``graph_version`` the counts were computed at.
+        """
+        facets = list(dict.fromkeys(facets or queries.CI_FACETS))
+        unknown = [facet for facet in facets if facet not in queries.CI_FACETS]
+        if unknown:
+            raise ValueError(f"Unknown facets: {unknown}")
+
+        filters = self._build_filters(ci_type, environment, criticality)
+        key = (tuple(sorted(filters.items())), tuple(facets))
+
+        version = graph_version.value
+        cached = self._facet_cache.get(key)
+        if cached is not None:
+            return cached
+
+        connection = await self._get_connection()
+
+        try:
+            result = await connection.execute_query(
+                queries.facet_cis_query(filters), dict(filters, facets=facets)
+            )
+        except Exception as e:
+            logger.error(f"Failed to count CI facets: {e}")
+            raise
+
+        counts: Dict[str, List[Dict[str, Any]]] = {facet: [] for facet in facets}
+        for record in result:
+            counts[record["facet"]].append(
+                {"value": record["value"], "count": record["count"]}
+            )
+        for values in counts.values():
+            values.sort(key=lambda item: (-item["count"], str(item["value"])))
+
+        # Every matching CI is counted exactly once per facet
+        facet_counts = {
+            "facets": counts,
+            "total_count": sum(item["count"] for item in counts[facets[0]]),
+            "graph_version": version,
+        }
+
+        self._facet_cache.put(key, version, facet_counts)
+        return facet_counts
+
     async def get_ci_count(self) -> int:
         """Get total count of Configuration Items."""
         connection = await self._get_connection()
 
-        query = """
-        MATCH (ci:CI)
-        RETURN count(ci) as total_count
-        """
-
         try:
-            result = await connection.execute_query(query)
+            result = await connection.execute_query(queries.COUNT_CIS)
             return result[0]["total_count"] if result else 0
         except Exception as e:
             logger.error(f"Failed to get CI count: {e}")
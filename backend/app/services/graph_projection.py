@@ -0,0 +1,812 @@
+"""
+In-memory projection of the dependency graph for impact and dependency analysis.
+
+The projection holds every CI and every dependency edge (the relationship
+types in ``DEPENDENCY_RELATIONSHIP_TYPES``) as compressed sparse row (CSR)
+adjacency arrays: CI ids are interned to integers, edge types to small codes,
+and each direction of the graph is an ``indptr``/``indices``/``types`` triple.
+A breadth-first traversal then expands a whole level with a few vectorized
+NumPy operations instead of a Cypher query per level.
+
+The projection is built from Neo4j in the background and kept current by the
+services: each write bumps ``graph_version`` and hands the change and the new
+version to the projection, which applies it to a small overlay on top of the
+CSR arrays (compacted into new arrays once it grows past
+``graph_projection_max_delta``). A write that is not applied, for example
+one that failed half way, leaves the projection behind ``graph_version``: it
+is then stale, traversals fall back to Cypher and a rebuild is scheduled.
+Building and compacting the arrays sorts every edge, so both run in a worker
+thread and the result is swapped in when done, keeping the event loop free;
+changes applied while compacting are replayed onto the compacted snapshot.
+Like ``graph_version``, the projection is per worker; writes made by another
+worker or directly against Neo4j are only detected by ``check_consistency``.
+"""
+import asyncio
+import logging
+import random
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from . import queries
+from .graph_version import graph_version
+from ..config import get_settings
+from ..database import get_neo4j_connection
+
+logger = logging.getLogger(__name__)
+
+# Edge type codes: index in DEPENDENCY_RELATIONSHIP_TYPES
+_TYPE_CODES = {
+    rel_type: code
+    for code, rel_type in enumerate(queries.DEPENDENCY_RELATIONSHIP_TYPES)
+}
+
+# One breadth-first level: the nodes first reached, and the parent node and
+# edge type code reaching each
+_Level = Tuple[List[int], List[int], List[int]]
+
+
+class _Adjacency:
+    """One direction of the graph: CSR arrays plus an overlay of later edges."""
+
+    def __init__(
+        self, sources: np.ndarray, targets: np.ndarray, codes: np.ndarray, size: int
+    ):
+        order = np.argsort(sources, kind="stable")
+        self.indices = targets[order].astype(np.int32)
+        self.types = codes[order].astype(np.uint8)
+        self.alive = np.ones(len(order), dtype=bool)
+        self.indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=size), out=self.indptr[1:])
+        # Edges added since the arrays were built: node -> [(neighbour, code)]
+        self.added: Dict[int, List[Tuple[int, int]]] = {}
+
+    @property
+    def rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def add(self, source: int, target: int, code: int) -> None:
+        self.added.setdefault(source, []).append((target, code))
+
+    def remove(self, source: int, target: int, code: int) -> bool:
+        """Remove one edge, from the overlay first. Returns whether it existed."""
+        edges = self.added.get(source)
+        if edges and (target, code) in edges:
+            edges.remove((target, code))
+            return True
+        if source < self.rows:
+            start, end = self.indptr[source], self.indptr[source + 1]
+            matches = np.flatnonzero(
+                (self.indices[start:end] == target)
+                & (self.types[start:end] == code)
+                & self.alive[start:end]
+            )
+            if len(matches):
+                self.alive[start + matches[0]] = False
+                return True
+        return False
+
+    def edges(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the ``(sources, targets, codes)`` of every live edge."""
+        sources = np.repeat(np.arange(self.rows, dtype=np.int32), np.diff(self.indptr))
+        extra = [
+            (source, target, code)
+            for source, edges in self.added.items()
+            for target, code in edges
+        ]
+        extra_array = np.array(extra, dtype=np.int64).reshape(-1, 3)
+        return (
+            np.concatenate([sources[self.alive], extra_array[:, 0]]),
+            np.concatenate([self.indices[self.alive], extra_array[:, 1]]),
+            np.concatenate([self.types[self.alive], extra_array[:, 2]]),
+        )
+
+    def neighbours(self, node: int) -> List[Tuple[int, int]]:
+        """Return the live ``(neighbour, code)`` edges of a node."""
+        result = list(self.added.get(node, ()))
+        if node < self.rows:
+            start, end = self.indptr[node], self.indptr[node + 1]
+            alive = self.alive[start:end]
+            result.extend(
+                zip(
+                    self.indices[start:end][alive].tolist(),
+                    self.types[start:end][alive].tolist(),
+                )
+            )
+        return result
+
+    def expand(self, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the ``(parents, targets, codes)`` of the edges leaving a frontier."""
+        rows = frontier[frontier < self.rows]
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        # Position of every edge of every frontier row, in one gather
+        positions = np.repeat(
+            starts - np.cumsum(lengths) + lengths, lengths
+        ) + np.arange(int(lengths.sum()))
+        keep = self.alive[positions]
+        parents = np.repeat(rows, lengths)[keep]
+        positions = positions[keep]
+        targets = self.indices[positions]
+        codes = self.types[positions]
+
+        extra = []
+        if self.added:
+            overlay = np.fromiter(self.added, dtype=np.int64, count=len(self.added))
+            for source in overlay[np.isin(overlay, frontier)].tolist():
+                extra.extend(
+                    (source, target, code) for target, code in self.added[source]
+                )
+        if extra:
+            extra_array = np.array(extra, dtype=np.int64)
+            parents = np.concatenate([parents, extra_array[:, 0]])
+            targets = np.concatenate([targets, extra_array[:, 1]])
+            codes = np.concatenate([codes, extra_array[:, 2]])
+        return parents, targets, codes
+
+
+class GraphSnapshot:
+    """CIs and dependency edges of the graph, interned and stored as CSR arrays."""
+
+    def __init__(
+        self,
+        ids: List[str],
+        names: List[Optional[str]],
+        criticalities: List[Optional[str]],
+        sources: np.ndarray,
+        targets: np.ndarray,
+        codes: np.ndarray,
+    ):
+        self.ids = ids
+        self.names = names
+        self.criticalities = criticalities
+        self.index = {ci_id: node for node, ci_id in enumerate(ids)}
+        self.alive = np.ones(len(ids), dtype=bool)
+        # Edge A -> B: A depends on B. Dependencies follow outgoing edges,
+        # impact follows incoming ones
+        self.outgoing = _Adjacency(sources, targets, codes, len(ids))
+        self.incoming = _Adjacency(targets, sources, codes, len(ids))
+        self.delta = 0
+
+    @property
+    def ci_count(self) -> int:
+        return len(self.index)
+
+    def edge_counts(self) -> Dict[str, int]:
+        """Return the number of live edges per relationship type."""
+        _, _, codes = self._live(self.outgoing.edges())
+        counts = np.bincount(codes.astype(np.int64), minlength=len(_TYPE_CODES))
+        return {rel_type: int(counts[code]) for rel_type, code in _TYPE_CODES.items()}
+
+    def _live(
+        self, edges: Tuple[np.ndarray, np.ndarray, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        sources, targets, codes = edges
+        keep = self.alive[sources] & self.alive[targets]
+        return sources[keep], targets[keep], codes[keep]
+
+    def add_ci(
+        self, ci_id: str, name: Optional[str], criticality: Optional[str]
+    ) -> None:
+        if ci_id in self.index:
+            self.update_ci(ci_id, {"name": name, "criticality": criticality})
+            return
+        self.index[ci_id] = len(self.ids)
+        self.ids.append(ci_id)
+        self.names.append(name)
+        self.criticalities.append(criticality)
+        if len(self.ids) > len(self.alive):
+            grown = np.zeros(max(2 * len(self.alive), 16), dtype=bool)
+            grown[: len(self.alive)] = self.alive
+            self.alive = grown
+        self.alive[len(self.ids) - 1] = True
+
+    def update_ci(self, ci_id: str, properties: Dict[str, Any]) -> None:
+        node = self.index.get(ci_id)
+        if node is None:
+            return
+        if "name" in properties:
+            self.names[node] = properties["name"]
+        if "criticality" in properties:
+            self.criticalities[node] = properties["criticality"]
+
+    def remove_ci(self, ci_id: str) -> None:
+        # The node keeps its number, so edges to it are skipped rather than
+        # rewritten; a CI created later with the same id gets a new number
+        node = self.index.pop(ci_id, None)
+        if node is not None:
+            self.alive[node] = False
+            self.delta += 1
+
+    def add_edge(self, from_ci_id: str, to_ci_id: str, code: int) -> None:
+        source, target = self.index.get(from_ci_id), self.index.get(to_ci_id)
+        if source is None or target is None:
+            return
+        self.outgoing.add(source, target, code)
+        self.incoming.add(target, source, code)
+        self.delta += 1
+
+    def remove_edge(self, from_ci_id: str, to_ci_id: str, code: int) -> None:
+        source, target = self.index.get(from_ci_id), self.index.get(to_ci_id)
+        if source is None or target is None:
+            return
+        if self.outgoing.remove(source, target, code):
+            self.incoming.remove(target, source, code)
+            self.delta += 1
+
+    def compact(self) -> "GraphSnapshot":
+        """Return a snapshot with the overlay and removed CIs folded into the arrays."""
+        return _compacted(*self.compaction_inputs())
+
+    def compaction_inputs(self) -> Tuple[Any, ...]:
+        """
+        Copy the CIs and live edges for ``_compacted``.
+
+        The copies are independent of the snapshot, so the compacted arrays
+        can be built in another thread while the snapshot keeps changing.
+        """
+        return (
+            list(self.ids),
+            list(self.names),
+            list(self.criticalities),
+            np.flatnonzero(self.alive[: len(self.ids)]),
+            *self._live(self.outgoing.edges()),
+        )
+
+    def out_edges(self, ci_id: str) -> List[Tuple[str, str]]:
+        """Return the ``(ci_id, type)`` dependency edges leaving a CI, sorted."""
+        node = self.index.get(ci_id)
+        if node is None:
+            return []
+        return sorted(
+            (self.ids[target], queries.DEPENDENCY_RELATIONSHIP_TYPES[code])
+            for target, code in self.outgoing.neighbours(node)
+            if self.alive[target]
+        )
+
+    def traverse(
+        self, sources: List[str], max_depth: int, impact: bool
+    ) -> List[_Level]:
+        """
+        Breadth-first search from one or more CIs.
+
+        Returns one ``(nodes, parents, codes)`` triple per level: the CIs
+        first reached at that distance from the nearest source, each once,
+        with the node and edge type code reaching it. Sources are not
+        returned.
+        """
+        adjacency = self.incoming if impact else self.outgoing
+        size = len(self.alive)
+        distance = np.full(size, -1, dtype=np.int8)
+        winner = np.empty(size, dtype=np.int64)
+        frontier = np.array(
+            sorted({self.index[ci_id] for ci_id in sources if ci_id in self.index}),
+            dtype=np.int64,
+        )
+        distance[frontier] = 0
+        levels: List[_Level] = []
+
+        for depth in range(1, max_depth + 1):
+            if not len(frontier):
+                break
+            parents, targets, codes = adjacency.expand(frontier)
+            keep = self.alive[targets] & (distance[targets] < 0)
+            parents, targets, codes = parents[keep], targets[keep], codes[keep]
+            # One edge per new CI without sorting: every edge writes its
+            # position into its target's slot and whichever write lands wins
+            positions = np.arange(len(targets))
+            winner[targets] = positions
+            chosen = winner[targets] == positions
+            parents, targets, codes = parents[chosen], targets[chosen], codes[chosen]
+            distance[targets] = depth
+            levels.append((targets.tolist(), parents.tolist(), codes.tolist()))
+            frontier = targets
+        return levels
+
+    def reach(
+        self, sources: List[str], max_depth: int, impact: bool
+    ) -> Tuple[List[_Level], Dict[int, List[int]]]:
+        """
+        Breadth-first search from several CIs, tracking which reach each CI.
+
+        Returns the levels of ``traverse`` (minimal distance to any source)
+        and, for every CI reached, the source nodes reaching it within
+        ``max_depth``. Each node carries a bitset of sources; a level only
+        expands the sources that newly reached a node at the previous level,
+        so this is one search per source run side by side, each CI expanded
+        at most once per source. Sources are not returned, but a search goes
+        through the other sources it reaches.
+        """
+        adjacency = self.incoming if impact else self.outgoing
+        size = len(self.alive)
+        nodes = sorted({self.index[ci_id] for ci_id in sources if ci_id in self.index})
+        words = max(1, (len(nodes) + 63) // 64)
+        # Bit i of a row: source i reaches the node (reached), or reached it
+        # at the previous level (fresh)
+        reached = np.zeros((size, words), dtype=np.uint64)
+        for bit, node in enumerate(nodes):
+            reached[node, bit // 64] |= np.uint64(1 << (bit % 64))
+        fresh = reached.copy()
+        distance = np.full(size, -1, dtype=np.int8)
+        winner = np.empty(size, dtype=np.int64)
+        frontier = np.array(nodes, dtype=np.int64)
+        distance[frontier] = 0
+        levels: List[_Level] = []
+
+        for depth in range(1, max_depth + 1):
+            if not len(frontier):
+                break
+            parents, targets, codes = adjacency.expand(frontier)
+            new = fresh[parents] & ~reached[targets]
+            keep = self.alive[targets] & new.any(axis=1)
+            parents, targets, codes = parents[keep], targets[keep], codes[keep]
+            new = new[keep]
+            fresh[frontier] = 0
+            np.bitwise_or.at(fresh, targets, new)
+
+            first = np.flatnonzero(distance[targets] < 0)
+            positions = np.arange(len(first))
+            winner[targets[first]] = positions
+            first = first[winner[targets[first]] == positions]
+            distance[targets[first]] = depth
+            levels.append(
+                (
+                    targets[first].tolist(),
+                    parents[first].tolist(),
+                    codes[first].tolist(),
+                )
+            )
+
+            frontier = np.unique(targets)
+            reached[frontier] |= fresh[frontier]
+
+        # Decode each distinct source set once; CIs hit by the same sources
+        # share the list. Rows are compared as opaque bytes, which np.unique
+        # handles much faster than a 2-D array
+        impacted = np.flatnonzero(distance > 0)
+        rows = np.ascontiguousarray(reached[impacted].astype("<u8"))
+        masks, group = np.unique(
+            rows.view(np.dtype((np.void, 8 * words))).reshape(-1),
+            return_inverse=True,
+        )
+        bits = np.unpackbits(
+            masks.view(np.uint8).reshape(len(masks), 8 * words),
+            axis=1,
+            bitorder="little",
+        )
+        owners, positions = np.nonzero(bits)
+        bounds = np.searchsorted(owners, np.arange(len(masks) + 1)).tolist()
+        members = np.array(nodes, dtype=np.int64)[positions].tolist()
+        groups = [members[start:end] for start, end in zip(bounds, bounds[1:])]
+        origins = {
+            node: groups[index]
+            for node, index in zip(impacted.tolist(), group.reshape(-1).tolist())
+        }
+        return levels, origins
+
+
+def _compacted(
+    ids: List[str],
+    names: List[Optional[str]],
+    criticalities: List[Optional[str]],
+    live: np.ndarray,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    codes: np.ndarray,
+) -> GraphSnapshot:
+    """Build a snapshot of the live CIs and edges, renumbering the CIs."""
+    renumber = np.full(len(ids), -1, dtype=np.int64)
+    renumber[live] = np.arange(len(live))
+    return GraphSnapshot(
+        [ids[node] for node in live.tolist()],
+        [names[node] for node in live.tolist()],
+        [criticalities[node] for node in live.tolist()],
+        renumber[sources],
+        renumber[targets],
+        codes,
+    )
+
+
+class SnapshotBuilder:
+    """Accumulates CIs and edges, then builds a ``GraphSnapshot``."""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.names: List[Optional[str]] = []
+        self.criticalities: List[Optional[str]] = []
+        self.index: Dict[str, int] = {}
+        self.sources = array("i")
+        self.targets = array("i")
+        self.codes = array("B")
+
+    def add_ci(
+        self, ci_id: str, name: Optional[str], criticality: Optional[str]
+    ) -> None:
+        if ci_id in self.index:
+            return
+        self.index[ci_id] = len(self.ids)
+        self.ids.append(ci_id)
+        self.names.append(name)
+        self.criticalities.append(criticality)
+
+    def add_edge(self, from_ci_id: str, to_ci_id: str, rel_type: str) -> None:
+        source, target = self.index.get(from_ci_id), self.index.get(to_ci_id)
+        code = _TYPE_CODES.get(rel_type)
+        if source is None or target is None or code is None:
+            return
+        self.sources.append(source)
+        self.targets.append(target)
+        self.codes.append(code)
+
+    def build(self) -> GraphSnapshot:
+        return GraphSnapshot(
+            self.ids,
+            self.names,
+            self.criticalities,
+            np.frombuffer(self.sources, dtype=np.int32).astype(np.int64),
+            np.frombuffer(self.targets, dtype=np.int32).astype(np.int64),
+            np.frombuffer(self.codes, dtype=np.uint8),
+        )
+
+
+class GraphProjection:
+    """The worker's projection of the dependency graph, and its freshness."""
+
+    def __init__(self):
+        self.connection = None
+        self.snapshot: Optional[GraphSnapshot] = None
+        # graph_version the snapshot reflects; None when known to be wrong
+        self.version: Optional[int] = None
+        self.built_at: Optional[float] = None
+        self.build_seconds: Optional[float] = None
+        self._rebuild_task: Optional[asyncio.Task] = None
+        self._last_rebuild = 0.0
+        self._compaction_task: Optional[asyncio.Task] = None
+        # Changes applied while the snapshot is compacted, replayed onto the
+        # compacted snapshot; None when no compaction is running
+        self._replay: Optional[List[Tuple[str, Tuple[Any, ...]]]] = None
+
+    async def _get_connection(self):
+        """Get Neo4j connection."""
+        if not self.connection:
+            self.connection = await get_neo4j_connection()
+        return self.connection
+
+    @property
+    def is_current(self) -> bool:
+        """Whether the snapshot reflects every write seen by this worker."""
+        return self.snapshot is not None and self.version == graph_version.value
+
+    # -- Building -----------------------------------------------------------
+
+    async def rebuild(self) -> None:
+        """Load the graph from Neo4j and replace the snapshot."""
+        connection = await self._get_connection()
+        version = graph_version.value
+        started = time.perf_counter()
+        self._last_rebuild = time.monotonic()
+        builder = SnapshotBuilder()
+
+        try:
+            async for batch in connection.stream_query(queries.PROJECTION_CIS):
+                for record in batch:
+                    builder.add_ci(
+                        record["ci_id"], record["ci_name"], record["criticality"]
+                    )
+            async for batch in connection.stream_query(
+                queries.PROJECTION_RELATIONSHIPS,
+                {"relationship_types": queries.DEPENDENCY_RELATIONSHIP_TYPES},
+            ):
+                for record in batch:
+                    builder.add_edge(
+                        record["from_ci_id"], record["to_ci_id"], record["rel_type"]
+                    )
+            snapshot = await asyncio.to_thread(builder.build)
+        except Exception as e:
+            logger.error(f"Failed to build graph projection: {e}")
+            raise
+
+        # Writes made while loading may be missing: the version taken before
+        # loading keeps the snapshot stale until the next rebuild then
+        self.snapshot, self.version = snapshot, version
+        self.built_at = time.time()
+        self.build_seconds = time.perf_counter() - started
+        logger.info(
+            f"Built graph projection: {snapshot.ci_count} CIs, "
+            f"{len(snapshot.outgoing.indices)} edges in {self.build_seconds:.3f}s"
+        )
+
+    def _schedule_rebuild(self) -> None:
+        """Start a background rebuild unless one is running or ran recently."""
+        if self._rebuild_task is not None and not self._rebuild_task.done():
+            return
+        interval = get_settings().graph_projection_rebuild_interval
+        if time.monotonic() - self._last_rebuild < interval:
+            return
+        self._rebuild_task = asyncio.get_running_loop().create_task(self.rebuild())
+        self._rebuild_task.add_done_callback(_log_rebuild_failure)
+
+    def cancel_rebuild(self) -> None:
+        for task in (self._rebuild_task, self._compaction_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+    # -- Write hooks ----------------------------------------------------------
+
+    def _apply(self, version: int) -> Optional[GraphSnapshot]:
+        """
+        Return the snapshot if a change made at ``version`` can be applied.
+
+        A write bumps the version once and may apply several changes at that
+        version; any gap means a write was missed and the snapshot is stale.
+        """
+        if self.snapshot is None or self.version not in (version - 1, version):
+            return None
+        self.version = version
+        return self.snapshot
+
+    def _change(self, version: int, change: str, *args: Any) -> None:
+        """Apply a snapshot change made at ``version``, compacting past max_delta."""
+        snapshot = self._apply(version)
+        if snapshot is None:
+            return
+        getattr(snapshot, change)(*args)
+        if self._replay is not None:
+            self._replay.append((change, args))
+        elif snapshot.delta >= get_settings().graph_projection_max_delta:
+            inputs = snapshot.compaction_inputs()
+            self._replay = []
+            self._compaction_task = asyncio.get_running_loop().create_task(
+                self._compact(snapshot, inputs)
+            )
+            self._compaction_task.add_done_callback(_log_compaction_failure)
+
+    async def _compact(self, snapshot: GraphSnapshot, inputs: Tuple[Any, ...]) -> None:
+        """Build the compacted snapshot in a worker thread and swap it in."""
+        try:
+            compacted = await asyncio.to_thread(_compacted, *inputs)
+            # A rebuild may have replaced the snapshot in the meantime
+            if self.snapshot is snapshot:
+                for change, args in self._replay:
+                    getattr(compacted, change)(*args)
+                self.snapshot = compacted
+        finally:
+            self._replay = None
+
+    def add_ci(
+        self, version: int, ci_id: str, name: Optional[str], criticality: Optional[str]
+    ) -> None:
+        self._change(version, "add_ci", ci_id, name, criticality)
+
+    def update_ci(self, version: int, ci_id: str, properties: Dict[str, Any]) -> None:
+        self._change(version, "update_ci", ci_id, dict(properties))
+
+    def remove_ci(self, version: int, ci_id: str) -> None:
+        self._change(version, "remove_ci", ci_id)
+
+    def add_relationship(
+        self, version: int, from_ci_id: str, to_ci_id: str, rel_type: str
+    ) -> None:
+        if rel_type in _TYPE_CODES:
+            self._change(
+                version, "add_edge", from_ci_id, to_ci_id, _TYPE_CODES[rel_type]
+            )
+
+    def remove_relationship(
+        self, version: int, from_ci_id: str, to_ci_id: str, rel_type: str
+    ) -> None:
+        if rel_type in _TYPE_CODES:
+            self._change(
+                version, "remove_edge", from_ci_id, to_ci_id, _TYPE_CODES[rel_type]
+            )
+
+    # -- Queries --------------------------------------------------------------
+
+    def _current_snapshot(self) -> Optional[GraphSnapshot]:
+        """Return the snapshot if current, scheduling a rebuild when stale."""
+        if not get_settings().graph_projection_enabled:
+            return None
+        if self.is_current:
+            return self.snapshot
+        self._schedule_rebuild()
+        return None
+
+    def traverse(
+        self, sources: List[str], max_depth: int, impact: bool
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Distinct breadth-first traversal answered from the projection.
+
+        Returns records shaped and ordered like the Cypher traversal's (by
+        distance, then criticality descending), each reachable CI once at its
+        minimal distance with one shortest relationship chain; or ``None`` if
+        the projection is disabled or stale, in which case the caller queries
+        Neo4j.
+        """
+        snapshot = self._current_snapshot()
+        if snapshot is None:
+            return None
+
+        return _records(
+            snapshot, sources, snapshot.traverse(sources, max_depth, impact)
+        )
+
+    def reach(
+        self, sources: List[str], max_depth: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Multi-source impact traversal answered from the projection.
+
+        Returns the records of ``traverse`` from all ``sources`` at once, each
+        with the ``sources`` reaching it within ``max_depth``; or ``None`` if
+        the projection is disabled or stale.
+        """
+        snapshot = self._current_snapshot()
+        if snapshot is None:
+            return None
+
+        levels, origins = snapshot.reach(sources, max_depth, impact=True)
+        return _records(snapshot, sources, levels, origins)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the projection's size and freshness."""
+        snapshot = self.snapshot
+        return {
+            "enabled": get_settings().graph_projection_enabled,
+            "built": snapshot is not None,
+            "current": self.is_current,
+            "version": self.version,
+            "graph_version": graph_version.value,
+            "cis": snapshot.ci_count if snapshot else 0,
+            "edges": sum(snapshot.edge_counts().values()) if snapshot else 0,
+            "pending_changes": snapshot.delta if snapshot else 0,
+            "compacting": self._replay is not None,
+            "built_at": self.built_at,
+            "build_seconds": self.build_seconds,
+        }
+
+    # -- Consistency ----------------------------------------------------------
+
+    async def check_consistency(self, sample_size: int = 100) -> Dict[str, Any]:
+        """
+        Compare the projection with Neo4j.
+
+        Compares the number of CIs, the number of edges per dependency type
+        and the outgoing dependency edges of up to ``sample_size`` random
+        CIs. A projection that differs while no write happened during the
+        check is marked stale, so traversals fall back to Cypher until it is
+        rebuilt.
+        """
+        snapshot = self.snapshot
+        if snapshot is None:
+            return {"consistent": False, "built": False}
+
+        connection = await self._get_connection()
+        version = self.version
+        sample = random.sample(
+            list(snapshot.index), min(sample_size, snapshot.ci_count)
+        )
+        parameters = {
+            "ids": sample,
+            "relationship_types": queries.DEPENDENCY_RELATIONSHIP_TYPES,
+        }
+
+        try:
+            counts = await connection.execute_query(
+                queries.PROJECTION_COUNTS, parameters
+            )
+            neighbours = await connection.execute_query(
+                queries.PROJECTION_NEIGHBOURS, parameters
+            )
+        except Exception as e:
+            logger.error(f"Failed to check graph projection consistency: {e}")
+            raise
+
+        database_edges = {rel_type: 0 for rel_type in _TYPE_CODES}
+        database_cis = 0
+        for record in counts:
+            database_cis = record["ci_count"]
+            database_edges.update(dict(record["edge_counts"]))
+        projection_edges = snapshot.edge_counts()
+
+        mismatched = [
+            record["ci_id"]
+            for record in neighbours
+            if sorted(map(tuple, record["edges"]))
+            != snapshot.out_edges(record["ci_id"])
+        ]
+        missing = set(sample) - {record["ci_id"] for record in neighbours}
+        mismatched.extend(sorted(missing))
+
+        consistent = (
+            database_cis == snapshot.ci_count
+            and database_edges == projection_edges
+            and not mismatched
+        )
+        changed = self.snapshot is not snapshot or self.version != version
+        if not consistent and not changed:
+            self.version = None
+            logger.warning(
+                "Graph projection differs from Neo4j, falling back to Cypher "
+                "until it is rebuilt"
+            )
+
+        return {
+            "consistent": consistent,
+            "built": True,
+            "graph_version": version,
+            "changed_during_check": changed,
+            "cis": {"projection": snapshot.ci_count, "database": database_cis},
+            "edges": {
+                rel_type: {
+                    "projection": projection_edges[rel_type],
+                    "database": database_edges[rel_type],
+                }
+                for rel_type in _TYPE_CODES
+            },
+            "sampled_cis": len(sample),
+            "mismatched_cis": mismatched,
+        }
+
+
+def _records(
+    snapshot: GraphSnapshot,
+    sources: List[str],
+    levels: List[_Level],
+    origins: Optional[Dict[int, List[int]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Format breadth-first levels as traversal records.
+
+    Records are ordered like the Cypher traversal's: by distance, then
+    criticality descending. With ``origins``, each record also lists the
+    sorted ids of the sources reaching it.
+    """
+    type_names = queries.DEPENDENCY_RELATIONSHIP_TYPES
+    ids = snapshot.ids
+    criticalities = snapshot.criticalities
+    chains: Dict[int, List[str]] = {
+        snapshot.index[ci_id]: [] for ci_id in sources if ci_id in snapshot.index
+    }
+    # Source ids per origins group, shared by the CIs the group reaches
+    named: Dict[int, List[str]] = {}
+    records = []
+    for distance, (nodes, parents, codes) in enumerate(levels, start=1):
+        reached = sorted(
+            zip(nodes, parents, codes),
+            key=lambda edge: criticalities[edge[0]] or "",
+            reverse=True,
+        )
+        for node, parent, code in reached:
+            chain = chains[parent] + [type_names[code]]
+            chains[node] = chain
+            record = {
+                "ci_id": ids[node],
+                "ci_name": snapshot.names[node],
+                "criticality": criticalities[node],
+                "distance": distance,
+                "relationship_chain": chain,
+            }
+            if origins is not None:
+                group = origins[node]
+                if id(group) not in named:
+                    named[id(group)] = sorted(ids[source] for source in group)
+                record["sources"] = named[id(group)]
+            records.append(record)
+    return records
+
+
+def _log_rebuild_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Graph projection rebuild failed: {task.exception()}")
+
+
+def _log_compaction_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Graph projection compaction failed: {task.exception()}")
+
+
+# Global projection instance
+graph_projection = GraphProjection()
@@ -0,0 +1,70 @@
+"""
+Version counter of the graph, for caches derived from it.
+
+Every write made through the services bumps the version, so a cached result
+computed at version ``n`` is valid for as long as the version is still ``n``.
+Writes may also report the CIs they touched; caches that know which CIs a
+result depends on can then keep it across unrelated writes. Like the
+metrics, the counter is kept in memory per worker: writes made by another
+worker or directly against Neo4j are not seen.
+"""
+import threading
+from collections import deque
+from typing import Deque, FrozenSet, Iterable, Optional, Set, Tuple
+
+# Writes whose touched CIs are remembered for changes_since
+CHANGE_HISTORY = 1024
+
+
+class GraphVersion:
+    """Monotonic counter bumped after every write to the graph."""
+
+    def __init__(self, history: int = CHANGE_HISTORY):
+        self._lock = threading.Lock()
+        self._value = 0
+        # (version, CIs touched by the write, None if not reported)
+        self._changes: Deque[Tuple[int, Optional[FrozenSet[str]]]] = deque(
+            maxlen=history
+        )
+
+    @property
+    def value(self) -> int:
+        """Current version."""
+        return self._value
+
+    def bump(self, ci_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Record a write and return the new version.
+
+        ``ci_ids`` are the CIs the write created, changed or deleted, or whose
+        relationships it created or deleted; leave it out when unknown.
+        """
+        touched = frozenset(ci_ids) if ci_ids is not None else None
+        with self._lock:
+            self._value += 1
+            self._changes.append((self._value, touched))
+            return self._value
+
+    def changes_since(self, version: int) -> Optional[Set[str]]:
+        """
+        Return the CIs touched by the writes made after ``version``.
+
+        Returns ``None`` when that is unknown: a write did not report its CIs,
+        or happened too long ago to be remembered.
+        """
+        with self._lock:
+            changed: Set[str] = set()
+            if version == self._value:
+                return changed
+            if not self._changes or self._changes[0][0] > version + 1:
+                return None
+            for change_version, touched in reversed(self._changes):
+                if change_version <= version:
+                    break
+                if touched is None:
+                    return None
+                changed |= touched
+            return changed
+
+
+graph_version = GraphVersion()
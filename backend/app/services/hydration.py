@@ -0,0 +1,115 @@
+"""
+Building Pydantic models from Neo4j property maps on the read path.
+
+Rows read back from Neo4j were validated when they were written, so by
+default models are built without revalidation. Everything a model needs is
+compiled once per model from its fields: a converter table for the few
+properties whose Neo4j representation differs from the model, and the
+defaults of the fields a row may lack. Building an instance then only copies
+dictionaries, unlike ``model_construct``, which resolves every field's default
+again for each instance and is no faster than validation. Strict hydration
+(``STRICT_HYDRATION``) validates every row instead, which helps when
+debugging data written outside the services.
+"""
+import copy
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Generic, Mapping, Optional, Type, TypeVar
+from typing import get_args
+
+from pydantic import BaseModel
+from pydantic.fields import FieldInfo
+from pydantic_core import PydanticUndefined
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _native_datetime(value: Any) -> Any:
+    """Convert a Neo4j DateTime to a Python datetime."""
+    to_native = getattr(value, "to_native", None)
+    return to_native() if to_native else value
+
+
+def _json_object(value: Any) -> Any:
+    """Parse a dict stored as a JSON string, ``{}`` when it cannot be parsed."""
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value) if value else {}
+    except json.JSONDecodeError:
+        return {}
+
+
+def _converter(field: FieldInfo) -> Optional[Callable[[Any], Any]]:
+    """Return the converter for a field stored differently in Neo4j, if any."""
+    types = (field.annotation, *get_args(field.annotation))
+    if datetime in types:
+        return _native_datetime
+    if dict in types or any(getattr(t, "__origin__", None) is dict for t in types):
+        return _json_object
+    return None
+
+
+class ModelHydrator(Generic[ModelT]):
+    """Build instances of a model from Neo4j property maps."""
+
+    def __init__(self, model: Type[ModelT]):
+        self.model = model
+        self.fields = frozenset(model.model_fields)
+        self.converters: Dict[str, Callable[[Any], Any]] = {}
+        self.defaults: Dict[str, Any] = {}
+        self.default_factories: Dict[str, Callable[[], Any]] = {}
+        for name, field in model.model_fields.items():
+            converter = _converter(field)
+            if converter:
+                self.converters[name] = converter
+            if field.default_factory is not None:
+                self.default_factories[name] = field.default_factory
+            elif field.default is not PydanticUndefined:
+                default = field.default
+                if isinstance(default, (list, dict, set)):
+                    # Mutable defaults must not be shared between instances
+                    self.default_factories[name] = lambda d=default: copy.deepcopy(d)
+                else:
+                    self.defaults[name] = default
+        # Models with private attributes or post-init hooks need model_construct
+        self.trusted = (
+            not model.__pydantic_post_init__ and not model.__private_attributes__
+        )
+
+    def convert(self, properties: Mapping[str, Any]) -> Dict[str, Any]:
+        """Return the model field values held in ``properties``."""
+        values = {key: value for key, value in properties.items() if key in self.fields}
+        for name, converter in self.converters.items():
+            value = values.get(name)
+            if value is not None:
+                values[name] = converter(value)
+        return values
+
+    def __call__(
+        self, properties: Mapping[str, Any], strict: bool = False, **extra: Any
+    ) -> ModelT:
+        """Build a model, validating it only when ``strict`` is set."""
+        values = self.convert(properties)
+        values.update(extra)
+        if strict:
+            return self.model(**values)
+        if not self.trusted:
+            return self.model.model_construct(**values)
+        return self.construct(values)
+
+    def construct(self, values: Dict[str, Any]) -> ModelT:
+        """Build a model from trusted field values, filling in defaults."""
+        fields_set = set(values)
+        data = dict(self.defaults)
+        for name, factory in self.default_factories.items():
+            if name not in fields_set:
+                data[name] = factory()
+        data.update(values)
+
+        instance = self.model.__new__(self.model)
+        object.__setattr__(instance, "__dict__", data)
+        object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(instance, "__pydantic_private__", None)
+        return instance
@@ -0,0 +1,180 @@
+"""
+Caches of results derived from the graph.
+
+``ResultCache`` is a least-recently-used map of results, each remembering the
+``graph_version`` it was computed at; an entry is only served while the
+graph version is unchanged, so any write drops every result. Its size and TTL
+come from the ``<name>_size`` and ``<name>_ttl`` settings.
+
+``ImpactCache`` keeps impact and dependency traversal results, keyed by the
+traversal: source CI, depth, direction, traversal mode and the relationship
+types followed. Each entry also remembers the CIs it touched, the source and
+every CI it reached. With ``version`` invalidation it behaves as above. With
+``targeted`` invalidation an entry survives writes that touched none of its
+CIs: a new or deleted relationship changes a traversal only if one of its
+endpoints was reached, and a changed or deleted CI only if it was reached.
+Writes that did not report their CIs, or that are too old for
+``graph_version`` to remember, invalidate everything.
+
+Like ``graph_version``, the caches are per worker: writes made by another
+worker, by the seeding scripts or directly against Neo4j do not bump the
+version. Every entry therefore also expires after its cache's TTL, which
+bounds how stale such writes can leave it.
+"""
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional
+
+from .graph_version import graph_version
+from ..config import get_settings
+
+INVALIDATION_VERSION = "version"
+INVALIDATION_TARGETED = "targeted"
+INVALIDATION_MODES = (INVALIDATION_VERSION, INVALIDATION_TARGETED)
+
+
+class _Entry:
+    """A cached result, the version it is known valid at and the CIs it touched."""
+
+    __slots__ = ("value", "version", "touched", "expires_at")
+
+    def __init__(
+        self, value: Any, version: int, touched: FrozenSet[str], expires_at: float
+    ):
+        self.value = value
+        self.version = version
+        self.touched = touched
+        self.expires_at = expires_at
+
+
+class ResultCache:
+    """LRU cache of results per graph version with hit, miss and eviction counters."""
+
+    def __init__(self, name: str):
+        # Prefix of the cache's settings
+        self.name = name
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Entries dropped to make room, entries dropped after a write and
+        # entries dropped after the TTL
+        self.evictions = 0
+        self.invalidations = 0
+        self.expirations = 0
+
+    @property
+    def size(self) -> int:
+        return getattr(get_settings(), f"{self.name}_size")
+
+    @property
+    def ttl(self) -> float:
+        return getattr(get_settings(), f"{self.name}_ttl")
+
+    def _is_valid(self, entry: _Entry, version: int) -> bool:
+        return entry.version == version
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached result for ``key``, or ``None`` on a miss."""
+        version = graph_version.value
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is not None and not self._is_valid(entry, version):
+                del self._entries[key]
+                self.invalidations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(
+        self,
+        key: Hashable,
+        version: int,
+        value: Any,
+        touched: FrozenSet[str] = frozenset(),
+    ) -> None:
+        """Cache a result computed at ``version``."""
+        size = self.size
+        if size <= 0:
+            return
+        expires_at = monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = _Entry(value, version, touched, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the cache's size, settings and counters."""
+        size = self.size
+        ttl = self.ttl
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": size > 0,
+                "entries": len(self._entries),
+                "max_entries": size,
+                "ttl_seconds": ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "expirations": self.expirations,
+                "graph_version": graph_version.value,
+            }
+
+
+class ImpactCache(ResultCache):
+    """Cache of traversal records, optionally invalidated per touched CI."""
+
+    def __init__(self):
+        super().__init__("impact_cache")
+
+    def _is_valid(self, entry: _Entry, version: int) -> bool:
+        if entry.version == version:
+            return True
+        if get_settings().impact_cache_invalidation != INVALIDATION_TARGETED:
+            return False
+        changed = graph_version.changes_since(entry.version)
+        if changed is None or not entry.touched.isdisjoint(changed):
+            return False
+        entry.version = version
+        return True
+
+    def put(
+        self,
+        key: Hashable,
+        version: int,
+        source: str,
+        records: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Cache the records of a traversal computed at ``version``.
+
+        Results larger than ``impact_cache_max_records`` are not cached.
+        """
+        if len(records) > get_settings().impact_cache_max_records:
+            return
+        touched = frozenset([source, *(record["ci_id"] for record in records)])
+        super().put(key, version, records, touched)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the cache's size, settings and counters."""
+        return dict(
+            super().stats(), invalidation=get_settings().impact_cache_invalidation
+        )
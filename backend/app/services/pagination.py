@@ -0,0 +1,33 @@
+"""
+Opaque pagination cursors.
+
+A cursor encodes the sort key of the last item of a page, so the next page
+continues from that position instead of skipping rows with ``SKIP``. Clients
+treat cursors as opaque strings.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded."""
+
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    """Encode a page position as an opaque, URL-safe cursor."""
+    payload = json.dumps(position, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(position, dict):
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+    return position
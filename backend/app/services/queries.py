@@ -0,0 +1,784 @@
+"""
+Canonical Cypher statements used by the services.
+
+Every statement the services send to Neo4j is registered here with a fixed,
+fully parameterized text. Values always travel as parameters, so the set of
+distinct query texts stays small and bounded, and Neo4j can reuse cached
+execution plans instead of replanning each variant under load.
+
+Cypher cannot take variable-length bounds or dynamic WHERE clauses as
+parameters, so those variants are enumerated up front: one statement per
+traversal depth (up to ``MAX_TRAVERSAL_DEPTH``) and one per combination of
+CI list filters.
+"""
+from itertools import combinations
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from ..models.relationships import RelationshipType
+
+# Deepest traversal supported by impact and dependency analysis
+MAX_TRAVERSAL_DEPTH = 5
+
+# Relationship types followed by impact and dependency analysis
+DEPENDENCY_RELATIONSHIP_TYPES = ["DEPENDS_ON", "RUNS_ON", "HOSTS", "USES"]
+
+# Native relationship types, one per RelationshipType. Edges are written with
+# their native type and keep it in a ``type`` property as well
+RELATIONSHIP_TYPES = [relationship_type.value for relationship_type in RelationshipType]
+
+# Edges used to be written as (:CI)-[:RELATED {type: ...}]->(:CI). With "dual"
+# storage, traversals read legacy and native edges while existing edges are
+# migrated; with "native" storage they expand native types only, so Neo4j
+# never loads edges of other types nor reads their type property
+RELATIONSHIP_STORAGE_DUAL = "dual"
+RELATIONSHIP_STORAGE_NATIVE = "native"
+RELATIONSHIP_STORAGE_MODES = (RELATIONSHIP_STORAGE_DUAL, RELATIONSHIP_STORAGE_NATIVE)
+LEGACY_RELATIONSHIP_TYPE = "RELATED"
+
+# Filters supported by CI listings, in the order they appear in WHERE clauses
+CI_LIST_FILTERS = ("ci_type", "environment", "criticality")
+
+# CI properties that can be counted by GET /cis/facets
+CI_FACETS = (
+    "ci_type",
+    "environment",
+    "criticality",
+    "lifecycle_state",
+    "location",
+    "vendor",
+)
+
+# Registry of every canonical statement, keyed by a descriptive name
+QUERIES: Dict[str, str] = {}
+
+# Names of registered statements that write to the graph
+WRITE_QUERIES: Set[str] = set()
+
+
+def _register(name: str, text: str, write: bool = False) -> str:
+    """Register a canonical statement and return its text."""
+    if name in QUERIES:
+        raise ValueError(f"Query already registered: {name}")
+    QUERIES[name] = text
+    if write:
+        WRITE_QUERIES.add(name)
+    return text
+
+
+def all_queries() -> List[str]:
+    """Return the text of every registered statement."""
+    return list(QUERIES.values())
+
+
+# ---------------------------------------------------------------------------
+# Configuration Items
+# ---------------------------------------------------------------------------
+
+CREATE_CI = _register(
+    "ci.create",
+    """
+    CREATE (ci:CI)
+    SET ci = $properties
+    RETURN ci
+    """,
+    write=True,
+)
+
+# One row of properties per CI, written in a single transaction per chunk
+BULK_CREATE_CIS = _register(
+    "ci.bulk_create",
+    """
+    UNWIND $rows AS properties
+    CREATE (ci:CI)
+    SET ci = properties
+    RETURN count(ci) as created_count
+    """,
+    write=True,
+)
+
+# Creates a CI and its outgoing edges atomically. Targets are looked up in the
+# same statement; missing ones are reported per relationship. Relationship
+# types cannot be parameters in CREATE, so edges are created with APOC
+CREATE_CI_WITH_RELATIONSHIPS = _register(
+    "ci.create_with_relationships",
+    """
+    CREATE (ci:CI)
+    SET ci = $properties
+    WITH ci
+    CALL {
+        WITH ci
+        UNWIND $relationships AS rel
+        OPTIONAL MATCH (target:CI {id: rel.target_ci_id})
+        CALL {
+            WITH ci, rel, target
+            WITH ci, rel, target WHERE target IS NOT NULL
+            CALL apoc.create.relationship(ci, rel.type, rel.properties, target)
+            YIELD rel AS r
+            SET r.id = rel.id, r.type = rel.type, r.created_at = datetime()
+            RETURN count(r) as created_count
+        }
+        RETURN collect({index: rel.index, created: target IS NOT NULL}) as outcomes
+    }
+    RETURN ci, outcomes
+    """,
+    write=True,
+)
+
+GET_CI = _register(
+    "ci.get",
+    """
+    MATCH (ci:CI {id: $ci_id})
+    RETURN ci
+    """,
+)
+
+# Many CIs by id in one round trip, each id resolved by the unique constraint index
+GET_CIS = _register(
+    "ci.get_many",
+    """
+    UNWIND $ids AS ci_id
+    MATCH (ci:CI {id: ci_id})
+    RETURN ci
+    """,
+)
+
+UPDATE_CI = _register(
+    "ci.update",
+    """
+    MATCH (ci:CI {id: $ci_id})
+    SET ci += $properties
+    RETURN ci
+    """,
+    write=True,
+)
+
+DELETE_CI = _register(
+    "ci.delete",
+    """
+    MATCH (ci:CI {id: $ci_id})
+    DETACH DELETE ci
+    RETURN count(ci) as deleted_count
+    """,
+    write=True,
+)
+
+# Full-text index over the searchable CI fields, created by the schema bootstrap
+CI_SEARCH_INDEX = "ci_search"
+CI_SEARCH_FIELDS = (
+    "name",
+    "description",
+    "hostname",
+    "fqdn",
+    "ip_address",
+    "vendor",
+    "serial_number",
+)
+
+
+def _ci_projection(variable: str, projected: bool, alias: bool = True) -> str:
+    """Return a whole CI node, or only the properties listed in ``$fields``."""
+    if not projected:
+        return variable
+    projection = f"[field IN $fields | {variable}[field]]"
+    return f"{projection} as ci" if alias else projection
+
+
+# Results are paged by (score, id): the cursor holds the last row of a page.
+# Full-text scores move as the index changes, so paging is best-effort
+SEARCH_CIS = _register(
+    "ci.search",
+    f"""
+    CALL db.index.fulltext.queryNodes('{CI_SEARCH_INDEX}', $search_query)
+    YIELD node, score
+    WHERE $cursor_score IS NULL
+       OR score < $cursor_score
+       OR (score = $cursor_score AND node.id > $cursor_id)
+    RETURN node as ci, score
+    ORDER BY score DESC, node.id
+    LIMIT $limit
+    """,
+)
+
+SEARCH_CIS_PROJECTED = _register(
+    "ci.search_projected",
+    f"""
+    CALL db.index.fulltext.queryNodes('{CI_SEARCH_INDEX}', $search_query)
+    YIELD node, score
+    WHERE $cursor_score IS NULL
+       OR score < $cursor_score
+       OR (score = $cursor_score AND node.id > $cursor_id)
+    WITH node, score
+    ORDER BY score DESC, node.id
+    LIMIT $limit
+    RETURN {_ci_projection("node", True)}, score
+    """,
+)
+
+COUNT_CIS = _register(
+    "ci.count",
+    """
+    MATCH (ci:CI)
+    RETURN count(ci) as total_count
+    """,
+)
+
+
+def _filter_key(filters: Iterable[str]) -> FrozenSet[str]:
+    """Normalize a set of active CI list filters."""
+    key = frozenset(filters)
+    unknown = key.difference(CI_LIST_FILTERS)
+    if unknown:
+        raise ValueError(f"Unknown CI list filters: {sorted(unknown)}")
+    return key
+
+
+def _filter_combinations() -> List[FrozenSet[str]]:
+    """Return every combination of CI list filters."""
+    return [
+        frozenset(combo)
+        for size in range(len(CI_LIST_FILTERS) + 1)
+        for combo in combinations(CI_LIST_FILTERS, size)
+    ]
+
+
+def _where_clause(filters: FrozenSet[str]) -> str:
+    """Build the WHERE clause for a combination of CI list filters."""
+    clauses = [f"ci.{name} = ${name}" for name in CI_LIST_FILTERS if name in filters]
+    return " AND ".join(clauses) if clauses else "true"
+
+
+def _filter_name(filters: FrozenSet[str]) -> str:
+    return ",".join(name for name in CI_LIST_FILTERS if name in filters)
+
+
+_LIST_CIS: Dict[Tuple[FrozenSet[str], bool, bool, bool], str] = {}
+_STREAM_CIS: Dict[FrozenSet[str], str] = {}
+_FACET_CIS: Dict[FrozenSet[str], str] = {}
+
+
+def _page_where(filters: FrozenSet[str], after_cursor: bool) -> str:
+    """WHERE clause of a CI page, with the keyset condition after a cursor."""
+    where = _where_clause(filters)
+    if after_cursor:
+        # Keyset paging on (name, id): the range on ci.name is an index seek
+        where += """
+      AND ci.name >= $cursor_name
+      AND (ci.name > $cursor_name OR ci.id > $cursor_id)"""
+    return where
+
+
+for _filters in _filter_combinations():
+    for _after in (False, True):
+        # The first page, or deprecated offset paging, skips; cursor pages seek
+        _skip = "" if _after else "SKIP $offset "
+        _suffix = _filter_name(_filters) + (",after" if _after else "")
+
+        for _projected in (False, True):
+            # Projected variants return the values of $fields, in that order
+            _kind = "list_projected" if _projected else "list"
+
+            _LIST_CIS[(_filters, _after, False, _projected)] = _register(
+                f"ci.{_kind}[{_suffix}]",
+                f"""
+    MATCH (ci:CI)
+    WHERE {_page_where(_filters, _after)}
+    WITH ci
+    ORDER BY ci.name, ci.id
+    {_skip}LIMIT $limit
+    RETURN {_ci_projection("ci", _projected)}
+    """,
+            )
+            # Page and filter-aware total in a single round trip
+            _LIST_CIS[(_filters, _after, True, _projected)] = _register(
+                f"ci.{_kind}_counted[{_suffix}]",
+                f"""
+    CALL {{
+        MATCH (ci:CI)
+        WHERE {_where_clause(_filters)}
+        RETURN count(ci) as total_count
+    }}
+    CALL {{
+        MATCH (ci:CI)
+        WHERE {_page_where(_filters, _after)}
+        WITH ci
+        ORDER BY ci.name, ci.id
+        {_skip}LIMIT $limit
+        RETURN collect({_ci_projection("ci", _projected, alias=False)}) as cis
+    }}
+    RETURN cis, total_count
+    """,
+            )
+
+    _STREAM_CIS[_filters] = _register(
+        f"ci.stream[{_filter_name(_filters)}]",
+        f"""
+    MATCH (ci:CI)
+    WHERE {_where_clause(_filters)}
+    RETURN ci
+    """,
+    )
+
+    # Every requested facet counted in one pass over the matching CIs
+    _FACET_CIS[_filters] = _register(
+        f"ci.facets[{_filter_name(_filters)}]",
+        f"""
+    MATCH (ci:CI)
+    WHERE {_where_clause(_filters)}
+    UNWIND $facets AS facet
+    WITH facet, ci[facet] AS value
+    RETURN facet, value, count(*) as count
+    """,
+    )
+
+
+def list_cis_query(
+    filters: Iterable[str],
+    after_cursor: bool = False,
+    with_count: bool = False,
+    projected: bool = False,
+) -> str:
+    """
+    Return the CI listing statement for the active filters.
+
+    With ``with_count`` the statement returns a single row holding the page
+    as ``cis`` and the number of CIs matching the filters as ``total_count``.
+    With ``projected`` each CI is a list of the values of the properties
+    named in ``$fields`` instead of the whole node.
+    """
+    return _LIST_CIS[(_filter_key(filters), after_cursor, with_count, projected)]
+
+
+def stream_cis_query(filters: Iterable[str]) -> str:
+    """Return the CI streaming statement for the active filters."""
+    return _STREAM_CIS[_filter_key(filters)]
+
+
+def facet_cis_query(filters: Iterable[str]) -> str:
+    """
+    Return the CI facet counting statement for the active filters.
+
+    The statement takes the property names to count in ``$facets`` and
+    returns one ``(facet, value, count)`` row per distinct value.
+    """
+    return _FACET_CIS[_filter_key(filters)]
+
+
+# ---------------------------------------------------------------------------
+# Relationships
+# ---------------------------------------------------------------------------
+
+CREATE_RELATIONSHIP = _register(
+    "relationship.create",
+    """
+    MATCH (from_ci:CI {id: $from_ci_id})
+    MATCH (to_ci:CI {id: $to_ci_id})
+    CALL apoc.create.relationship(
+        from_ci, $rel_type, {id: $rel_id, type: $rel_type}, to_ci
+    ) YIELD rel AS r
+    SET r.created_at = datetime()
+    RETURN r, from_ci.name as from_name, to_ci.name as to_name
+    """,
+    write=True,
+)
+
+# Endpoints are matched optionally, so edges with a missing CI are reported
+# per row instead of failing the whole batch
+BULK_CREATE_RELATIONSHIPS = _register(
+    "relationship.bulk_create",
+    """
+    UNWIND $rows AS row
+    OPTIONAL MATCH (from_ci:CI {id: row.from_ci_id})
+    OPTIONAL MATCH (to_ci:CI {id: row.to_ci_id})
+    CALL {
+        WITH row, from_ci, to_ci
+        WITH row, from_ci, to_ci WHERE from_ci IS NOT NULL AND to_ci IS NOT NULL
+        CALL apoc.create.relationship(from_ci, row.type, row.properties, to_ci)
+        YIELD rel AS r
+        SET r.id = row.id, r.type = row.type, r.created_at = datetime()
+        RETURN count(r) as created_count
+    }
+    RETURN row.index as index,
+           from_ci IS NOT NULL as from_found, to_ci IS NOT NULL as to_found
+    """,
+    write=True,
+)
+
+CI_RELATIONSHIPS = {
+    "outgoing": _register(
+        "relationship.for_ci[outgoing]",
+        """
+    MATCH (ci:CI {id: $ci_id})-[r]->(related:CI)
+    RETURN r.id as rel_id, r.type as rel_type, r.created_at as rel_created_at,
+           related.id as related_id, related.name as related_name,
+           'outgoing' as direction
+    """,
+    ),
+    "incoming": _register(
+        "relationship.for_ci[incoming]",
+        """
+    MATCH (ci:CI {id: $ci_id})<-[r]-(related:CI)
+    RETURN r.id as rel_id, r.type as rel_type, r.created_at as rel_created_at,
+           related.id as related_id, related.name as related_name,
+           'incoming' as direction
+    """,
+    ),
+    "both": _register(
+        "relationship.for_ci[both]",
+        """
+    MATCH (ci:CI {id: $ci_id})-[r]-(related:CI)
+    RETURN r.id as rel_id, r.type as rel_type, r.created_at as rel_created_at,
+           related.id as related_id, related.name as related_name,
+           CASE WHEN startNode(r).id = $ci_id THEN 'outgoing' ELSE 'incoming' END
+               as direction
+    """,
+    ),
+}
+
+# Relationship indexes are per type, so the id is looked up in each type's
+# index instead of scanning every relationship
+DELETE_RELATIONSHIP = _register(
+    "relationship.delete",
+    """
+    CALL {
+"""
+    + "\n        UNION\n".join(
+        f"        MATCH ()-[r:{rel_type} {{id: $relationship_id}}]->() RETURN r"
+        for rel_type in [LEGACY_RELATIONSHIP_TYPE] + RELATIONSHIP_TYPES
+    )
+    + """
+    }
+    WITH r, startNode(r).id as from_ci_id, endNode(r).id as to_ci_id,
+         r.type as rel_type
+    DELETE r
+    RETURN count(*) as deleted_count,
+           collect({from_ci_id: from_ci_id, to_ci_id: to_ci_id, type: rel_type})
+               as deleted
+    """,
+    write=True,
+)
+
+# Relationships are listed most recent first. Each type is read in
+# (created_at, id) order from its own index, at most one page of rows per
+# type, and the pages are then merged. Every edge is written with created_at
+_LIST_BRANCH = """
+        MATCH (from_ci:CI)-[r:{rel_type}]->(to_ci:CI)
+        WHERE {predicate}
+        RETURN r, from_ci, to_ci
+        ORDER BY r.created_at DESC, r.id DESC
+        LIMIT {limit}
+"""
+_LIST_RETURN = """
+    RETURN r.id as rel_id, r.type as rel_type, r.created_at as rel_created_at,
+           from_ci.id as from_ci_id, from_ci.name as from_ci_name,
+           to_ci.id as to_ci_id, to_ci.name as to_ci_name
+    ORDER BY r.created_at DESC, r.id DESC
+"""
+
+
+def _list_relationships(predicate: str, limit: str) -> str:
+    """Return the typed, per-type ordered expansion of a relationship listing."""
+    return (
+        "\n    CALL {"
+        + "        UNION ALL".join(
+            _LIST_BRANCH.format(rel_type=rel_type, predicate=predicate, limit=limit)
+            for rel_type in [LEGACY_RELATIONSHIP_TYPE] + RELATIONSHIP_TYPES
+        )
+        + "    }"
+        + _LIST_RETURN
+    )
+
+
+LIST_RELATIONSHIPS = _register(
+    "relationship.list",
+    _list_relationships("r.created_at IS NOT NULL", "$offset + $limit")
+    + "    SKIP $offset LIMIT $limit\n",
+)
+
+# Keyset paging on (created_at, id), most recent first
+LIST_RELATIONSHIPS_AFTER = _register(
+    "relationship.list_after",
+    _list_relationships(
+        "r.created_at <= datetime($cursor_created_at)\n"
+        "          AND (r.created_at < datetime($cursor_created_at)"
+        " OR r.id < $cursor_id)",
+        "$limit",
+    )
+    + "    LIMIT $limit\n",
+)
+
+STREAM_RELATIONSHIPS = _register(
+    "relationship.stream",
+    """
+    MATCH (from_ci:CI)-[r]->(to_ci:CI)
+    RETURN r.id as rel_id, r.type as rel_type, r.created_at as rel_created_at,
+           from_ci.id as from_ci_id, from_ci.name as from_ci_name,
+           to_ci.id as to_ci_id, to_ci.name as to_ci_name
+    """,
+)
+
+# ---------------------------------------------------------------------------
+# Impact and dependency analysis
+# ---------------------------------------------------------------------------
+
+# Per storage mode: the relationship types expanded, the filter keeping
+# dependency edges only and the expression giving an edge's type. Native
+# edges are filtered by the expansion itself
+_DEPENDENCY_EXPANSION = {
+    RELATIONSHIP_STORAGE_DUAL: "|".join(
+        [LEGACY_RELATIONSHIP_TYPE] + DEPENDENCY_RELATIONSHIP_TYPES
+    ),
+    RELATIONSHIP_STORAGE_NATIVE: "|".join(DEPENDENCY_RELATIONSHIP_TYPES),
+}
+_PATH_FILTER = {
+    RELATIONSHIP_STORAGE_DUAL: (
+        "WHERE ALL(r IN relationships(path) WHERE r.type IN $relationship_types)"
+    ),
+    RELATIONSHIP_STORAGE_NATIVE: "",
+}
+_EDGE_TYPE = {
+    RELATIONSHIP_STORAGE_DUAL: "r.type",
+    RELATIONSHIP_STORAGE_NATIVE: "type(r)",
+}
+_STORAGE_SUFFIX = {
+    RELATIONSHIP_STORAGE_DUAL: "",
+    RELATIONSHIP_STORAGE_NATIVE: ",native",
+}
+
+_IMPACT: Dict[str, Dict[bool, Dict[int, str]]] = {
+    storage: {True: {}, False: {}} for storage in RELATIONSHIP_STORAGE_MODES
+}
+_DEPENDENCIES: Dict[str, Dict[bool, Dict[int, str]]] = {
+    storage: {True: {}, False: {}} for storage in RELATIONSHIP_STORAGE_MODES
+}
+
+for _storage in RELATIONSHIP_STORAGE_MODES:
+    _expansion = _DEPENDENCY_EXPANSION[_storage]
+    for _depth in range(1, MAX_TRAVERSAL_DEPTH + 1):
+        for _ordered in (True, False):
+            _order_clause = "ORDER BY distance, criticality DESC" if _ordered else ""
+            _suffix = (
+                f"depth={_depth}"
+                + ("" if _ordered else ",unordered")
+                + _STORAGE_SUFFIX[_storage]
+            )
+
+            # If CI A depends on CI B, then A is impacted when B fails
+            _IMPACT[_storage][_ordered][_depth] = _register(
+                f"relationship.impact[{_suffix}]",
+                f"""
+    MATCH path = (impacted:CI)-[:{_expansion}*1..{_depth}]->(ci:CI {{id: $ci_id}})
+    {_PATH_FILTER[_storage]}
+    RETURN impacted.id as ci_id, impacted.name as ci_name,
+           impacted.criticality as criticality,
+           length(path) as distance,
+           [r in relationships(path) | {_EDGE_TYPE[_storage]}] as relationship_chain
+    {_order_clause}
+    """,
+            )
+            _DEPENDENCIES[_storage][_ordered][_depth] = _register(
+                f"relationship.dependencies[{_suffix}]",
+                f"""
+    MATCH path = (ci:CI {{id: $ci_id}})-[:{_expansion}*1..{_depth}]->(dependency:CI)
+    {_PATH_FILTER[_storage]}
+    RETURN dependency.id as ci_id, dependency.name as ci_name,
+           dependency.criticality as criticality,
+           length(path) as distance,
+           [r in relationships(path) | {_EDGE_TYPE[_storage]}] as relationship_chain
+    {_order_clause}
+    """,
+            )
+
+
+def _check_depth(max_depth: int) -> int:
+    if not 1 <= max_depth <= MAX_TRAVERSAL_DEPTH:
+        raise ValueError(
+            f"Traversal depth must be between 1 and {MAX_TRAVERSAL_DEPTH}, "
+            f"got {max_depth}"
+        )
+    return max_depth
+
+
+def _check_storage(storage: str) -> str:
+    if storage not in RELATIONSHIP_STORAGE_MODES:
+        raise ValueError(
+            f"Unknown relationship storage '{storage}', "
+            f"expected one of {RELATIONSHIP_STORAGE_MODES}"
+        )
+    return storage
+
+
+def impact_query(
+    max_depth: int, ordered: bool = True, storage: str = RELATIONSHIP_STORAGE_DUAL
+) -> str:
+    """Return the reverse-dependency traversal statement for a depth."""
+    return _IMPACT[_check_storage(storage)][ordered][_check_depth(max_depth)]
+
+
+def dependencies_query(
+    max_depth: int, ordered: bool = True, storage: str = RELATIONSHIP_STORAGE_DUAL
+) -> str:
+    """Return the dependency traversal statement for a depth."""
+    return _DEPENDENCIES[_check_storage(storage)][ordered][_check_depth(max_depth)]
+
+
+# One breadth-first level of a distinct traversal: the CIs adjacent to the
+# frontier, each once, with one edge reaching it. CIs visited at earlier levels
+# are dropped by the caller, so the visited set is not sent with every level.
+# Keyed by relationship storage mode
+IMPACT_LEVEL: Dict[str, str] = {}
+DEPENDENCIES_LEVEL: Dict[str, str] = {}
+
+# One level of a multi-source impact traversal: every edge from the frontier
+# to a dependent, visited or not, since a CI already reached from one source
+# may now be reached from another
+IMPACT_BATCH_LEVEL: Dict[str, str] = {}
+
+# CIs with the most dependents, keyed by relationship storage mode
+BUSFACTOR: Dict[str, str] = {}
+
+for _storage in RELATIONSHIP_STORAGE_MODES:
+    _suffix = "[native]" if _storage == RELATIONSHIP_STORAGE_NATIVE else ""
+    _expansion = _DEPENDENCY_EXPANSION[_storage]
+    _type_filter = (
+        "WHERE r.type IN $relationship_types"
+        if _storage == RELATIONSHIP_STORAGE_DUAL
+        else ""
+    )
+    IMPACT_LEVEL[_storage] = _register(
+        f"relationship.impact_level{_suffix}",
+        f"""
+    UNWIND $frontier AS frontier_id
+    MATCH (:CI {{id: frontier_id}})<-[r:{_expansion}]-(next:CI)
+    {_type_filter}
+    WITH next,
+         head(collect({{parent_id: frontier_id, type: {_EDGE_TYPE[_storage]}}})) as via
+    RETURN next.id as ci_id, next.name as ci_name, next.criticality as criticality,
+           via.parent_id as parent_id, via.type as relationship_type
+    """,
+    )
+    DEPENDENCIES_LEVEL[_storage] = _register(
+        f"relationship.dependencies_level{_suffix}",
+        f"""
+    UNWIND $frontier AS frontier_id
+    MATCH (:CI {{id: frontier_id}})-[r:{_expansion}]->(next:CI)
+    {_type_filter}
+    WITH next,
+         head(collect({{parent_id: frontier_id, type: {_EDGE_TYPE[_storage]}}})) as via
+    RETURN next.id as ci_id, next.name as ci_name, next.criticality as criticality,
+           via.parent_id as parent_id, via.type as relationship_type
+    """,
+    )
+    IMPACT_BATCH_LEVEL[_storage] = _register(
+        f"relationship.impact_batch_level{_suffix}",
+        f"""
+    UNWIND $frontier AS frontier_id
+    MATCH (:CI {{id: frontier_id}})<-[r:{_expansion}]-(next:CI)
+    {_type_filter}
+    RETURN next.id as ci_id, next.name as ci_name, next.criticality as criticality,
+           frontier_id as parent_id, {_EDGE_TYPE[_storage]} as relationship_type
+    """,
+    )
+    BUSFACTOR[_storage] = _register(
+        f"relationship.busfactor{_suffix}",
+        f"""
+    MATCH (ci:CI)<-[r:{_expansion}]-(dependent:CI)
+    {_type_filter}
+    WITH ci, count(dependent) as dependency_count
+    RETURN ci.id as ci_id, ci.name as ci_name, ci.criticality as criticality,
+           ci.ci_type as ci_type, dependency_count
+    ORDER BY dependency_count DESC, criticality DESC
+    LIMIT 20
+    """,
+    )
+
+# Online migration of legacy edges to native types, one batch per transaction:
+# each edge is replaced by a native one with the same properties. Edges whose
+# type is not a RelationshipType are left in place and counted as remaining
+MIGRATE_RELATIONSHIP_TYPES = _register(
+    "relationship.migrate_types",
+    """
+    MATCH ()-[legacy:RELATED]->()
+    WHERE legacy.type IN $relationship_types
+    WITH legacy LIMIT $batch_size
+    CALL apoc.refactor.setType(legacy, legacy.type) YIELD output
+    RETURN count(output) as migrated_count
+    """,
+    write=True,
+)
+
+COUNT_LEGACY_RELATIONSHIPS = _register(
+    "relationship.count_legacy",
+    """
+    MATCH ()-[legacy:RELATED]->()
+    RETURN count(legacy) as legacy_count
+    """,
+)
+
+# ---------------------------------------------------------------------------
+# In-memory graph projection
+# ---------------------------------------------------------------------------
+
+PROJECTION_CIS = _register(
+    "projection.cis",
+    """
+    MATCH (ci:CI)
+    RETURN ci.id as ci_id, ci.name as ci_name, ci.criticality as criticality
+    """,
+)
+
+PROJECTION_RELATIONSHIPS = _register(
+    "projection.relationships",
+    """
+    MATCH (from_ci:CI)-[r]->(to_ci:CI)
+    WHERE r.type IN $relationship_types
+    RETURN from_ci.id as from_ci_id, to_ci.id as to_ci_id, r.type as rel_type
+    """,
+)
+
+# Consistency check: CI count and dependency edge count per type
+PROJECTION_COUNTS = _register(
+    "projection.counts",
+    """
+    OPTIONAL MATCH (:CI)-[r]->(:CI)
+    WHERE r.type IN $relationship_types
+    WITH r.type as rel_type, count(r) as edge_count
+    WITH collect(CASE WHEN rel_type IS NOT NULL THEN [rel_type, edge_count] END)
+         as edge_counts
+    MATCH (ci:CI)
+    RETURN count(ci) as ci_count, edge_counts
+    """,
+)
+
+# Consistency check: outgoing dependency edges of sampled CIs
+PROJECTION_NEIGHBOURS = _register(
+    "projection.neighbours",
+    """
+    UNWIND $ids AS ci_id
+    MATCH (ci:CI {id: ci_id})
+    OPTIONAL MATCH (ci)-[r]->(dependency:CI)
+    WHERE r.type IN $relationship_types
+    RETURN ci_id,
+           collect(CASE WHEN r IS NOT NULL THEN [dependency.id, r.type] END) as edges
+    """,
+)
+
+GRAPH_STATS = _register(
+    "graph.stats",
+    """
+    MATCH (ci:CI)
+    OPTIONAL MATCH (ci)-[r]-()
+    RETURN
+        count(DISTINCT ci) as total_cis,
+        count(r) as total_relationships,
+        count(DISTINCT r.type) as relationship_types
+    """,
+)
+
+RELATIONSHIP_TYPE_BREAKDOWN = _register(
+    "graph.relationship_types",
+    """
+    MATCH ()-[r]-()
+    RETURN r.type as relationship_type, count(r) as count
+    ORDER BY count DESC
+    """,
+)
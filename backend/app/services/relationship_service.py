@@ -2,20 +2,33 @@
 Relationship service for managing CI relationships and impact analysis.
 """
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator, Set, Tuple
 from uuid import uuid4
 
+from . import queries
+from .graph_projection import graph_projection
+from .graph_version import graph_version
+from .impact_cache import ImpactCache
+from .pagination import decode_cursor, encode_cursor
+from ..config import get_settings
 from ..database import get_neo4j_connection
 from ..models.relationships import RelationshipType, Relationship
 
 logger = logging.getLogger(__name__)
 
+# How impact and dependency analyses traverse the graph: one row per path, or
+# each reachable CI once at its minimal distance
+TRAVERSAL_PATHS = "paths"
+TRAVERSAL_DISTINCT = "distinct"
+TRAVERSAL_MODES = (TRAVERSAL_PATHS, TRAVERSAL_DISTINCT)
+
 
 class RelationshipService:
     """Service for managing relationships between Configuration Items."""
 
     def __init__(self):
         self.connection = None
+        self._impact_cache = ImpactCache()
 
     async def _get_connection(self):
         """Get Neo4j connection."""
@@ -23,6 +36,223 @@ class RelationshipService:
             self.connection = await get_neo4j_connection()
         return self.connection
 
+    def _format_relationship(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Format a relationship listing record."""
+        return {
+            "id": record.get("rel_id"),
+            "type": record.get("rel_type"),
+            "from_ci": {
+                "id": record.get("from_ci_id"),
+                "name": record.get("from_ci_name"),
+            },
+            "to_ci": {
+                "id": record.get("to_ci_id"),
+                "name": record.get("to_ci_name"),
+            },
+            "created_at": str(record.get("rel_created_at"))
+            if record.get("rel_created_at")
+            else None,
+        }
+
+    def _format_traversal_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Format an impact or dependency traversal record."""
+        return {
+            "ci_id": record["ci_id"],
+            "ci_name": record["ci_name"],
+            "criticality": record["criticality"],
+            "distance": record["distance"],
+            "relationship_chain": record["relationship_chain"],
+        }
+
+    def _storage(self) -> str:
+        """Return how relationships are read: legacy and native, or native only."""
+        return get_settings().relationship_storage
+
+    def _traversal_parameters(self, ci_id: str) -> Dict[str, Any]:
+        """Build the parameters for impact and dependency traversals."""
+        return {
+            "ci_id": ci_id,
+            "relationship_types": queries.DEPENDENCY_RELATIONSHIP_TYPES,
+        }
+
+    async def _traverse(
+        self, ci_id: str, max_depth: int, traversal: str, impact: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        Run an impact or dependency traversal and return its records.
+
+        Results are cached per source, depth, direction, traversal mode and
+        relationship types followed, until a write invalidates them.
+        """
+        if traversal not in TRAVERSAL_MODES:
+            raise ValueError(
+                f"Unknown traversal '{traversal}', expected one of {TRAVERSAL_MODES}"
+            )
+
+        key = (
+            ci_id,
+            max_depth,
+            "impact" if impact else "dependencies",
+            traversal,
+            tuple(queries.DEPENDENCY_RELATIONSHIP_TYPES),
+        )
+        cached = self._impact_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Taken before querying: a write made meanwhile invalidates the result
+        version = graph_version.value
+        if traversal == TRAVERSAL_DISTINCT:
+            records = await self._traverse_distinct(ci_id, max_depth, impact)
+        else:
+            storage = self._storage()
+            query = (
+                queries.impact_query(max_depth, storage=storage)
+                if impact
+                else queries.dependencies_query(max_depth, storage=storage)
+            )
+            connection = await self._get_connection()
+            records = await connection.execute_query(
+                query, self._traversal_parameters(ci_id)
+            )
+        self._impact_cache.put(key, version, ci_id, records)
+        return records
+
+    async def _traverse_distinct(
+        self, ci_id: str, max_depth: int, impact: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        Breadth-first traversal returning each reachable CI once.
+
+        Answered from the in-memory graph projection when it is enabled and
+        current. Otherwise each level is one query expanding the previous
+        level's new CIs only, so the work grows with the number of edges
+        reached instead of the number of paths. Every CI comes with its
+        minimal distance and one shortest relationship chain; the source CI
+        is never returned.
+        """
+        if not 1 <= max_depth <= queries.MAX_TRAVERSAL_DEPTH:
+            raise ValueError(
+                f"Traversal depth must be between 1 and "
+                f"{queries.MAX_TRAVERSAL_DEPTH}, got {max_depth}"
+            )
+
+        records = graph_projection.traverse([ci_id], max_depth, impact)
+        if records is not None:
+            return records
+
+        level_queries = queries.IMPACT_LEVEL if impact else queries.DEPENDENCIES_LEVEL
+        level_query = level_queries[self._storage()]
+        connection = await self._get_connection()
+        # chains holds every visited CI: levels return visited CIs again and
+        # they are dropped here rather than sending the visited set each level
+        chains: Dict[str, List[str]] = {ci_id: []}
+        frontier = [ci_id]
+        records = []
+
+        for distance in range(1, max_depth + 1):
+            if not frontier:
+                break
+            result = await connection.execute_query(
+                level_query,
+                {
+                    "frontier": frontier,
+                    "relationship_types": queries.DEPENDENCY_RELATIONSHIP_TYPES,
+                },
+            )
+            frontier = []
+            for record in result:
+                if record["ci_id"] in chains:
+                    continue
+                chain = chains[record["parent_id"]] + [record["relationship_type"]]
+                chains[record["ci_id"]] = chain
+                frontier.append(record["ci_id"])
+                records.append(
+                    {
+                        "ci_id": record["ci_id"],
+                        "ci_name": record["ci_name"],
+                        "criticality": record["criticality"],
+                        "distance": distance,
+                        "relationship_chain": chain,
+                    }
+                )
+
+        # Same order as the path traversal: distance, then criticality descending
+        records.sort(key=lambda record: record["criticality"] or "", reverse=True)
+        records.sort(key=lambda record: record["distance"])
+        return records
+
+    async def _traverse_batch(
+        self, ci_ids: List[str], max_depth: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Breadth-first impact traversal from several CIs at once.
+
+        Each CI impacted by any source is returned once, at its minimal
+        distance to the nearest source with one shortest relationship chain,
+        and with the sorted ids of every source reaching it within
+        ``max_depth``. The sources reaching each CI are tracked as sets: a
+        level only expands the sources that newly reached a CI at the
+        previous level, so each CI is expanded at most once per source.
+        Sources are never returned, but a search goes through the other
+        sources it reaches.
+        """
+        if not 1 <= max_depth <= queries.MAX_TRAVERSAL_DEPTH:
+            raise ValueError(
+                f"Traversal depth must be between 1 and "
+                f"{queries.MAX_TRAVERSAL_DEPTH}, got {max_depth}"
+            )
+
+        records = graph_projection.reach(ci_ids, max_depth)
+        if records is not None:
+            return records
+
+        level_query = queries.IMPACT_BATCH_LEVEL[self._storage()]
+        connection = await self._get_connection()
+        chains: Dict[str, List[str]] = {ci_id: [] for ci_id in ci_ids}
+        reached: Dict[str, Set[str]] = {ci_id: {ci_id} for ci_id in ci_ids}
+        # Sources that newly reached each frontier CI at the previous level
+        fresh: Dict[str, Set[str]] = {ci_id: {ci_id} for ci_id in ci_ids}
+        impacted: Dict[str, Dict[str, Any]] = {}
+
+        for distance in range(1, max_depth + 1):
+            if not fresh:
+                break
+            result = await connection.execute_query(
+                level_query,
+                {
+                    "frontier": list(fresh),
+                    "relationship_types": queries.DEPENDENCY_RELATIONSHIP_TYPES,
+                },
+            )
+            next_fresh: Dict[str, Set[str]] = {}
+            for record in result:
+                ci_id = record["ci_id"]
+                known = reached.setdefault(ci_id, set())
+                new = fresh[record["parent_id"]] - known
+                if not new:
+                    continue
+                known |= new
+                next_fresh.setdefault(ci_id, set()).update(new)
+                if ci_id not in chains:
+                    chain = chains[record["parent_id"]] + [record["relationship_type"]]
+                    chains[ci_id] = chain
+                    impacted[ci_id] = {
+                        "ci_id": ci_id,
+                        "ci_name": record["ci_name"],
+                        "criticality": record["criticality"],
+                        "distance": distance,
+                        "relationship_chain": chain,
+                    }
+            fresh = next_fresh
+
+        records = list(impacted.values())
+        for record in records:
+            record["sources"] = sorted(reached[record["ci_id"]])
+        records.sort(key=lambda record: record["criticality"] or "", reverse=True)
+        records.sort(key=lambda record: record["distance"])
+        return records
+
     async def create_relationship(
         self,
         from_ci_id: str,
@@ -40,16 +270,9 @@ class RelationshipService:
             {"id": rel_id, "type": relationship_type.value, "created_at": "datetime()"}
         )
 
-        query = """
-        MATCH (from_ci:CI {id: $from_ci_id})
-        MATCH (to_ci:CI {id: $to_ci_id})
-        CREATE (from_ci)-[r:RELATED {id: $rel_id, type: $rel_type, created_at: datetime()}]->(to_ci)
-        RETURN r, from_ci.name as from_name, to_ci.name as to_name
-        """
-
         try:
             result = await connection.execute_write_query(
-                query,
+                queries.CREATE_RELATIONSHIP,
                 {
                     "from_ci_id": from_ci_id,
                     "to_ci_id": to_ci_id,
@@ -59,6 +282,12 @@ class RelationshipService:
             )
 
             if result:
+                graph_projection.add_relationship(
+                    graph_version.bump([from_ci_id, to_ci_id]),
+                    from_ci_id,
+                    to_ci_id,
+                    relationship_type.value,
+                )
                 relationship = Relationship(
                     source_id=from_ci_id,
                     target_id=to_ci_id,
@@ -76,7 +305,8 @@ class RelationshipService:
                     last_verified=None,
                 )
                 logger.info(
-                    f"Created relationship: {from_ci_id} -{relationship_type.value}-> {to_ci_id}"
+                    f"Created relationship: "
+                    f"{from_ci_id} -{relationship_type.value}-> {to_ci_id}"
                 )
                 return relationship
             else:
@@ -86,31 +316,109 @@ class RelationshipService:
             logger.error(f"Failed to create relationship: {e}")
             raise
 
+    async def create_relationships(
+        self, edges: List[Dict[str, Any]], chunk_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Create many relationships in chunked ``UNWIND`` transactions.
+
+        Each edge is a dict with ``from_ci_id``, ``to_ci_id``,
+        ``relationship_type`` and optional ``properties``. Both endpoints are
+        looked up in the same statement that creates the edge; edges whose
+        endpoints do not exist are skipped and reported without aborting the
+        batch. Returns one result per edge, in input order, with its
+        ``index``, ``id``, ``status`` (``created``, ``missing_endpoints`` or
+        ``failed``), the ``missing`` endpoint fields and ``error``.
+        """
+        connection = await self._get_connection()
+        chunk_size = chunk_size or get_settings().bulk_chunk_size
+
+        results: List[Dict[str, Any]] = []
+        rows: List[Dict[str, Any]] = []
+
+        for index, edge in enumerate(edges):
+            relationship_type = edge["relationship_type"]
+            properties = {
+                key: value
+                for key, value in (edge.get("properties") or {}).items()
+                if value is not None
+            }
+            rows.append(
+                {
+                    "index": index,
+                    "id": str(uuid4()),
+                    "from_ci_id": edge["from_ci_id"],
+                    "to_ci_id": edge["to_ci_id"],
+                    "type": getattr(relationship_type, "value", relationship_type),
+                    "properties": properties,
+                }
+            )
+            results.append(
+                {
+                    "index": index,
+                    "id": rows[-1]["id"],
+                    "status": "created",
+                    "missing": [],
+                    "error": None,
+                }
+            )
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            try:
+                records = await connection.execute_write_query(
+                    queries.BULK_CREATE_RELATIONSHIPS, {"rows": chunk}
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to create relationship chunk {start // chunk_size} "
+                    f"({len(chunk)} edges): {e}"
+                )
+                for row in chunk:
+                    results[row["index"]].update(
+                        id=None, status="failed", error=str(e)
+                    )
+                continue
+
+            version = graph_version.bump(
+                ci_id for row in chunk for ci_id in (row["from_ci_id"], row["to_ci_id"])
+            )
+            for record in records:
+                missing = [
+                    field
+                    for field, found in (
+                        ("from_ci_id", record["from_found"]),
+                        ("to_ci_id", record["to_found"]),
+                    )
+                    if not found
+                ]
+                if missing:
+                    results[record["index"]].update(
+                        id=None,
+                        status="missing_endpoints",
+                        missing=missing,
+                        error="CI not found: "
+                        + ", ".join(rows[record["index"]][field] for field in missing),
+                    )
+                else:
+                    row = rows[record["index"]]
+                    graph_projection.add_relationship(
+                        version, row["from_ci_id"], row["to_ci_id"], row["type"]
+                    )
+
+        created = sum(1 for result in results if result["status"] == "created")
+        logger.info(f"Bulk created {created}/{len(edges)} relationships")
+        return results
+
     async def get_ci_relationships(
         self, ci_id: str, direction: str = "both"
     ) -> List[Dict[str, Any]]:
         """Get all relationships for a CI."""
         connection = await self._get_connection()
 
-        if direction == "outgoing":
-            query = """
-            MATCH (ci:CI {id: $ci_id})-[r:RELATED]->(related:CI)
-            RETURN r.id as rel_id, r.type as rel_type, r.created_at as rel_created_at,
-                   related.id as related_id, related.name as related_name, 'outgoing' as direction
-            """
-        elif direction == "incoming":
-            query = """
-            MATCH (ci:CI {id: $ci_id})<-[r:RELATED]-(related:CI)
-            RETURN r.id as rel_id, r.type as rel_type, r.created_at as rel_created_at,
-                   related.id as related_id, related.name as related_name, 'incoming' as direction
-            """
-        else:  # both
-            query = """
-            MATCH (ci:CI {id: $ci_id})-[r:RELATED]-(related:CI)
-            RETURN r.id as rel_id, r.type as rel_type, r.created_at as rel_created_at,
-                   related.id as related_id, related.name as related_name,
-                   CASE WHEN startNode(r).id = $ci_id THEN 'outgoing' ELSE 'incoming' END as direction
-            """
+        query = queries.CI_RELATIONSHIPS.get(
+            direction, queries.CI_RELATIONSHIPS["both"]
+        )
 
         try:
             result = await connection.execute_query(query, {"ci_id": ci_id})
@@ -143,19 +451,24 @@ class RelationshipService:
         """Delete a relationship by ID."""
         connection = await self._get_connection()
 
-        query = """
-        MATCH ()-[r:RELATED {id: $relationship_id}]-()
-        DELETE r
-        RETURN count(r) as deleted_count
-        """
-
         try:
             result = await connection.execute_write_query(
-                query, {"relationship_id": relationship_id}
+                queries.DELETE_RELATIONSHIP, {"relationship_id": relationship_id}
             )
             deleted_count = result[0]["deleted_count"] if result else 0
 
             if deleted_count > 0:
+                deleted = result[0].get("deleted", [])
+                touched = [
+                    ci_id
+                    for edge in deleted
+                    for ci_id in (edge["from_ci_id"], edge["to_ci_id"])
+                ]
+                version = graph_version.bump(touched or None)
+                for edge in deleted:
+                    graph_projection.remove_relationship(
+                        version, edge["from_ci_id"], edge["to_ci_id"], edge["type"]
+                    )
                 logger.info(f"Deleted relationship: {relationship_id}")
                 return True
 
@@ -166,63 +479,169 @@ class RelationshipService:
             logger.error(f"Failed to delete relationship {relationship_id}: {e}")
             raise
 
-    async def get_impact_analysis(
-        self, ci_id: str, max_depth: int = 3
-    ) -> Dict[str, Any]:
-        """Analyze the impact of a CI failure."""
+    async def get_all_relationships(
+        self, limit: int = 100, offset: int = 0, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get a page of relationships, most recent first.
+
+        Relationships are ordered by ``(created_at, id)`` descending. Pass the
+        returned cursor to continue after the last relationship of a page
+        instead of skipping rows with ``offset``. Returns the page and the
+        cursor of the next page, or ``None`` on the last page.
+        """
         connection = await self._get_connection()
 
-        # Get all CIs that would be impacted if this CI fails (reverse dependencies)
-        # If CI A depends on CI B, then A is impacted when B fails
-        query = f"""
-        MATCH path = (impacted:CI)-[:RELATED*1..{max_depth}]->(ci:CI {{id: $ci_id}})
-        WHERE ALL(r IN relationships(path) WHERE r.type IN ['DEPENDS_ON', 'RUNS_ON', 'HOSTS', 'USES'])
-        RETURN impacted.id as ci_id, impacted.name as ci_name, impacted.criticality as criticality,
-               length(path) as distance, 
-               [r in relationships(path) | r.type] as relationship_chain
-        ORDER BY distance, criticality DESC
+        # Fetch one extra row to know whether another page exists
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            query = queries.LIST_RELATIONSHIPS_AFTER
+            parameters = {
+                "cursor_created_at": position.get("created_at"),
+                "cursor_id": position.get("id"),
+                "limit": limit + 1,
+            }
+        else:
+            query = queries.LIST_RELATIONSHIPS
+            parameters = {"offset": offset, "limit": limit + 1}
+
+        try:
+            result = await connection.execute_query(query, parameters)
+            relationships = [self._format_relationship(r) for r in result[:limit]]
+
+            next_cursor = None
+            if len(result) > limit:
+                last = result[limit - 1]
+                created_at = last.get("rel_created_at")
+                next_cursor = encode_cursor(
+                    {
+                        "created_at": created_at.iso_format()
+                        if hasattr(created_at, "iso_format")
+                        else created_at,
+                        "id": last.get("rel_id"),
+                    }
+                )
+
+            logger.info(f"Retrieved {len(relationships)} relationships")
+            return relationships, next_cursor
+
+        except Exception as e:
+            logger.error(f"Failed to get relationships: {e}")
+            raise
+
+    async def stream_all_relationships(
+        self, batch_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
+        Stream all relationships, ``batch_size`` records at a time.
+
+        Results are not sorted, to avoid an eager sort on the server.
+        """
+        connection = await self._get_connection()
 
         try:
-            result = await connection.execute_query(query, {"ci_id": ci_id})
+            async for batch in connection.stream_query(
+                queries.STREAM_RELATIONSHIPS, None, batch_size
+            ):
+                for record in batch:
+                    yield self._format_relationship(record)
+        except Exception as e:
+            logger.error(f"Failed to stream relationships: {e}")
+            raise
 
-            impacted_cis = []
-            criticality_counts = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0}
+    async def stream_impact_analysis(
+        self, ci_id: str, max_depth: int = 3, batch_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the CIs impacted by a CI failure, one traversal path at a time.
 
-            for record in result:
-                ci_data = {
-                    "ci_id": record["ci_id"],
-                    "ci_name": record["ci_name"],
-                    "criticality": record["criticality"],
-                    "distance": record["distance"],
-                    "relationship_chain": record["relationship_chain"],
-                }
-                impacted_cis.append(ci_data)
-
-                # Count criticality levels
-                criticality = record["criticality"] or "MEDIUM"
-                if criticality in criticality_counts:
-                    criticality_counts[criticality] += 1
-
-            # Calculate risk score
-            risk_score = (
-                criticality_counts["CRITICAL"] * 10
-                + criticality_counts["HIGH"] * 5
-                + criticality_counts["MEDIUM"] * 2
-                + criticality_counts["LOW"] * 1
-            )
+        Unlike ``get_impact_analysis`` the rows are neither sorted nor
+        aggregated, so memory stays flat on large blast radiuses.
+        """
+        connection = await self._get_connection()
+        query = queries.impact_query(
+            max_depth, ordered=False, storage=self._storage()
+        )
+
+        try:
+            async for batch in connection.stream_query(
+                query, self._traversal_parameters(ci_id), batch_size
+            ):
+                for record in batch:
+                    yield self._format_traversal_record(record)
+        except Exception as e:
+            logger.error(f"Failed to stream impact analysis for CI {ci_id}: {e}")
+            raise
+
+    async def stream_dependencies(
+        self, ci_id: str, max_depth: int = 3, batch_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the dependencies of a CI, one traversal path at a time."""
+        connection = await self._get_connection()
+        query = queries.dependencies_query(
+            max_depth, ordered=False, storage=self._storage()
+        )
+
+        try:
+            async for batch in connection.stream_query(
+                query, self._traversal_parameters(ci_id), batch_size
+            ):
+                for record in batch:
+                    yield self._format_traversal_record(record)
+        except Exception as e:
+            logger.error(f"Failed to stream dependencies for CI {ci_id}: {e}")
+            raise
+
+    def _score_impact(
+        self, records: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, int], float]:
+        """Count impacted CIs per criticality and compute the risk score."""
+        criticality_counts = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0}
+
+        for record in records:
+            # Count criticality levels
+            criticality = record["criticality"] or "MEDIUM"
+            if criticality in criticality_counts:
+                criticality_counts[criticality] += 1
+
+        # Calculate risk score
+        risk_score = (
+            criticality_counts["CRITICAL"] * 10
+            + criticality_counts["HIGH"] * 5
+            + criticality_counts["MEDIUM"] * 2
+            + criticality_counts["LOW"] * 1
+        )
+        return criticality_counts, float(risk_score)
+
+    async def get_impact_analysis(
+        self, ci_id: str, max_depth: int = 3, traversal: str = TRAVERSAL_PATHS
+    ) -> Dict[str, Any]:
+        """
+        Analyze the impact of a CI failure.
+
+        With ``traversal="paths"`` every dependency path is a row, so a CI
+        reachable in several ways is listed and counted several times; with
+        ``traversal="distinct"`` each impacted CI is counted once.
+        """
+        try:
+            # Get all CIs that would be impacted if this CI fails (reverse dependencies)
+            result = await self._traverse(ci_id, max_depth, traversal, impact=True)
+
+            impacted_cis = [self._format_traversal_record(r) for r in result]
+            criticality_counts, risk_score = self._score_impact(result)
 
             analysis = {
                 "source_ci": ci_id,
                 "total_impacted": len(impacted_cis),
                 "impacted_cis": impacted_cis,
                 "criticality_breakdown": criticality_counts,
-                "risk_score": risk_score,
+                "risk_score": float(risk_score),
                 "max_depth_analyzed": max_depth,
             }
 
             logger.info(
-                f"Impact analysis for {ci_id}: {len(impacted_cis)} CIs impacted, risk score: {risk_score}"
+                f"Impact analysis for {ci_id}: {len(impacted_cis)} CIs impacted, "
+                f"risk score: {risk_score}"
             )
             return analysis
 
@@ -230,33 +649,46 @@ class RelationshipService:
             logger.error(f"Failed to perform impact analysis for CI {ci_id}: {e}")
             raise
 
-    async def get_dependencies(self, ci_id: str, max_depth: int = 3) -> Dict[str, Any]:
-        """Get all dependencies of a CI."""
-        connection = await self._get_connection()
+    async def get_batch_impact_analysis(
+        self, ci_ids: List[str], max_depth: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Analyze the combined impact of several CIs failing together.
 
-        query = f"""
-        MATCH path = (ci:CI {{id: $ci_id}})-[:RELATED*1..{max_depth}]->(dependency:CI)
-        WHERE ALL(r IN relationships(path) WHERE r.type IN ['DEPENDS_ON', 'RUNS_ON', 'HOSTS', 'USES'])
-        RETURN dependency.id as ci_id, dependency.name as ci_name, dependency.criticality as criticality,
-               length(path) as distance,
-               [r in relationships(path) | r.type] as relationship_chain
-        ORDER BY distance, criticality DESC
+        One traversal from all the failing CIs: each impacted CI is listed and
+        counted in the risk score once, however many sources reach it, with
+        its minimal distance to any source and the sources reaching it.
         """
+        sources = list(dict.fromkeys(ci_ids))
+        try:
+            impacted_cis = await self._traverse_batch(sources, max_depth)
+            criticality_counts, risk_score = self._score_impact(impacted_cis)
+
+            logger.info(
+                f"Impact analysis for {len(sources)} CIs: {len(impacted_cis)} CIs "
+                f"impacted, risk score: {risk_score}"
+            )
+            return {
+                "source_cis": sources,
+                "total_impacted": len(impacted_cis),
+                "impacted_cis": impacted_cis,
+                "criticality_breakdown": criticality_counts,
+                "risk_score": risk_score,
+                "max_depth_analyzed": max_depth,
+            }
 
+        except Exception as e:
+            logger.error(f"Failed to perform impact analysis for CIs {sources}: {e}")
+            raise
+
+    async def get_dependencies(
+        self, ci_id: str, max_depth: int = 3, traversal: str = TRAVERSAL_PATHS
+    ) -> Dict[str, Any]:
+        """Get all dependencies of a CI, per path or each CI once (``traversal``)."""
         try:
-            result = await connection.execute_query(query, {"ci_id": ci_id})
+            result = await self._traverse(ci_id, max_depth, traversal, impact=False)
 
-            dependencies = []
-            for record in result:
-                dependencies.append(
-                    {
-                        "ci_id": record["ci_id"],
-                        "ci_name": record["ci_name"],
-                        "criticality": record["criticality"],
-                        "distance": record["distance"],
-                        "relationship_chain": record["relationship_chain"],
-                    }
-                )
+            dependencies = [self._format_traversal_record(r) for r in result]
 
             return {
                 "source_ci": ci_id,
@@ -269,23 +701,97 @@ class RelationshipService:
             logger.error(f"Failed to get dependencies for CI {ci_id}: {e}")
             raise
 
+    async def migrate_relationship_types(
+        self, batch_size: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Rewrite legacy ``RELATED`` edges to their native relationship type.
+
+        Runs online, ``batch_size`` edges per transaction, while the API
+        serves requests with ``relationship_storage="dual"``: every edge is
+        read either in its legacy or its native form, never both. Edges whose
+        ``type`` is not a ``RelationshipType`` are left as they are. Returns
+        the number of edges ``migrated`` and of legacy edges ``remaining``;
+        switch to ``relationship_storage="native"`` once none remain.
+        """
+        connection = await self._get_connection()
+        batch_size = batch_size or get_settings().relationship_migration_batch_size
+        migrated = 0
+
+        try:
+            while True:
+                result = await connection.execute_write_query(
+                    queries.MIGRATE_RELATIONSHIP_TYPES,
+                    {
+                        "relationship_types": queries.RELATIONSHIP_TYPES,
+                        "batch_size": batch_size,
+                    },
+                )
+                batch_count = result[0]["migrated_count"] if result else 0
+                if not batch_count:
+                    break
+                migrated += batch_count
+                logger.info(f"Migrated {migrated} relationships to native types")
+
+            result = await connection.execute_query(
+                queries.COUNT_LEGACY_RELATIONSHIPS
+            )
+            remaining = result[0]["legacy_count"] if result else 0
+
+        except Exception as e:
+            logger.error(f"Failed to migrate relationship types: {e}")
+            raise
+
+        if remaining:
+            logger.warning(
+                f"{remaining} legacy relationships have an unknown type and "
+                "were not migrated"
+            )
+        logger.info(
+            f"Relationship type migration complete: {migrated} migrated, "
+            f"{remaining} remaining"
+        )
+        return {"migrated": migrated, "remaining": remaining}
+
+    def get_impact_cache_stats(self) -> Dict[str, Any]:
+        """Report the traversal result cache's size and counters."""
+        return self._impact_cache.stats()
+
+    async def get_graph_statistics(self) -> Dict[str, Any]:
+        """Get overall graph statistics."""
+        connection = await self._get_connection()
+
+        try:
+            result = await connection.execute_query(queries.GRAPH_STATS)
+            stats = result[0] if result else {}
+
+            type_result = await connection.execute_query(
+                queries.RELATIONSHIP_TYPE_BREAKDOWN
+            )
+            relationship_breakdown = {
+                record["relationship_type"]: record["count"] for record in type_result
+            }
+
+            return {
+                "total_cis": stats.get("total_cis", 0),
+                "total_relationships": stats.get("total_relationships", 0),
+                "unique_relationship_types": stats.get("relationship_types", 0),
+                "relationship_type_breakdown": relationship_breakdown,
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to get graph statistics: {e}")
+            raise
+
     async def get_busfactor_analysis(self) -> Dict[str, Any]:
         """Analyze bus factor - CIs with the most dependencies."""
         connection = await self._get_connection()
 
-        query = """
-        MATCH (ci:CI)<-[:RELATED]-(dependent:CI)
-        WHERE ANY(r IN [(ci)<-[rel:RELATED]-(dependent) | rel] WHERE r.type IN ['DEPENDS_ON', 'RUNS_ON', 'HOSTS', 'USES'])
-        WITH ci, count(dependent) as dependency_count
-        WHERE dependency_count > 0
-        RETURN ci.id as ci_id, ci.name as ci_name, ci.criticality as criticality, 
-               ci.ci_type as ci_type, dependency_count
-        ORDER BY dependency_count DESC, criticality DESC
-        LIMIT 20
-        """
-
         try:
-            result = await connection.execute_query(query)
+            result = await connection.execute_query(
+                queries.BUSFACTOR[self._storage()],
+                {"relationship_types": queries.DEPENDENCY_RELATIONSHIP_TYPES},
+            )
 
             high_risk_cis = []
             for record in result:
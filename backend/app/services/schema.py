@@ -0,0 +1,124 @@
+"""
+Schema bootstrap: constraints and indexes for CI and relationship lookups.
+
+Every statement uses ``IF NOT EXISTS``, so the bootstrap is idempotent and
+runs on each startup. Index names are fixed so they can be inspected with
+``SHOW INDEXES`` and dropped explicitly.
+"""
+import logging
+import time
+from typing import List, Tuple
+
+from .queries import (
+    CI_SEARCH_FIELDS,
+    CI_SEARCH_INDEX,
+    LEGACY_RELATIONSHIP_TYPE,
+    RELATIONSHIP_TYPES,
+)
+from ..database import Neo4jConnection
+
+logger = logging.getLogger(__name__)
+
+# (name, statement) pairs, applied in order
+SCHEMA_STATEMENTS: List[Tuple[str, str]] = [
+    # Point lookups by id (get_ci, update_ci, delete_ci, relationship endpoints)
+    (
+        "ci_id_unique",
+        "CREATE CONSTRAINT ci_id_unique IF NOT EXISTS "
+        "FOR (ci:CI) REQUIRE ci.id IS UNIQUE",
+    ),
+    (
+        "related_id",
+        "CREATE INDEX related_id IF NOT EXISTS "
+        "FOR ()-[r:RELATED]-() ON (r.id)",
+    ),
+    # Legacy edges still to migrate, selected by their type property
+    (
+        "related_type",
+        "CREATE INDEX related_type IF NOT EXISTS "
+        "FOR ()-[r:RELATED]-() ON (r.type)",
+    ),
+    # Relationship indexes are per type: id lookups on native edges
+    *(
+        (
+            f"{rel_type.lower()}_id",
+            f"CREATE INDEX {rel_type.lower()}_id IF NOT EXISTS "
+            f"FOR ()-[r:{rel_type}]-() ON (r.id)",
+        )
+        for rel_type in RELATIONSHIP_TYPES
+    ),
+    # CI list filters and ordering
+    (
+        "ci_name",
+        "CREATE INDEX ci_name IF NOT EXISTS FOR (ci:CI) ON (ci.name)",
+    ),
+    # Keyset pagination: CIs by (name, id), relationships by (created_at, id)
+    (
+        "ci_name_id",
+        "CREATE INDEX ci_name_id IF NOT EXISTS FOR (ci:CI) ON (ci.name, ci.id)",
+    ),
+    *(
+        (
+            f"{rel_type.lower()}_created_at_id",
+            f"CREATE INDEX {rel_type.lower()}_created_at_id IF NOT EXISTS "
+            f"FOR ()-[r:{rel_type}]-() ON (r.created_at, r.id)",
+        )
+        for rel_type in [LEGACY_RELATIONSHIP_TYPE] + RELATIONSHIP_TYPES
+    ),
+    (
+        "ci_type",
+        "CREATE INDEX ci_type IF NOT EXISTS FOR (ci:CI) ON (ci.ci_type)",
+    ),
+    (
+        "ci_environment",
+        "CREATE INDEX ci_environment IF NOT EXISTS FOR (ci:CI) ON (ci.environment)",
+    ),
+    (
+        "ci_criticality",
+        "CREATE INDEX ci_criticality IF NOT EXISTS FOR (ci:CI) ON (ci.criticality)",
+    ),
+    (
+        "ci_type_environment",
+        "CREATE INDEX ci_type_environment IF NOT EXISTS "
+        "FOR (ci:CI) ON (ci.ci_type, ci.environment)",
+    ),
+    (
+        "ci_type_environment_criticality",
+        "CREATE INDEX ci_type_environment_criticality IF NOT EXISTS "
+        "FOR (ci:CI) ON (ci.ci_type, ci.environment, ci.criticality)",
+    ),
+    # Ranked text search (search_cis)
+    (
+        CI_SEARCH_INDEX,
+        f"CREATE FULLTEXT INDEX {CI_SEARCH_INDEX} IF NOT EXISTS FOR (n:CI) ON EACH ["
+        + ", ".join(f"n.{field}" for field in CI_SEARCH_FIELDS)
+        + "]",
+    ),
+]
+
+
+async def ensure_schema(connection: Neo4jConnection) -> List[str]:
+    """
+    Create the constraints and indexes the services rely on.
+
+    Statements that fail are logged and skipped, so one failure (for example
+    duplicate CI ids preventing the uniqueness constraint) does not prevent
+    the remaining indexes from being created. Returns the names of the
+    statements that failed.
+    """
+    failed = []
+    started = time.perf_counter()
+
+    for name, statement in SCHEMA_STATEMENTS:
+        try:
+            await connection.execute_write_query(statement)
+        except Exception as e:
+            failed.append(name)
+            logger.error(f"Schema bootstrap failed for {name}: {e}")
+
+    logger.info(
+        f"Schema bootstrap applied {len(SCHEMA_STATEMENTS) - len(failed)}/"
+        f"{len(SCHEMA_STATEMENTS)} statements in "
+        f"{time.perf_counter() - started:.3f}s"
+    )
+    return failed
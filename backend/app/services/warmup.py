@@ -0,0 +1,108 @@
+"""
+Query plan cache warm-up at application startup.
+"""
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Dict, Optional
+
+from neo4j import READ_ACCESS, WRITE_ACCESS
+
+from . import queries
+from ..database import Neo4jConnection, query_timeout
+
+logger = logging.getLogger(__name__)
+
+_PARAMETER_PATTERN = re.compile(r"\$(\w+)")
+
+# Representative values for query parameters, so plans are cached for the
+# parameter types the services actually send
+WARMUP_PARAMETERS: Dict[str, Any] = {
+    "ci_id": "",
+    "ids": [],
+    "ci_type": "",
+    "environment": "",
+    "criticality": "",
+    "search_query": "warmup",
+    "cursor_score": 0.0,
+    "cursor_id": "",
+    "cursor_name": "",
+    "cursor_created_at": "1970-01-01T00:00:00Z",
+    "limit": 1,
+    "offset": 0,
+    "properties": {},
+    "rows": [],
+    "relationships": [],
+    "relationship_types": queries.DEPENDENCY_RELATIONSHIP_TYPES,
+    "facets": list(queries.CI_FACETS),
+    "fields": ["id", "name"],
+    "relationship_id": "",
+    "frontier": [],
+    "batch_size": 1,
+    "from_ci_id": "",
+    "to_ci_id": "",
+    "rel_id": "",
+    "rel_type": "",
+}
+
+
+def _warmup_parameters(query: str) -> Dict[str, Any]:
+    """Return representative values for the parameters used by a query."""
+    return {
+        name: WARMUP_PARAMETERS.get(name)
+        for name in _PARAMETER_PATTERN.findall(query)
+    }
+
+
+async def _explain_all(
+    connection: Neo4jConnection, timings: Dict[str, Optional[float]]
+) -> None:
+    for name, query in queries.QUERIES.items():
+        access_mode = WRITE_ACCESS if name in queries.WRITE_QUERIES else READ_ACCESS
+        started = time.perf_counter()
+        try:
+            await connection.explain(query, _warmup_parameters(query), access_mode)
+            timings[name] = time.perf_counter() - started
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            timings[name] = None
+            logger.warning(f"Query warm-up failed for {name}: {e}")
+
+
+async def warm_up_query_plans(
+    connection: Neo4jConnection, timeout: float
+) -> Dict[str, Optional[float]]:
+    """
+    Run ``EXPLAIN`` for every registered service query.
+
+    Planning is cached by Neo4j per query text, so the first real requests
+    after a deploy skip the planning cost. The whole warm-up is bounded by
+    ``timeout`` seconds; queries not planned by then are skipped. Returns the
+    planning time per query name, ``None`` for queries that failed.
+    """
+    timings: Dict[str, Optional[float]] = {}
+    started = time.perf_counter()
+
+    try:
+        with query_timeout(timeout):
+            await asyncio.wait_for(_explain_all(connection, timings), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Query warm-up stopped after {timeout}s: "
+            f"{len(timings)}/{len(queries.QUERIES)} queries planned"
+        )
+
+    elapsed = time.perf_counter() - started
+    planned = [t for t in timings.values() if t is not None]
+    slowest = sorted(
+        ((t, name) for name, t in timings.items() if t is not None), reverse=True
+    )[:3]
+    logger.info(
+        f"Query warm-up planned {len(planned)}/{len(queries.QUERIES)} queries "
+        f"in {elapsed:.3f}s (slowest: "
+        + ", ".join(f"{name} {t:.3f}s" for t, name in slowest)
+        + ")"
+    )
+    return timings
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Bulk ingestion throughput benchmark for the Constellation API.
+
+Creates synthetic CIs one request at a time through ``POST /cis/`` and in
+batches through ``POST /cis/bulk``, and reports the throughput of each in
+CIs per second. The created CIs are not deleted, so run it against a scratch
+database.
+
+Usage:
+    python benchmarks/bulk_ingest_benchmark.py [--cis 20000] [--batch-size 5000]
+"""
+
+import argparse
+import random
+import time
+import uuid
+
+import requests
+
+BASE_URL = "http://localhost:8000/api/v1"
+
+CI_TYPES = ["HARDWARE", "SOFTWARE", "APPLICATION", "SERVICE", "DATABASE", "NETWORK"]
+ENVIRONMENTS = ["DEV", "TEST", "STAGING", "PROD"]
+CRITICALITIES = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+
+
+def make_ci(run_id, index):
+    """Return the payload of a synthetic CI."""
+    return {
+        "name": f"bench-{run_id}-{index:07d}",
+        "description": "Synthetic CI created by the bulk ingestion benchmark",
+        "ci_type": random.choice(CI_TYPES),
+        "environment": random.choice(ENVIRONMENTS),
+        "criticality": random.choice(CRITICALITIES),
+        "hostname": f"bench-{index}.example.internal",
+        "ip_address": f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}",
+    }
+
+
+def single_requests(base_url, run_id, count):
+    """Create ``count`` CIs with one request each; return CIs per second."""
+    with requests.Session() as session:
+        start = time.perf_counter()
+        for index in range(count):
+            response = session.post(
+                f"{base_url}/cis/", json=make_ci(run_id, index), timeout=60
+            )
+            response.raise_for_status()
+        return count / (time.perf_counter() - start)
+
+
+def bulk_requests(base_url, run_id, count, batch_size):
+    """Create ``count`` CIs through the bulk endpoint; return CIs per second."""
+    failed = 0
+    with requests.Session() as session:
+        start = time.perf_counter()
+        for offset in range(0, count, batch_size):
+            batch = [
+                make_ci(run_id, index)
+                for index in range(offset, min(offset + batch_size, count))
+            ]
+            response = session.post(
+                f"{base_url}/cis/bulk", json={"cis": batch}, timeout=600
+            )
+            response.raise_for_status()
+            failed += response.json()["failed"]
+        elapsed = time.perf_counter() - start
+
+    if failed:
+        print(f"  warning: {failed} CIs failed in bulk mode")
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cis", type=int, default=20_000)
+    parser.add_argument(
+        "--single-cis",
+        type=int,
+        default=1_000,
+        help="CIs created one request at a time (smaller, it is slow)",
+    )
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+
+    single_rate = single_requests(args.base_url, f"{run_id}-s", args.single_cis)
+    bulk_rate = bulk_requests(args.base_url, f"{run_id}-b", args.cis, args.batch_size)
+
+    print(f"POST /cis/      {args.single_cis:>8} CIs  {single_rate:10.1f} CIs/s")
+    print(f"POST /cis/bulk  {args.cis:>8} CIs  {bulk_rate:10.1f} CIs/s")
+    print(f"Speedup: {bulk_rate / single_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for the Constellation API.
+
+Measures the latency of ``GET /cis`` while ``GET /impact/{id}`` requests are
+running in parallel. With a blocking database driver a slow impact traversal
+stalls every other request served by the same worker, which shows up as a
+p99 latency for ``/cis`` close to the impact query duration.
+
+Usage:
+    python benchmarks/concurrency_benchmark.py --ci-id <id> [--duration 30]
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE_URL = "http://localhost:8000/api/v1"
+
+
+def percentile(samples, pct):
+    """Return the ``pct`` percentile of ``samples`` (nearest-rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def timed_get(session, url, params=None):
+    """Issue a GET request and return its latency in milliseconds."""
+    start = time.perf_counter()
+    response = session.get(url, params=params, timeout=120)
+    response.raise_for_status()
+    return (time.perf_counter() - start) * 1000
+
+
+def impact_worker(base_url, ci_id, max_depth, stop_event, latencies):
+    """Continuously run impact analyses until ``stop_event`` is set."""
+    with requests.Session() as session:
+        while not stop_event.is_set():
+            latencies.append(
+                timed_get(
+                    session,
+                    f"{base_url}/impact/{ci_id}",
+                    params={"max_depth": max_depth},
+                )
+            )
+
+
+def list_worker(base_url, stop_event, latencies):
+    """Continuously list CIs until ``stop_event`` is set."""
+    with requests.Session() as session:
+        while not stop_event.is_set():
+            latencies.append(
+                timed_get(session, f"{base_url}/cis/", params={"limit": 50})
+            )
+
+
+def report(label, latencies):
+    """Print a latency summary line."""
+    if not latencies:
+        print(f"{label:<12} no samples")
+        return
+    print(
+        f"{label:<12} n={len(latencies):<6} "
+        f"p50={percentile(latencies, 50):8.1f}ms "
+        f"p95={percentile(latencies, 95):8.1f}ms "
+        f"p99={percentile(latencies, 99):8.1f}ms "
+        f"mean={statistics.mean(latencies):8.1f}ms"
+    )
+
+
+def run(base_url, ci_id, duration, impact_clients, list_clients, max_depth):
+    """Run the benchmark for ``duration`` seconds."""
+    stop_event = threading.Event()
+    impact_latencies = []
+    list_latencies = []
+
+    with ThreadPoolExecutor(max_workers=impact_clients + list_clients) as pool:
+        for _ in range(impact_clients):
+            pool.submit(
+                impact_worker, base_url, ci_id, max_depth, stop_event, impact_latencies
+            )
+        for _ in range(list_clients):
+            pool.submit(list_worker, base_url, stop_event, list_latencies)
+
+        time.sleep(duration)
+        stop_event.set()
+
+    print(
+        f"Duration: {duration}s, impact clients: {impact_clients}, "
+        f"list clients: {list_clients}, max_depth: {max_depth}"
+    )
+    report("/cis", list_latencies)
+    report("/impact", impact_latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ci-id", required=True, help="CI used for /impact/{id}")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--impact-clients", type=int, default=2)
+    parser.add_argument("--list-clients", type=int, default=8)
+    parser.add_argument("--max-depth", type=int, default=5)
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+
+    run(
+        args.base_url,
+        args.ci_id,
+        args.duration,
+        args.impact_clients,
+        args.list_clients,
+        args.max_depth,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+CI hydration microbenchmark for the Constellation read path.
+
+Builds synthetic Neo4j CI property maps (with Neo4j DateTimes and JSON
+encoded custom attributes, as stored by the services) and measures how long
+turning them into ``CI`` models takes, with full Pydantic validation and with
+the trusted ``model_construct`` path used by default. Needs no database.
+
+Usage:
+    python benchmarks/hydration_benchmark.py [--cis 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from neo4j.time import DateTime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.models.ci import CI  # noqa: E402
+from app.services.hydration import ModelHydrator  # noqa: E402
+
+CI_TYPES = ["HARDWARE", "SOFTWARE", "APPLICATION", "SERVICE", "DATABASE", "NETWORK"]
+ENVIRONMENTS = ["DEV", "TEST", "STAGING", "PROD"]
+CRITICALITIES = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+
+
+def make_node(index):
+    """Return the property map of a synthetic CI as read back from Neo4j."""
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=index)
+    return {
+        "id": f"ci-{index:07d}",
+        "name": f"bench-{index:07d}",
+        "description": "Synthetic CI created by the hydration benchmark",
+        "ci_type": random.choice(CI_TYPES),
+        "environment": random.choice(ENVIRONMENTS),
+        "criticality": random.choice(CRITICALITIES),
+        "lifecycle_state": "ACTIVE",
+        "hostname": f"bench-{index}.example.internal",
+        "ip_address": f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}",
+        "vendor": "Example Corp",
+        "location": "eu-west-1",
+        "monitoring_enabled": True,
+        "backup_enabled": False,
+        "pii": False,
+        "compliance_tags": ["ISO27001"],
+        "custom_attributes": json.dumps({"rack": index % 40, "tier": "gold"}),
+        "created_at": DateTime.from_native(created_at),
+        "updated_at": DateTime.from_native(created_at),
+    }
+
+
+def measure(nodes, build, repeat):
+    """Return the per-run durations of hydrating every node with ``build``."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for node in nodes:
+            build(node)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cis", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    nodes = [make_node(index) for index in range(args.cis)]
+    hydrate = ModelHydrator(CI)
+
+    results = {
+        "validated": measure(
+            nodes, lambda node: hydrate(node, strict=True), args.repeat
+        ),
+        "construct": measure(nodes, hydrate, args.repeat),
+    }
+
+    for mode, durations in results.items():
+        median = statistics.median(durations)
+        print(
+            f"{mode:<10} {args.cis:>8} CIs  median {median * 1000:8.1f} ms  "
+            f"{median / args.cis * 1e6:6.2f} us/CI"
+        )
+    speedup = statistics.median(results["validated"]) / statistics.median(
+        results["construct"]
+    )
+    print(f"Speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+In-memory graph projection benchmark at a million dependency edges.
+
+Builds a synthetic graph of ``--cis`` CIs and ``--edges`` dependency edges
+(targets skewed towards a few hubs, like shared databases and clusters) with
+``SnapshotBuilder``, then reports the build time and array memory, and the
+median latency of distinct impact traversals at depths 3 to 5: the
+breadth-first search of ``GraphSnapshot.traverse`` alone and with the records
+``GraphProjection.traverse`` returns, next to a plain Python breadth-first
+search over adjacency lists that only counts CIs. Then times the
+multi-source traversal of ``POST /impact/batch`` from ``--batch`` CIs next to
+one traversal per CI. Finally applies
+``--changes`` edge writes to the overlay and measures the search with them
+pending and the compaction. Needs no database.
+
+Usage:
+    python benchmarks/projection_benchmark.py [--cis 200000] [--edges 1000000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ["GRAPH_PROJECTION_ENABLED"] = "true"
+
+from app.services import queries  # noqa: E402
+from app.services.graph_projection import GraphProjection, SnapshotBuilder  # noqa: E402
+from app.services.graph_version import graph_version  # noqa: E402
+
+
+def synthetic_edges(cis, edges, seed):
+    """Return ``(from, to, type)`` index triples; low indices are hubs."""
+    rng = random.Random(seed)
+    types = queries.DEPENDENCY_RELATIONSHIP_TYPES
+    return [
+        (rng.randrange(cis), int(cis * rng.random() ** 3), rng.choice(types))
+        for _ in range(edges)
+    ]
+
+
+def python_bfs(incoming, source, max_depth):
+    """Reference breadth-first search over adjacency lists."""
+    distance = {source: 0}
+    frontier = [source]
+    for depth in range(1, max_depth + 1):
+        next_frontier = []
+        for node in frontier:
+            for neighbour in incoming.get(node, ()):
+                if neighbour not in distance:
+                    distance[neighbour] = depth
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+    return len(distance) - 1
+
+
+def median_ms(function, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cis", type=int, default=200_000)
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--sources", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--changes", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    ids = [f"ci-{index:07d}" for index in range(args.cis)]
+    edges = synthetic_edges(args.cis, args.edges, args.seed)
+
+    start = time.perf_counter()
+    builder = SnapshotBuilder()
+    for ci_id in ids:
+        builder.add_ci(ci_id, ci_id, "HIGH")
+    for source, target, rel_type in edges:
+        builder.add_edge(ids[source], ids[target], rel_type)
+    loaded = time.perf_counter()
+    snapshot = builder.build()
+    built = time.perf_counter()
+
+    memory = sum(
+        array.nbytes
+        for adjacency in (snapshot.outgoing, snapshot.incoming)
+        for array in (adjacency.indptr, adjacency.indices, adjacency.types)
+    )
+    print(
+        f"{args.cis:,} CIs, {args.edges:,} edges: interned in "
+        f"{(loaded - start) * 1000:.0f} ms, CSR built in "
+        f"{(built - loaded) * 1000:.0f} ms, {memory / 2**20:.1f} MiB of arrays"
+    )
+
+    projection = GraphProjection()
+    projection.snapshot = snapshot
+    projection.version = graph_version.value
+
+    incoming = {}
+    for source, target, _ in edges:
+        incoming.setdefault(ids[target], []).append(ids[source])
+
+    # A few hubs and a few ordinary CIs
+    rng = random.Random(args.seed)
+    sources = ids[: args.sources] + rng.sample(ids, args.sources)
+
+    print("Impact traversal, median per source:")
+    for depth in range(3, 6):
+        searched, projected, python, reached = [], [], [], []
+        for source in sources:
+            latency, _ = median_ms(
+                lambda: snapshot.traverse([source], depth, impact=True), args.repeat
+            )
+            searched.append(latency)
+            latency, records = median_ms(
+                lambda: projection.traverse([source], depth, impact=True), args.repeat
+            )
+            projected.append(latency)
+            reached.append(len(records))
+            latency, _ = median_ms(
+                lambda: python_bfs(incoming, source, depth), args.repeat
+            )
+            python.append(latency)
+        print(
+            f"  depth {depth}  search {statistics.median(searched):8.2f} ms  "
+            f"with records {statistics.median(projected):8.2f} ms  "
+            f"python BFS {statistics.median(python):8.2f} ms  "
+            f"median CIs reached {int(statistics.median(reached)):>8,}"
+        )
+
+    batch = rng.sample(ids, args.batch)
+    print(f"Impact of {args.batch} failing CIs together, median:")
+    for depth in range(3, 6):
+        latency, records = median_ms(
+            lambda: projection.reach(batch, depth), args.repeat
+        )
+        separate, _ = median_ms(
+            lambda: [projection.traverse([ci_id], depth, True) for ci_id in batch],
+            args.repeat,
+        )
+        print(
+            f"  depth {depth}  one traversal {latency:8.2f} ms  "
+            f"one per CI {separate:8.2f} ms  CIs impacted {len(records):>8,}"
+        )
+
+    version = graph_version.value
+    for index in range(args.changes):
+        version = graph_version.bump()
+        projection.add_relationship(
+            version,
+            ids[rng.randrange(args.cis)],
+            ids[rng.randrange(args.cis)],
+            "DEPENDS_ON",
+        )
+    latency, _ = median_ms(
+        lambda: projection.snapshot.traverse(sources[-1:], 3, impact=True),
+        args.repeat,
+    )
+    print(
+        f"With {projection.snapshot.delta:,} pending changes: "
+        f"depth 3 search from an ordinary CI {latency:.2f} ms"
+    )
+    latency, _ = median_ms(projection.snapshot.compact, 1)
+    print(f"Compaction: {latency:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Database hits of impact analysis with legacy and native relationship types.
+
+Seeds a layered graph in the legacy form, every edge a ``RELATED`` relationship
+with a ``type`` property: ``--width`` CIs per layer, each depending on
+``--fanout`` CIs of the previous layer, plus ``--noise`` edges per CI of types
+impact analysis does not follow (ownership, documentation, ...). Profiles the
+``/impact`` traversal from the hub at depths 3 to 5 with ``dual`` storage,
+migrates the edges to native types with
+``RelationshipService.migrate_relationship_types``, then profiles the dual and
+native traversals again, and reports total db hits and rows of each.
+
+Runs directly against Neo4j (with APOC), not through the API, and creates CIs
+with ids starting with ``storage-bench-``; use ``--cleanup`` to delete them
+afterwards. The migration rewrites every legacy edge of the database, so run
+it against a scratch instance.
+
+Usage:
+    python benchmarks/relationship_storage_benchmark.py --uri bolt://localhost:7687 \
+        [--width 200] [--fanout 3] [--noise 5]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+from neo4j import GraphDatabase
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from traversal_benchmark import DriverConnection  # noqa: E402
+
+from app.services import queries  # noqa: E402
+from app.services.relationship_service import RelationshipService  # noqa: E402
+
+HUB_ID = "storage-bench-0-0"
+
+NOISE_TYPES = [
+    rel_type
+    for rel_type in queries.RELATIONSHIP_TYPES
+    if rel_type not in queries.DEPENDENCY_RELATIONSHIP_TYPES
+]
+
+
+def seed(driver, layers, width, fanout, noise):
+    """Create the graph with legacy RELATED edges."""
+    print(
+        f"Seeding legacy graph: {layers} layers x {width} CIs, "
+        f"fanout {fanout}, {noise} noise edges per CI..."
+    )
+    layer_ids = [[HUB_ID]] + [
+        [f"storage-bench-{layer}-{index}" for index in range(width)]
+        for layer in range(1, layers + 1)
+    ]
+    all_ids = [ci_id for layer in layer_ids for ci_id in layer]
+    edges = []
+    for previous, current in zip(layer_ids, layer_ids[1:]):
+        for node in current:
+            for target in random.sample(previous, min(fanout, len(previous))):
+                edges.append(
+                    (node, target, random.choice(queries.DEPENDENCY_RELATIONSHIP_TYPES))
+                )
+    for node in all_ids:
+        for target in random.sample(all_ids, noise):
+            edges.append((node, target, random.choice(NOISE_TYPES)))
+
+    rows = [
+        {"id": f"{source}>{target}:{index}", "from": source, "to": target, "type": t}
+        for index, (source, target, t) in enumerate(edges)
+    ]
+    with driver.session() as session:
+        session.run(
+            "UNWIND $ids AS id CREATE (:CI {id: id, name: id, criticality: 'HIGH'})",
+            ids=all_ids,
+        ).consume()
+        for start in range(0, len(rows), 5_000):
+            session.run(
+                """
+                UNWIND $rows AS row
+                MATCH (a:CI {id: row.from}), (b:CI {id: row.to})
+                CREATE (a)-[:RELATED {id: row.id, type: row.type}]->(b)
+                """,
+                rows=rows[start : start + 5_000],
+            ).consume()
+
+
+def cleanup(driver):
+    """Delete the benchmark graph."""
+    with driver.session() as session:
+        session.run(
+            "MATCH (ci:CI) WHERE ci.id STARTS WITH 'storage-bench-' DETACH DELETE ci"
+        ).consume()
+
+
+def db_hits(plan):
+    """Sum the db hits of a profiled plan and its children."""
+    return plan.get("dbHits", 0) + sum(db_hits(child) for child in plan["children"])
+
+
+def profile(driver, depth, storage):
+    """Return the db hits and rows of the impact traversal from the hub."""
+    records, summary, _ = driver.execute_query(
+        "PROFILE " + queries.impact_query(depth, storage=storage),
+        {
+            "ci_id": HUB_ID,
+            "relationship_types": queries.DEPENDENCY_RELATIONSHIP_TYPES,
+        },
+    )
+    return db_hits(summary.profile), len(records)
+
+
+def report(driver, label, storage):
+    print(f"{label}:")
+    for depth in range(3, 6):
+        hits, rows = profile(driver, depth, storage)
+        print(f"  depth {depth}  db hits={hits:>12,}  rows={rows:>10,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--uri", default="bolt://localhost:7687")
+    parser.add_argument("--username", default="neo4j")
+    parser.add_argument("--password", default="constellation123")
+    parser.add_argument("--layers", type=int, default=5)
+    parser.add_argument("--width", type=int, default=200)
+    parser.add_argument("--fanout", type=int, default=3)
+    parser.add_argument("--noise", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument(
+        "--cleanup", action="store_true", help="Delete the graph afterwards"
+    )
+    args = parser.parse_args()
+
+    driver = GraphDatabase.driver(args.uri, auth=(args.username, args.password))
+    try:
+        seed(driver, args.layers, args.width, args.fanout, args.noise)
+        report(driver, "Before migration, dual storage", "dual")
+
+        service = RelationshipService()
+        service.connection = DriverConnection(driver, timeout=None)
+        result = asyncio.run(service.migrate_relationship_types(args.batch_size))
+        print(f"Migrated {result['migrated']:,} edges, {result['remaining']} remaining")
+
+        report(driver, "After migration, dual storage", "dual")
+        report(driver, "After migration, native storage", "native")
+
+        if args.cleanup:
+            cleanup(driver)
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+JSON response rendering benchmark for the Constellation API.
+
+Renders a large CI list page and a large impact analysis the way FastAPI
+does by default (revalidation against the endpoint's ``response_model``,
+``jsonable_encoder``, then ``json.dumps``) and with ``FastJSONResponse``
+(orjson, no revalidation), and reports the median time of each. Needs no
+database or running server.
+
+Usage:
+    python benchmarks/response_benchmark.py [--rows 5000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hydration_benchmark import make_node  # noqa: E402
+
+from app.api import ci_endpoints, impact_endpoints  # noqa: E402
+from app.api.responses import FastJSONResponse  # noqa: E402
+from app.services.ci_service import CIService  # noqa: E402
+
+
+def response_field(router, path):
+    """Return the response model field of a GET route."""
+    for route in router.routes:
+        if route.path == path and "GET" in route.methods:
+            return route.response_field
+    raise LookupError(path)
+
+
+def ci_page(rows):
+    """Return CI list content as shaped by the endpoint."""
+    service = CIService()
+    return {
+        "cis": [service._build_ci(make_node(index)) for index in range(rows)],
+        "total_count": rows,
+        "limit": rows,
+        "offset": 0,
+        "next_cursor": None,
+    }
+
+
+def impact_analysis(rows):
+    """Return an impact analysis as shaped by the relationship service."""
+    impacted = [
+        {
+            "ci_id": f"ci-{index:07d}",
+            "ci_name": f"bench-{index:07d}",
+            "criticality": "HIGH",
+            "distance": index % 5 + 1,
+            "relationship_chain": ["DEPENDS_ON", "RUNS_ON"][: index % 2 + 1],
+        }
+        for index in range(rows)
+    ]
+    return {
+        "source_ci": "ci-0000000",
+        "total_impacted": rows,
+        "impacted_cis": impacted,
+        "criticality_breakdown": {"CRITICAL": 0, "HIGH": rows, "MEDIUM": 0, "LOW": 0},
+        "risk_score": float(rows * 5),
+        "max_depth_analyzed": 5,
+    }
+
+
+async def default_render(field, content):
+    """Render like FastAPI does for a non-Response return value."""
+    serialized = await serialize_response(
+        field=field, response_content=content, is_coroutine=True
+    )
+    return JSONResponse(serialized).body
+
+
+async def fast_render(field, content):
+    return FastJSONResponse(content).body
+
+
+async def measure(render, field, content, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await render(field, content)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+async def run(rows, repeat):
+    payloads = [
+        (
+            "GET /cis/",
+            response_field(ci_endpoints.router, "/cis/"),
+            ci_page(rows),
+        ),
+        (
+            "GET /impact/{id}",
+            response_field(impact_endpoints.router, "/impact/{ci_id}"),
+            impact_analysis(rows),
+        ),
+    ]
+    for name, field, content in payloads:
+        before = await measure(default_render, field, content, repeat)
+        after = await measure(fast_render, field, content, repeat)
+        print(
+            f"{name:<18} {rows:>7} rows  default {before * 1000:8.1f} ms  "
+            f"orjson {after * 1000:8.1f} ms  speedup {before / after:5.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Schema bootstrap benchmark for the Constellation database layer.
+
+Seeds a Neo4j database with synthetic CIs and relationships, then measures
+the latency of the service lookups (CI by id, relationship by id and filtered
+CI listings) first without any constraint or index, then after applying the
+schema bootstrap from ``app.services.schema``.
+
+Runs directly against Neo4j, not through the API. It drops the bootstrap
+constraints and indexes before the first pass, so point it at a scratch
+database.
+
+Usage:
+    python benchmarks/schema_benchmark.py --uri bolt://localhost:7687 [--cis 100000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+from neo4j import GraphDatabase
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services import queries  # noqa: E402
+from app.services.schema import SCHEMA_STATEMENTS  # noqa: E402
+
+CI_TYPES = ["HARDWARE", "SOFTWARE", "APPLICATION", "SERVICE", "DATABASE", "NETWORK"]
+ENVIRONMENTS = ["DEV", "TEST", "STAGING", "PROD"]
+CRITICALITIES = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+
+GET_RELATIONSHIP = """
+MATCH ()-[r:RELATED {id: $relationship_id}]-()
+RETURN r.id as rel_id
+"""
+
+
+def percentile(samples, pct):
+    """Return the ``pct`` percentile of ``samples`` (nearest-rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def drop_schema(driver):
+    """Drop the constraints and indexes created by the schema bootstrap."""
+    with driver.session() as session:
+        for name, statement in SCHEMA_STATEMENTS:
+            kind = "CONSTRAINT" if "CONSTRAINT" in statement else "INDEX"
+            session.run(f"DROP {kind} {name} IF EXISTS").consume()
+
+
+def apply_schema(driver):
+    """Apply the schema bootstrap and wait for the indexes to come online."""
+    with driver.session() as session:
+        for _, statement in SCHEMA_STATEMENTS:
+            session.run(statement).consume()
+        session.run("CALL db.awaitIndexes(600)").consume()
+
+
+def seed(driver, ci_count, batch_size):
+    """Create ``ci_count`` synthetic CIs, each depending on the previous one."""
+    print(f"Seeding {ci_count} CIs...")
+    with driver.session() as session:
+        for start in range(0, ci_count, batch_size):
+            rows = [
+                {
+                    "rel_id": f"bench-rel-{i}",
+                    "properties": {
+                        "id": f"bench-ci-{i}",
+                        "name": f"bench-{i:07d}",
+                        "ci_type": random.choice(CI_TYPES),
+                        "environment": random.choice(ENVIRONMENTS),
+                        "criticality": random.choice(CRITICALITIES),
+                    },
+                }
+                for i in range(start, min(start + batch_size, ci_count))
+            ]
+            # Relationships are created within the batch, so no lookup is needed
+            session.run(
+                """
+                UNWIND $rows AS row
+                CREATE (ci:CI)
+                SET ci = row.properties
+                WITH collect({ci: ci, rel_id: row.rel_id}) AS created
+                UNWIND range(1, size(created) - 1) AS i
+                WITH created[i] AS current, created[i - 1].ci AS previous
+                WITH current.ci AS ci, current.rel_id AS rel_id, previous
+                CREATE (ci)-[:RELATED {id: rel_id, type: 'DEPENDS_ON'}]->(previous)
+                """,
+                rows=rows,
+            ).consume()
+
+
+def cleanup(driver, batch_size):
+    """Delete the synthetic CIs."""
+    with driver.session() as session:
+        while True:
+            deleted = session.run(
+                """
+                MATCH (ci:CI) WHERE ci.id STARTS WITH 'bench-ci-'
+                WITH ci LIMIT $limit
+                DETACH DELETE ci
+                RETURN count(ci) as deleted
+                """,
+                limit=batch_size,
+            ).single()["deleted"]
+            if not deleted:
+                break
+
+
+def measure(driver, ci_count, samples):
+    """Return lookup latencies in milliseconds, keyed by operation."""
+    operations = {
+        "get_ci": lambda: (
+            queries.GET_CI,
+            {"ci_id": f"bench-ci-{random.randrange(ci_count)}"},
+        ),
+        "get_relationship": lambda: (
+            GET_RELATIONSHIP,
+            {"relationship_id": f"bench-rel-{random.randrange(1, ci_count)}"},
+        ),
+        "list_filtered": lambda: (
+            queries.list_cis_query(["ci_type", "environment"]),
+            {
+                "ci_type": random.choice(CI_TYPES),
+                "environment": random.choice(ENVIRONMENTS),
+                "limit": 50,
+                "offset": 0,
+            },
+        ),
+    }
+
+    latencies = {name: [] for name in operations}
+    with driver.session() as session:
+        for name, make_query in operations.items():
+            for _ in range(samples):
+                query, parameters = make_query()
+                start = time.perf_counter()
+                session.run(query, parameters).consume()
+                latencies[name].append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label, latencies):
+    """Print a latency summary per operation."""
+    print(label)
+    for name, samples in latencies.items():
+        print(
+            f"  {name:<18} p50={percentile(samples, 50):8.2f}ms "
+            f"p95={percentile(samples, 95):8.2f}ms "
+            f"mean={statistics.mean(samples):8.2f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--uri", default="bolt://localhost:7687")
+    parser.add_argument("--username", default="neo4j")
+    parser.add_argument("--password", default="constellation123")
+    parser.add_argument("--cis", type=int, default=100_000)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument(
+        "--skip-seed", action="store_true", help="Reuse previously seeded CIs"
+    )
+    parser.add_argument(
+        "--cleanup", action="store_true", help="Delete the seeded CIs afterwards"
+    )
+    args = parser.parse_args()
+
+    driver = GraphDatabase.driver(args.uri, auth=(args.username, args.password))
+    try:
+        drop_schema(driver)
+        if not args.skip_seed:
+            seed(driver, args.cis, args.batch_size)
+
+        without_schema = measure(driver, args.cis, args.samples)
+        apply_schema(driver)
+        with_schema = measure(driver, args.cis, args.samples)
+
+        print(f"CIs: {args.cis}, samples per operation: {args.samples}")
+        report("Without schema:", without_schema)
+        report("With schema:", with_schema)
+
+        if args.cleanup:
+            cleanup(driver, args.batch_size)
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Impact traversal benchmark on a synthetic hub graph.
+
+Seeds a layered graph: a hub CI, then ``--layers`` layers of ``--width`` CIs
+where every CI depends on ``--fanout`` random CIs of the previous layer. The
+number of dependency paths from the hub grows as ``fanout ** depth`` while the
+number of impacted CIs stays at most ``width * depth``. Runs the impact
+analysis from the hub at depths 3 to 5 with ``traversal=paths`` and
+``traversal=distinct`` through ``RelationshipService`` and reports latency,
+rows returned and risk score for each.
+
+Runs directly against Neo4j, not through the API, and creates CIs with ids
+starting with ``hub-bench-``; use ``--cleanup`` to delete them afterwards.
+
+Usage:
+    python benchmarks/traversal_benchmark.py --uri bolt://localhost:7687 \
+        [--width 200] [--fanout 5]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+from neo4j import GraphDatabase, Query, RoutingControl
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.relationship_service import RelationshipService  # noqa: E402
+
+HUB_ID = "hub-bench-0-0"
+
+
+class DriverConnection:
+    """Minimal ``Neo4jConnection`` stand-in over a blocking driver."""
+
+    def __init__(self, driver, timeout):
+        self.driver = driver
+        self.timeout = timeout
+
+    async def execute_query(self, query, parameters=None):
+        records, _, _ = self.driver.execute_query(
+            Query(query, timeout=self.timeout),
+            parameters or {},
+            routing_=RoutingControl.READ,
+        )
+        return [record.data() for record in records]
+
+    async def execute_write_query(self, query, parameters=None):
+        records, _, _ = self.driver.execute_query(
+            Query(query, timeout=self.timeout),
+            parameters or {},
+            routing_=RoutingControl.WRITE,
+        )
+        return [record.data() for record in records]
+
+
+def ci_id(layer, index):
+    return f"hub-bench-{layer}-{index}"
+
+
+def seed(driver, layers, width, fanout):
+    """Create the hub graph."""
+    print(f"Seeding hub graph: {layers} layers x {width} CIs, fanout {fanout}...")
+    cis = [{"id": HUB_ID, "name": HUB_ID, "criticality": "CRITICAL"}]
+    edges = []
+    previous = [HUB_ID]
+    for layer in range(1, layers + 1):
+        current = [ci_id(layer, index) for index in range(width)]
+        for node in current:
+            cis.append(
+                {
+                    "id": node,
+                    "name": node,
+                    "criticality": random.choice(["LOW", "MEDIUM", "HIGH"]),
+                }
+            )
+            for target in random.sample(previous, min(fanout, len(previous))):
+                edges.append({"id": f"{node}>{target}", "from": node, "to": target})
+        previous = current
+
+    with driver.session() as session:
+        session.run(
+            "UNWIND $rows AS row CREATE (ci:CI) SET ci = row", rows=cis
+        ).consume()
+        for start in range(0, len(edges), 5_000):
+            session.run(
+                """
+                UNWIND $rows AS row
+                MATCH (a:CI {id: row.from}), (b:CI {id: row.to})
+                CREATE (a)-[:RELATED {id: row.id, type: 'DEPENDS_ON'}]->(b)
+                """,
+                rows=edges[start : start + 5_000],
+            ).consume()
+
+
+def cleanup(driver):
+    """Delete the hub graph."""
+    with driver.session() as session:
+        session.run(
+            "MATCH (ci:CI) WHERE ci.id STARTS WITH 'hub-bench-' DETACH DELETE ci"
+        ).consume()
+
+
+async def run_analysis(service, depth, traversal, samples):
+    """Return the median latency in ms and the last analysis, or None on failure."""
+    durations = []
+    analysis = None
+    for _ in range(samples):
+        start = time.perf_counter()
+        try:
+            analysis = await service.get_impact_analysis(HUB_ID, depth, traversal)
+        except Exception as e:
+            print(f"  depth {depth} {traversal}: failed ({type(e).__name__})")
+            return None, None
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations), analysis
+
+
+async def measure(service, samples):
+    for depth in range(3, 6):
+        for traversal in ("paths", "distinct"):
+            latency, analysis = await run_analysis(service, depth, traversal, samples)
+            if analysis is None:
+                continue
+            distinct = len({ci["ci_id"] for ci in analysis["impacted_cis"]})
+            print(
+                f"  depth {depth} {traversal:<8} {latency:10.1f} ms  "
+                f"rows={analysis['total_impacted']:>8}  distinct CIs={distinct:>6}  "
+                f"risk score={analysis['risk_score']:>10.0f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--uri", default="bolt://localhost:7687")
+    parser.add_argument("--username", default="neo4j")
+    parser.add_argument("--password", default="constellation123")
+    parser.add_argument("--layers", type=int, default=5)
+    parser.add_argument("--width", type=int, default=200)
+    parser.add_argument("--fanout", type=int, default=5)
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument(
+        "--timeout", type=float, default=120.0, help="Per-query timeout in seconds"
+    )
+    parser.add_argument(
+        "--skip-seed", action="store_true", help="Reuse a previously seeded graph"
+    )
+    parser.add_argument(
+        "--cleanup", action="store_true", help="Delete the hub graph afterwards"
+    )
+    args = parser.parse_args()
+
+    driver = GraphDatabase.driver(args.uri, auth=(args.username, args.password))
+    try:
+        if not args.skip_seed:
+            seed(driver, args.layers, args.width, args.fanout)
+
+        service = RelationshipService()
+        service.connection = DriverConnection(driver, args.timeout)
+        print(f"Impact analysis from {HUB_ID}, median of {args.samples} runs:")
+        asyncio.run(measure(service, args.samples))
+
+        if args.cleanup:
+            cleanup(driver)
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
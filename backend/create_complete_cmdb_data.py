@@ -578,26 +578,40 @@ def create_asset(asset_type, template, name):
         return None
 
 
-def create_relationship(source_id, target_id, relationship_type):
-    """Crée une relation entre deux assets"""
-    relationship_data = {
+def relationship_edge(source_id, target_id, relationship_type):
+    """Construit une relation entre deux assets pour l'import en masse"""
+    return {
         "from_ci_id": source_id,
         "to_ci_id": target_id,
         "relationship_type": relationship_type,
         "description": f"Relation {relationship_type} créée automatiquement",
     }
 
+
+def create_relationships_bulk(edges):
+    """Crée toutes les relations en une seule requête d'import en masse"""
     try:
-        response = requests.post(f"{BASE_URL}/relationships", json=relationship_data)
-        if response.status_code == 201:
-            print(f"🔗 Relation créée: {source_id} -> {target_id} ({relationship_type})")
-            return True
-        else:
-            print(f"❌ Erreur relation: {response.status_code} - {response.text}")
-            return False
+        response = requests.post(
+            f"{BASE_URL}/relationships/bulk", json={"relationships": edges}
+        )
+        if response.status_code != 200:
+            print(f"❌ Erreur relations: {response.status_code} - {response.text}")
+            return 0
+
+        result = response.json()
+        for item in result["results"]:
+            edge = edges[item["index"]]
+            if item["status"] == "created":
+                print(
+                    f"🔗 Relation créée: {edge['from_ci_id']} -> {edge['to_ci_id']} "
+                    f"({edge['relationship_type']})"
+                )
+            else:
+                print(f"❌ Erreur relation: {item['error']}")
+        return result["created"]
     except Exception as e:
-        print(f"❌ Exception relation: {e}")
-        return False
+        print(f"❌ Exception relations: {e}")
+        return 0
 
 
 def create_smart_relationships(created_assets):
@@ -611,7 +625,7 @@ def create_smart_relationships(created_assets):
             assets_by_type[asset_type] = []
         assets_by_type[asset_type].append(asset_id)
 
-    relations_created = 0
+    edges = []
 
     # Relations logiques prédéfinies
     logical_relations = [
@@ -649,31 +663,27 @@ def create_smart_relationships(created_assets):
             # Créer quelques relations de ce type
             num_relations = min(3, len(source_assets), len(target_assets))
             for _ in range(num_relations):
-                if relations_created >= TOTAL_RELATIONS:
+                if len(edges) >= TOTAL_RELATIONS:
                     break
 
                 source_id = random.choice(source_assets)
                 target_id = random.choice(target_assets)
 
                 if source_id != target_id:
-                    if create_relationship(source_id, target_id, rel_type):
-                        relations_created += 1
-                        time.sleep(0.1)  # Petit délai pour éviter la surcharge
+                    edges.append(relationship_edge(source_id, target_id, rel_type))
 
     # Compléter avec des relations aléatoires
     all_assets = [asset_id for asset_id, _ in created_assets]
-    while relations_created < TOTAL_RELATIONS and len(all_assets) >= 2:
+    while len(edges) < TOTAL_RELATIONS and len(all_assets) >= 2:
         source_id = random.choice(all_assets)
         target_id = random.choice(all_assets)
 
         if source_id != target_id:
             rel_type = random.choice(RELATIONSHIP_TYPES)
-            if create_relationship(source_id, target_id, rel_type):
-                relations_created += 1
-                time.sleep(0.1)
+            edges.append(relationship_edge(source_id, target_id, rel_type))
 
-            if relations_created >= TOTAL_RELATIONS:
-                break
+    # Toutes les relations sont créées en une seule requête, sans délai
+    relations_created = create_relationships_bulk(edges)
 
     print(f"🎉 {relations_created} relations créées avec succès!")
 
@@ -2,10 +2,91 @@
 Test configuration for Constellation backend.
 """
 
-import pytest
 from datetime import datetime
 from uuid import uuid4
 
+import pytest
+
+from app.services import queries
+from app.services.ci_service import CIService
+from app.services.relationship_service import RelationshipService
+
+
+class FakeConnection:
+    """
+    Neo4j connection stand-in recording every statement sent to it.
+
+    Statements are answered with the first ``limit`` canned ``rows``, or all
+    of them without a limit. With ``total_count``, the count store and counted
+    CI listings answer with it. ``explain`` returns a plan estimating
+    ``estimated_rows``. Test modules override ``answer`` to answer from other
+    data.
+    """
+
+    def __init__(self, rows=(), total_count=None, estimated_rows=0.0):
+        self.rows = list(rows)
+        self.total_count = total_count
+        self.estimated_rows = estimated_rows
+        self.calls = []
+        self.explained = []
+
+    def answer(self, query, parameters):
+        parameters = parameters or {}
+        if self.total_count is not None:
+            if query == queries.COUNT_CIS:
+                return [{"total_count": self.total_count}]
+            if "total_count" in query:
+                nodes = [row["ci"] for row in self.rows[: parameters["limit"]]]
+                return [{"cis": nodes, "total_count": self.total_count}]
+        return self.rows[: parameters.get("limit")]
+
+    async def execute_query(self, query, parameters=None):
+        self.calls.append((query, parameters))
+        return self.answer(query, parameters)
+
+    async def execute_write_query(self, query, parameters=None):
+        self.calls.append((query, parameters))
+        return self.answer(query, parameters)
+
+    async def stream_query(self, query, parameters=None, batch_size=None):
+        self.calls.append((query, parameters))
+        records = self.answer(query, parameters)
+        if records:
+            yield records
+
+    async def explain(self, query, parameters=None, access_mode="READ"):
+        self.explained.append((query, parameters, access_mode))
+        return {
+            "operatorType": "ProduceResults",
+            "args": {"EstimatedRows": self.estimated_rows},
+        }
+
+    @property
+    def statements(self):
+        return [query for query, _ in self.calls]
+
+
+@pytest.fixture
+def connection():
+    """Connection answering no records; override to answer canned data."""
+    return FakeConnection()
+
+
+@pytest.fixture
+def ci_service(connection):
+    """CI service querying the ``connection`` fixture."""
+    service = CIService()
+    service.connection = connection
+    return service
+
+
+@pytest.fixture
+def relationship_service(connection):
+    """Relationship service querying the ``connection`` fixture."""
+    service = RelationshipService()
+    service.connection = connection
+    return service
+
 
 @pytest.fixture
 def sample_ci_data():
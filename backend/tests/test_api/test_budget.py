@@ -0,0 +1,77 @@
+"""
+Tests for per-endpoint query budgets.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.budget import endpoint_timeout, run_with_budget
+from app.database import QueryTimeoutError, _query_timeout
+
+
+class FakeRequest:
+    """Request stub reporting a configurable disconnect state."""
+
+    def __init__(self, disconnected=False):
+        self.disconnected = disconnected
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+class TestRunWithBudget:
+    """Test run_with_budget."""
+
+    @pytest.mark.asyncio
+    async def test_applies_endpoint_timeout(self):
+        """Test that queries in the task see the endpoint's timeout."""
+
+        async def work():
+            return _query_timeout.get()
+
+        result = await run_with_budget(FakeRequest(), "impact", work())
+
+        assert result == endpoint_timeout("impact")
+        assert _query_timeout.get() is None
+
+    @pytest.mark.asyncio
+    async def test_timeout_becomes_structured_504(self):
+        """Test that a query timeout is reported with partial progress."""
+
+        async def work():
+            raise QueryTimeoutError(timeout=1.0, elapsed=1.2, rows_received=42)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await run_with_budget(FakeRequest(), "impact", work())
+
+        assert exc_info.value.status_code == 504
+        detail = exc_info.value.detail
+        assert detail["error"] == "query_timeout"
+        assert detail["operation"] == "impact"
+        assert detail["partial_progress"]["rows_received"] == 42
+
+    @pytest.mark.asyncio
+    async def test_client_disconnect_cancels_query(self, monkeypatch):
+        """Test that the running query is cancelled when the client leaves."""
+        monkeypatch.setattr(
+            "app.api.budget.get_settings",
+            lambda: type(
+                "S", (), {"disconnect_poll_interval": 0.01, "neo4j_query_timeout": 1}
+            )(),
+        )
+        cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(HTTPException) as exc_info:
+            await run_with_budget(FakeRequest(disconnected=True), "impact", work())
+
+        assert exc_info.value.status_code == 499
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
@@ -0,0 +1,50 @@
+"""
+Tests for the CI endpoints.
+"""
+
+import pytest
+
+from app.api import ci_endpoints
+from tests.factories import create_ci
+
+
+class RecordingCIService:
+    def __init__(self):
+        self.calls = []
+
+    async def create_ci(self, ci_data):
+        self.calls.append("create_ci")
+        return create_ci(name=ci_data["name"])
+
+    async def create_ci_with_relationships(self, ci_data, relationships):
+        self.calls.append("create_ci_with_relationships")
+        return {"ci": create_ci(name=ci_data["name"])}
+
+
+class TestCICreation:
+    """Test the write path of POST /cis/."""
+
+    @pytest.mark.asyncio
+    async def test_without_relationships_uses_create_ci(self):
+        service = RecordingCIService()
+
+        ci = await ci_endpoints.create_ci(
+            ci_endpoints.CICreateRequest(name="app"), ci_service=service
+        )
+
+        assert ci.name == "app"
+        assert service.calls == ["create_ci"]
+
+    @pytest.mark.asyncio
+    async def test_relationships_are_created_in_one_transaction(self):
+        service = RecordingCIService()
+
+        await ci_endpoints.create_ci(
+            ci_endpoints.CICreateRequest(
+                name="app",
+                relationships=[{"target_ci_id": "db-1", "relationship_type": "USES"}],
+            ),
+            ci_service=service,
+        )
+
+        assert service.calls == ["create_ci_with_relationships"]
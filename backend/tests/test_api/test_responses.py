@@ -0,0 +1,104 @@
+"""
+Tests for orjson-rendered responses.
+"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+
+from app.api import ci_endpoints, impact_endpoints
+from app.api.responses import FastJSONResponse
+from app.database import QueryTimeoutError
+from app.models.ci import CISummary
+from tests.factories import create_ci
+from tests.test_api.test_budget import FakeRequest
+
+
+def response_field(router, path):
+    for route in router.routes:
+        if route.path == path and "GET" in route.methods:
+            return route.response_field
+    raise LookupError(path)
+
+
+class TestFastJSONResponse:
+    """Test FastJSONResponse rendering."""
+
+    def test_datetimes_match_pydantic(self):
+        moment = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+        body = FastJSONResponse({"at": moment}).body
+
+        assert json.loads(body) == {"at": "2024-05-01T12:00:00Z"}
+
+    def test_models_are_dumped(self):
+        summary = CISummary(id="ci-1", name="db", vendor="Oracle")
+
+        body = FastJSONResponse([summary]).body
+
+        assert json.loads(body) == [{"id": "ci-1", "name": "db", "vendor": "Oracle"}]
+
+    @pytest.mark.asyncio
+    async def test_ci_page_matches_default_rendering(self):
+        cis = [create_ci(name="web"), create_ci(name="db", custom_attributes={"a": 1})]
+        content = {
+            "cis": cis,
+            "total_count": 2,
+            "limit": 2,
+            "offset": 0,
+            "next_cursor": None,
+        }
+
+        default = await serialize_response(
+            field=response_field(ci_endpoints.router, "/cis/"),
+            response_content=ci_endpoints.CIListResponse(**content),
+            is_coroutine=True,
+        )
+
+        assert json.loads(FastJSONResponse(content).body) == jsonable_encoder(default)
+
+
+class FakeRelationshipService:
+    async def get_all_relationships(self, limit, offset, cursor):
+        return [{"id": "r1", "type": "DEPENDS_ON"}], "next-page"
+
+
+class SlowRelationshipService:
+    async def get_all_relationships(self, limit, offset, cursor):
+        raise QueryTimeoutError(timeout=10.0, elapsed=10.1, rows_received=0)
+
+
+class TestRelationshipListing:
+    """Test the relationship listing response."""
+
+    @pytest.mark.asyncio
+    async def test_cursor_header(self):
+        response = await impact_endpoints.get_all_relationships(
+            request=FakeRequest(),
+            limit=1,
+            cursor=None,
+            offset=0,
+            relationship_service=FakeRelationshipService(),
+        )
+
+        assert isinstance(response, FastJSONResponse)
+        assert response.headers["X-Next-Cursor"] == "next-page"
+        assert json.loads(response.body) == [{"id": "r1", "type": "DEPENDS_ON"}]
+
+    @pytest.mark.asyncio
+    async def test_query_budget(self):
+        with pytest.raises(HTTPException) as exc_info:
+            await impact_endpoints.get_all_relationships(
+                request=FakeRequest(),
+                limit=1,
+                cursor=None,
+                offset=0,
+                relationship_service=SlowRelationshipService(),
+            )
+
+        assert exc_info.value.status_code == 504
+        assert exc_info.value.detail["operation"] == "list"
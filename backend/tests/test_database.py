@@ -0,0 +1,324 @@
+"""
+Tests for the Neo4j connection manager.
+"""
+
+import asyncio
+import time
+from collections.abc import Mapping
+
+import pytest
+from neo4j import AsyncGraphDatabase, GraphDatabase
+from neo4j._async.io import AsyncBolt
+from neo4j._sync.io import Bolt
+from neo4j.exceptions import ClientError
+from pydantic import ValidationError
+
+from app import database
+from app.config import Settings
+from app.database import EXECUTION_MODE_EXECUTOR, Neo4jConnection
+
+
+class FakeRecord:
+    """Minimal stand-in for a neo4j Record."""
+
+    def __init__(self, data):
+        self._data = data
+
+    def data(self):
+        return dict(self._data)
+
+
+class FakeSession:
+    """Synchronous session returning canned records."""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def run(self, query, parameters=None):
+        self._driver.queries.append((query, parameters))
+        time.sleep(self._driver.delay)
+        if query.startswith("RETURN 1"):
+            return [FakeRecord({"test": 1})]
+        return [FakeRecord({"value": (parameters or {}).get("value")})]
+
+    def begin_transaction(self, metadata=None, timeout=None):
+        self._driver.timeouts.append(timeout)
+        return FakeTransaction(self)
+
+    def close(self):
+        self._driver.closed_sessions += 1
+
+    def execute_read(self, work, *args):
+        self._driver.timeouts.append(getattr(work, "timeout", None))
+        self._driver.access_modes.append("READ")
+        return work(self, *args)
+
+    def execute_write(self, work, *args):
+        self._driver.timeouts.append(getattr(work, "timeout", None))
+        self._driver.access_modes.append("WRITE")
+        return work(self, *args)
+
+
+class FakeResult:
+    """Result supporting batched fetches."""
+
+    def __init__(self, records):
+        self._records = list(records)
+
+    def fetch(self, n):
+        batch, self._records = self._records[:n], self._records[n:]
+        return batch
+
+
+class FakeTransaction:
+    """Explicit transaction yielding a fixed number of rows."""
+
+    def __init__(self, session):
+        self._session = session
+
+    def run(self, query, parameters=None):
+        rows = (parameters or {}).get("rows", 0)
+        return FakeResult(FakeRecord({"value": i}) for i in range(rows))
+
+    def close(self):
+        self._session._driver.closed_transactions += 1
+
+
+class FakeDriver:
+    """Synchronous driver recording every query it runs."""
+
+    def __init__(self, delay=0.0):
+        self.queries = []
+        self.access_modes = []
+        self.closed_sessions = 0
+        self.timeouts = []
+        self.closed_transactions = 0
+        self.delay = delay
+        self.closed = False
+
+    def session(self, **kwargs):
+        return FakeSession(self)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_driver(monkeypatch):
+    """Patch the synchronous driver factory with a fake driver."""
+    driver = FakeDriver()
+    monkeypatch.setattr(
+        database.GraphDatabase, "driver", lambda *args, **kwargs: driver
+    )
+    return driver
+
+
+async def connect_executor(pool_size=2, queue_depth=0):
+    connection = Neo4jConnection()
+    connection.configure(
+        uri="bolt://localhost:7687",
+        username="neo4j",
+        password="secret",
+        execution_mode=EXECUTION_MODE_EXECUTOR,
+        executor_pool_size=pool_size,
+        executor_queue_depth=queue_depth,
+    )
+    await connection.connect()
+    return connection
+
+
+class TestRouting:
+    """Test cluster routing configuration."""
+
+    def test_routing_uris_replace_direct_uri(self):
+        """Test that the first routing URI is used to connect."""
+        connection = Neo4jConnection()
+        connection.configure(
+            "bolt://localhost:7687",
+            "neo4j",
+            "secret",
+            routing_uris=["neo4j://core1:7687", "neo4j://core2:7688"],
+        )
+
+        assert connection._uri == "neo4j://core1:7687"
+        assert [str(a) for a in connection._resolve_routers(None)] == [
+            "core1:7687",
+            "core2:7688",
+        ]
+
+    def test_routing_uris_require_neo4j_scheme(self):
+        """Test that bolt:// URIs are rejected as routing URIs."""
+        connection = Neo4jConnection()
+        with pytest.raises(ValueError):
+            connection.configure(
+                "bolt://localhost:7687",
+                "neo4j",
+                "secret",
+                routing_uris=["bolt://core1:7687"],
+            )
+
+
+class TestExecutorMode:
+    """Test the thread-pool execution mode."""
+
+    def test_configure_rejects_unknown_mode(self):
+        """Test that an unknown execution mode is rejected."""
+        connection = Neo4jConnection()
+        with pytest.raises(ValueError):
+            connection.configure("bolt://localhost:7687", "neo4j", "x", "threads")
+
+    def test_settings_require_a_worker_thread(self):
+        """Test that an empty thread pool is rejected, an empty queue is not."""
+        with pytest.raises(ValidationError):
+            Settings(neo4j_executor_pool_size=0)
+        with pytest.raises(ValidationError):
+            Settings(neo4j_executor_queue_depth=-1)
+
+        assert Settings(neo4j_executor_queue_depth=0).neo4j_executor_queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_queries_run_on_thread_pool(self, fake_driver):
+        """Test read and write queries in executor mode."""
+        connection = await connect_executor()
+
+        assert connection.is_connected
+        assert await connection.execute_query("MATCH (n) RETURN n", {"value": 1}) == [
+            {"value": 1}
+        ]
+        assert await connection.execute_write_query("CREATE (n)", {"value": 2}) == [
+            {"value": 2}
+        ]
+
+        # Connectivity check plus the two queries
+        assert connection.executor_stats.queries == 3
+        assert fake_driver.access_modes == ["READ", "READ", "WRITE"]
+        assert connection.executor_stats.in_flight == 0
+
+        await connection.disconnect()
+        assert fake_driver.closed
+        assert not connection.is_connected
+
+    @pytest.mark.asyncio
+    async def test_in_flight_queries_are_capped(self, fake_driver):
+        """Test that the semaphore reports admission waits under saturation."""
+        connection = await connect_executor(pool_size=1, queue_depth=0)
+        fake_driver.delay = 0.05
+
+        await asyncio.gather(
+            *(connection.execute_query("MATCH (n) RETURN n") for _ in range(3))
+        )
+
+        stats = connection.executor_stats.snapshot()
+        assert stats["queries"] == 4
+        assert stats["max_admission_wait_ms"] >= 50
+        await connection.disconnect()
+
+
+class TestMetrics:
+    """Test pool and query metrics collection."""
+
+    @pytest.mark.asyncio
+    async def test_queries_record_acquisition_and_duration(self, fake_driver):
+        """Test that every transaction records acquisition and query timings."""
+        connection = await connect_executor()
+
+        await connection.execute_query("MATCH (n) RETURN n")
+        await connection.execute_write_query("CREATE (n)")
+
+        metrics = connection.metrics.snapshot()
+        assert metrics["acquisition_wait_seconds"]["count"] == 3
+        assert metrics["query_duration_seconds"]["count"] == 3
+        assert metrics["acquisition_timeouts"] == 0
+        await connection.disconnect()
+
+    def test_pool_acquisition_timeout_is_counted(self):
+        """Test that the driver's pool acquisition timeout is recognised."""
+        connection = Neo4jConnection()
+        error = ClientError("failed to obtain a connection from the pool within 60.0s")
+
+        translated = connection._translate_error(error, None, time.perf_counter(), {})
+
+        assert translated is error
+        metrics = connection.metrics.snapshot()
+        assert metrics["acquisition_timeouts"] == 1
+        assert metrics["query_errors"] == 1
+        assert metrics["query_timeouts"] == 0
+
+    def test_pool_stats_without_driver(self):
+        """Test that pool stats degrade gracefully without a driver."""
+        connection = Neo4jConnection()
+        connection.configure(
+            "bolt://localhost:7687",
+            "neo4j",
+            "secret",
+            driver_options={"max_connection_pool_size": 10},
+        )
+
+        assert connection.pool_stats() == {
+            "max_pool_size": 10,
+            "in_use": 0,
+            "idle": 0,
+            "addresses": {},
+        }
+
+    @pytest.mark.asyncio
+    async def test_driver_pool_layout(self):
+        """
+        Test that the installed driver still has the private pool layout
+        pool_stats reads, so a driver upgrade changing it fails here instead
+        of silently reporting an empty pool.
+        """
+        async_driver = AsyncGraphDatabase.driver(
+            "bolt://localhost:7687", auth=("neo4j", "secret")
+        )
+        sync_driver = GraphDatabase.driver(
+            "bolt://localhost:7687", auth=("neo4j", "secret")
+        )
+        try:
+            for driver, bolt in ((async_driver, AsyncBolt), (sync_driver, Bolt)):
+                assert isinstance(driver._pool.connections, Mapping)
+                assert bolt.in_use is False
+        finally:
+            await async_driver.close()
+            sync_driver.close()
+
+
+class TestStreaming:
+    """Test batched result streaming."""
+
+    @pytest.mark.asyncio
+    async def test_stream_query_yields_batches(self, fake_driver):
+        """Test that records are streamed in batches of the requested size."""
+        connection = await connect_executor()
+
+        batches = [
+            batch
+            async for batch in connection.stream_query(
+                "MATCH (n) RETURN n", {"rows": 5}, batch_size=2
+            )
+        ]
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert batches[-1] == [{"value": 4}]
+        assert fake_driver.closed_transactions == 1
+        assert fake_driver.closed_sessions == 1
+        await connection.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_closing_stream_early_releases_session(self, fake_driver):
+        """Test that abandoning a stream closes its transaction and session."""
+        connection = await connect_executor()
+
+        stream = connection.stream_query("MATCH (n) RETURN n", {"rows": 10}, 3)
+        assert len(await stream.__anext__()) == 3
+        await stream.aclose()
+
+        assert fake_driver.closed_transactions == 1
+        assert fake_driver.closed_sessions == 1
+        await connection.disconnect()
@@ -5,7 +5,7 @@ Tests for CI (Configuration Item) models.
 import pytest
 from uuid import UUID
 
-from app.models.ci import CI, CIType
+from app.models.ci import CI, CISummary, CIType
 from app.models.base import CriticalityLevel, EnvironmentType
 from tests.factories import create_ci
 
@@ -196,3 +196,23 @@ class TestCI:
         assert hasattr(ci, "ci_type")
         assert hasattr(ci, "hostname")
         assert hasattr(ci, "custom_attributes")
+
+
+class TestCISummary:
+    """Test CISummary model."""
+
+    def test_only_set_fields_are_serialized(self):
+        """Test that fields that were not requested are left out."""
+        summary = CISummary(id="ci-1", name="db", ci_type=CIType.DATABASE, vendor=None)
+
+        assert summary.model_dump() == {
+            "id": "ci-1",
+            "name": "db",
+            "ci_type": "DATABASE",
+            "vendor": None,
+        }
+
+    def test_extra_fields_are_rejected(self):
+        """Test that a whole CI is not mistaken for a summary."""
+        with pytest.raises(ValueError):
+            CISummary(**create_ci(name="db").model_dump())
@@ -0,0 +1,202 @@
+"""
+Tests for bulk CI and relationship ingestion.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.api.impact_endpoints import RelationshipBulkCreateRequest
+from app.models.relationships import RelationshipType
+from app.services import queries
+from tests.conftest import FakeConnection
+
+
+class BulkConnection(FakeConnection):
+    """Connection stand-in recording bulk writes, optionally failing some chunks."""
+
+    def __init__(self, failing_chunks=()):
+        super().__init__()
+        self.failing_chunks = set(failing_chunks)
+
+    @property
+    def chunks(self):
+        return [parameters["rows"] for _, parameters in self.calls]
+
+    def answer(self, query, parameters):
+        assert query == queries.BULK_CREATE_CIS
+        if len(self.calls) - 1 in self.failing_chunks:
+            raise RuntimeError("constraint violated")
+        return [{"created_count": len(parameters["rows"])}]
+
+
+def make_items(count):
+    return [{"name": f"server-{i}", "ci_type": "HARDWARE"} for i in range(count)]
+
+
+class TestCreateCIs:
+    """Test CIService.create_cis."""
+
+    @pytest.mark.asyncio
+    async def test_writes_in_chunks(self, ci_service):
+        ci_service.connection = BulkConnection()
+
+        results = await ci_service.create_cis(make_items(5), chunk_size=2)
+
+        assert [len(chunk) for chunk in ci_service.connection.chunks] == [2, 2, 1]
+        assert [r["status"] for r in results] == ["created"] * 5
+        assert [r["index"] for r in results] == list(range(5))
+        assert all(r["id"] for r in results)
+
+    @pytest.mark.asyncio
+    async def test_rows_hold_neo4j_properties(self, ci_service):
+        ci_service.connection = BulkConnection()
+
+        await ci_service.create_cis(
+            [{"id": "ci-1", "name": "db", "custom_attributes": {"a": 1}}]
+        )
+
+        row = ci_service.connection.chunks[0][0]
+        assert row["id"] == "ci-1"
+        assert row["custom_attributes"] == '{"a": 1}'
+        assert None not in row.values()
+
+    @pytest.mark.asyncio
+    async def test_invalid_items_are_reported(self, ci_service):
+        ci_service.connection = BulkConnection()
+        items = make_items(2) + [{"ci_type": "NOT_A_TYPE"}]
+
+        results = await ci_service.create_cis(items)
+
+        assert [r["status"] for r in results] == ["created", "created", "invalid"]
+        assert results[2]["error"]
+        assert len(ci_service.connection.chunks[0]) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_does_not_abort_batch(self, ci_service):
+        ci_service.connection = BulkConnection(failing_chunks=[0])
+
+        results = await ci_service.create_cis(make_items(4), chunk_size=2)
+
+        assert [r["status"] for r in results] == [
+            "failed",
+            "failed",
+            "created",
+            "created",
+        ]
+        assert results[0]["error"] == "constraint violated"
+
+
+class RelationshipBulkConnection(BulkConnection):
+    """Connection stand-in resolving bulk edges against a set of known CIs."""
+
+    def __init__(self, known_ids, failing_chunks=()):
+        super().__init__(failing_chunks)
+        self.known_ids = set(known_ids)
+
+    def answer(self, query, parameters):
+        assert query == queries.BULK_CREATE_RELATIONSHIPS
+        if len(self.calls) - 1 in self.failing_chunks:
+            raise RuntimeError("deadlock")
+        return [
+            {
+                "index": row["index"],
+                "from_found": row["from_ci_id"] in self.known_ids,
+                "to_found": row["to_ci_id"] in self.known_ids,
+            }
+            for row in parameters["rows"]
+        ]
+
+
+def make_edges(pairs):
+    return [
+        {
+            "from_ci_id": source,
+            "to_ci_id": target,
+            "relationship_type": RelationshipType.DEPENDS_ON,
+            "properties": {"description": "test", "port": None},
+        }
+        for source, target in pairs
+    ]
+
+
+class TestCreateRelationships:
+    """Test RelationshipService.create_relationships."""
+
+    @pytest.mark.asyncio
+    async def test_writes_in_chunks(self, relationship_service):
+        connection = RelationshipBulkConnection({"a", "b", "c"})
+        relationship_service.connection = connection
+
+        results = await relationship_service.create_relationships(
+            make_edges([("a", "b"), ("b", "c"), ("c", "a")]), chunk_size=2
+        )
+
+        assert [len(chunk) for chunk in connection.chunks] == [2, 1]
+        assert [r["status"] for r in results] == ["created"] * 3
+        row = connection.chunks[0][0]
+        assert row["type"] == "DEPENDS_ON"
+        assert row["properties"] == {"description": "test"}
+
+    @pytest.mark.asyncio
+    async def test_missing_endpoints_are_reported(self, relationship_service):
+        relationship_service.connection = RelationshipBulkConnection({"a", "b"})
+
+        results = await relationship_service.create_relationships(
+            make_edges([("a", "b"), ("a", "x"), ("y", "z")])
+        )
+
+        assert [r["status"] for r in results] == [
+            "created",
+            "missing_endpoints",
+            "missing_endpoints",
+        ]
+        assert results[1]["missing"] == ["to_ci_id"]
+        assert results[1]["error"] == "CI not found: x"
+        assert results[2]["missing"] == ["from_ci_id", "to_ci_id"]
+        assert results[2]["id"] is None
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_does_not_abort_batch(self, relationship_service):
+        relationship_service.connection = RelationshipBulkConnection(
+            {"a", "b"}, failing_chunks=[0]
+        )
+
+        results = await relationship_service.create_relationships(
+            make_edges([("a", "b"), ("b", "a")]), chunk_size=1
+        )
+
+        assert [r["status"] for r in results] == ["failed", "created"]
+        assert results[0]["error"] == "deadlock"
+
+
+class TestRelationshipBulkRequest:
+    """Test the validation of bulk relationship requests."""
+
+    def test_primitive_properties_are_accepted(self):
+        request = RelationshipBulkCreateRequest(
+            relationships=make_edges([("a", "b")])
+            + [
+                {
+                    "from_ci_id": "a",
+                    "to_ci_id": "c",
+                    "relationship_type": "USES",
+                    "properties": {"ports": [80, 443], "tls": True, "weight": 0.5},
+                }
+            ]
+        )
+
+        assert request.relationships[1].properties["ports"] == [80, 443]
+
+    @pytest.mark.parametrize(
+        "value", [{"nested": 1}, [{"port": 80}], [80, "443"], [1, None]]
+    )
+    def test_unstorable_property_is_rejected(self, value):
+        edges = make_edges([("a", "b"), ("b", "c")])
+        edges[1]["properties"] = {"ports": value}
+
+        with pytest.raises(ValidationError) as exc_info:
+            RelationshipBulkCreateRequest(relationships=edges)
+
+        [error] = exc_info.value.errors()
+        assert error["loc"] == ("relationships", 1, "properties")
+        assert "ports" in error["msg"]
@@ -0,0 +1,216 @@
+"""
+Tests for the CI service write paths.
+"""
+
+import pytest
+
+from app.models.relationships import RelationshipType
+from app.services import queries
+from tests.conftest import FakeConnection
+
+
+class CreateConnection(FakeConnection):
+    """Connection stand-in resolving relationship targets against known CIs."""
+
+    def __init__(self, known_ids=()):
+        super().__init__()
+        self.known_ids = set(known_ids)
+
+    def answer(self, query, parameters):
+        outcomes = [
+            {"index": rel["index"], "created": rel["target_ci_id"] in self.known_ids}
+            for rel in parameters["relationships"]
+        ]
+        return [{"ci": parameters["properties"], "outcomes": outcomes}]
+
+
+class TestCreateCIWithRelationships:
+    """Test CIService.create_ci_with_relationships."""
+
+    @pytest.mark.asyncio
+    async def test_single_statement(self, ci_service):
+        ci_service.connection = CreateConnection({"db-1", "srv-1"})
+
+        result = await ci_service.create_ci_with_relationships(
+            {"name": "app"},
+            [
+                {
+                    "target_ci_id": "db-1",
+                    "relationship_type": RelationshipType.USES,
+                    "description": "reads orders",
+                },
+                {"target_ci_id": "srv-1", "relationship_type": "RUNS_ON"},
+            ],
+        )
+
+        assert len(ci_service.connection.calls) == 1
+        query, parameters = ci_service.connection.calls[0]
+        assert query == queries.CREATE_CI_WITH_RELATIONSHIPS
+        assert parameters["properties"]["name"] == "app"
+        rels = parameters["relationships"]
+        assert [rel["type"] for rel in rels] == ["USES", "RUNS_ON"]
+        assert rels[0]["properties"] == {"description": "reads orders"}
+        assert rels[1]["properties"] == {}
+
+        assert result["ci"].name == "app"
+        assert result["created_relationships"] == [
+            {
+                "target_ci_id": "db-1",
+                "relationship_type": "USES",
+                "description": "reads orders",
+            },
+            {
+                "target_ci_id": "srv-1",
+                "relationship_type": "RUNS_ON",
+                "description": None,
+            },
+        ]
+        assert result["failed_relationships"] == []
+
+    @pytest.mark.asyncio
+    async def test_missing_targets_are_reported(self, ci_service):
+        ci_service.connection = CreateConnection({"db-1"})
+
+        result = await ci_service.create_ci_with_relationships(
+            {"name": "app"},
+            [
+                {"target_ci_id": "db-1", "relationship_type": "USES"},
+                {"target_ci_id": "gone", "relationship_type": "RUNS_ON"},
+            ],
+        )
+
+        assert [r["target_ci_id"] for r in result["created_relationships"]] == ["db-1"]
+        assert result["failed_relationships"] == [
+            {
+                "target_ci_id": "gone",
+                "relationship_type": "RUNS_ON",
+                "error": "Target CI not found: gone",
+            }
+        ]
+
+    @pytest.mark.asyncio
+    async def test_without_relationships(self, ci_service):
+        ci_service.connection = CreateConnection()
+
+        result = await ci_service.create_ci_with_relationships({"name": "app"}, [])
+
+        _, parameters = ci_service.connection.calls[0]
+        assert parameters["relationships"] == []
+        assert result["created_relationships"] == []
+        assert result["failed_relationships"] == []
+
+    @pytest.mark.asyncio
+    async def test_failure_is_raised(self, ci_service):
+        class FailingConnection(FakeConnection):
+            def answer(self, query, parameters):
+                raise RuntimeError("transaction rolled back")
+
+        ci_service.connection = FailingConnection()
+
+        with pytest.raises(RuntimeError):
+            await ci_service.create_ci_with_relationships(
+                {"name": "app"},
+                [{"target_ci_id": "db-1", "relationship_type": "USES"}],
+            )
+
+
+class LookupConnection(FakeConnection):
+    """Connection stand-in resolving id lookups against a dict of CI nodes."""
+
+    def __init__(self, nodes):
+        super().__init__()
+        self.nodes = nodes
+
+    def answer(self, query, parameters):
+        # The database returns matches in no particular order
+        return [
+            {"ci": self.nodes[ci_id]}
+            for ci_id in sorted(parameters["ids"])
+            if ci_id in self.nodes
+        ]
+
+
+class TestGetCIs:
+    """Test CIService.get_cis."""
+
+    @pytest.mark.asyncio
+    async def test_single_query_in_input_order(self, ci_service):
+        ci_service.connection = LookupConnection(
+            {ci_id: {"id": ci_id, "name": ci_id} for ci_id in ("a", "b", "c")}
+        )
+
+        cis, missing = await ci_service.get_cis(["c", "x", "a", "c"])
+
+        assert ci_service.connection.calls == [
+            (queries.GET_CIS, {"ids": ["c", "x", "a"]})
+        ]
+        assert [ci.id for ci in cis] == ["c", "a"]
+        assert missing == ["x"]
+
+    @pytest.mark.asyncio
+    async def test_empty_ids(self, ci_service):
+        ci_service.connection = LookupConnection({})
+
+        assert await ci_service.get_cis([]) == ([], [])
+        assert ci_service.connection.calls == []
+
+
+class UpdateConnection(FakeConnection):
+    """Connection stand-in applying SET += to a single stored node."""
+
+    def __init__(self, node):
+        super().__init__()
+        self.node = node
+
+    def answer(self, query, parameters):
+        for key, value in parameters["properties"].items():
+            if value is None:
+                self.node.pop(key, None)
+            else:
+                self.node[key] = value
+        return [{"ci": dict(self.node)}]
+
+
+class TestUpdateCI:
+    """Test CIService.update_ci."""
+
+    @pytest.mark.asyncio
+    async def test_cleared_fields_are_removed(self, ci_service):
+        ci_service.connection = UpdateConnection(
+            {
+                "id": "app",
+                "name": "app",
+                "description": "old",
+                "compliance_tags": ["pci"],
+                "custom_attributes": '{"team": "core"}',
+            }
+        )
+
+        ci = await ci_service.update_ci(
+            "app",
+            {"description": None, "compliance_tags": [], "custom_attributes": {}},
+        )
+
+        query, parameters = ci_service.connection.calls[0]
+        assert query == queries.UPDATE_CI
+        assert parameters["properties"] == {
+            "description": None,
+            "compliance_tags": None,
+            "custom_attributes": None,
+        }
+        assert ci_service.connection.node == {"id": "app", "name": "app"}
+        assert ci.description is None
+        assert ci.compliance_tags == []
+
+    @pytest.mark.asyncio
+    async def test_values_are_converted(self, ci_service):
+        ci_service.connection = UpdateConnection({"id": "app", "name": "app"})
+
+        await ci_service.update_ci(
+            "app", {"id": "other", "name": "api", "custom_attributes": {"a": 1}}
+        )
+
+        assert ci_service.connection.calls[0][1] == {
+            "ci_id": "app",
+            "properties": {"name": "api", "custom_attributes": '{"a": 1}'},
+        }
@@ -0,0 +1,169 @@
+"""
+Tests for CI facet counts and their graph-version cache.
+"""
+
+import importlib
+
+import pytest
+
+from app.config import Settings
+from app.models.ci import CIType
+from app.services import queries
+from app.services.graph_version import GraphVersion, graph_version
+from tests.conftest import FakeConnection
+
+
+class FacetConnection(FakeConnection):
+    """Connection stand-in counting facets over a list of CI property maps."""
+
+    def __init__(self, cis):
+        super().__init__()
+        self.cis = cis
+
+    def answer(self, query, parameters):
+        matching = [
+            ci
+            for ci in self.cis
+            if all(
+                ci.get(name) == parameters[name]
+                for name in queries.CI_LIST_FILTERS
+                if name in parameters
+            )
+        ]
+        counts = {}
+        for facet in parameters["facets"]:
+            for ci in matching:
+                key = (facet, ci.get(facet))
+                counts[key] = counts.get(key, 0) + 1
+        return [
+            {"facet": facet, "value": value, "count": count}
+            for (facet, value), count in counts.items()
+        ]
+
+
+CIS = [
+    {"ci_type": "DATABASE", "environment": "PRODUCTION", "vendor": "Oracle"},
+    {"ci_type": "DATABASE", "environment": "STAGING", "vendor": "Oracle"},
+    {"ci_type": "SERVICE", "environment": "PRODUCTION"},
+]
+
+
+@pytest.fixture
+def connection():
+    return FacetConnection(CIS)
+
+
+class TestGraphVersion:
+    """Test the graph version counter."""
+
+    def test_bump_increments(self):
+        version = GraphVersion()
+
+        assert version.value == 0
+        assert version.bump() == 1
+        assert version.value == 1
+
+
+class TestCIFacets:
+    """Test CIService.get_ci_facets."""
+
+    @pytest.mark.asyncio
+    async def test_all_facets_in_one_query(self, ci_service):
+        result = await ci_service.get_ci_facets()
+
+        assert len(ci_service.connection.calls) == 1
+        query, parameters = ci_service.connection.calls[0]
+        assert query == queries.facet_cis_query([])
+        assert parameters["facets"] == list(queries.CI_FACETS)
+        assert result["total_count"] == 3
+        assert result["facets"]["ci_type"] == [
+            {"value": "DATABASE", "count": 2},
+            {"value": "SERVICE", "count": 1},
+        ]
+        assert result["facets"]["vendor"] == [
+            {"value": "Oracle", "count": 2},
+            {"value": None, "count": 1},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_filters_select_query(self, ci_service):
+        result = await ci_service.get_ci_facets(
+            facets=["environment"], ci_type=CIType.DATABASE
+        )
+
+        query, parameters = ci_service.connection.calls[0]
+        assert query == queries.facet_cis_query(["ci_type"])
+        assert parameters == {"ci_type": "DATABASE", "facets": ["environment"]}
+        assert list(result["facets"]) == ["environment"]
+        assert result["total_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_no_matching_cis(self, ci_service):
+        ci_service.connection = FacetConnection([])
+
+        result = await ci_service.get_ci_facets(facets=["vendor", "location"])
+
+        assert result["facets"] == {"vendor": [], "location": []}
+        assert result["total_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_facet(self, ci_service):
+        with pytest.raises(ValueError):
+            await ci_service.get_ci_facets(facets=["hostname"])
+
+    @pytest.mark.asyncio
+    async def test_cached_until_graph_changes(self, ci_service):
+        first = await ci_service.get_ci_facets()
+        second = await ci_service.get_ci_facets()
+
+        assert second is first
+        assert len(ci_service.connection.calls) == 1
+
+        graph_version.bump()
+        third = await ci_service.get_ci_facets()
+
+        assert len(ci_service.connection.calls) == 2
+        assert third["graph_version"] == first["graph_version"] + 1
+
+    @pytest.mark.asyncio
+    async def test_cache_expires_after_ttl(self, ci_service, monkeypatch):
+        module = importlib.import_module("app.services.impact_cache")
+        now = [1000.0]
+        monkeypatch.setattr(module, "monotonic", lambda: now[0])
+        await ci_service.get_ci_facets()
+
+        # A write made directly against Neo4j leaves the graph version alone
+        now[0] += 31.0
+        await ci_service.get_ci_facets()
+
+        assert len(ci_service.connection.calls) == 2
+        assert ci_service._facet_cache.stats()["expirations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_is_evicted(self, ci_service, monkeypatch):
+        module = importlib.import_module("app.services.impact_cache")
+        monkeypatch.setattr(
+            module, "get_settings", lambda: Settings(facet_cache_size=2)
+        )
+        await ci_service.get_ci_facets(facets=["vendor"])
+        await ci_service.get_ci_facets(facets=["location"])
+        await ci_service.get_ci_facets(facets=["vendor"])
+
+        await ci_service.get_ci_facets(facets=["ci_type"])
+        await ci_service.get_ci_facets(facets=["vendor"])
+
+        stats = ci_service._facet_cache.stats()
+        assert (stats["entries"], stats["evictions"], stats["hits"]) == (2, 1, 2)
+
+    @pytest.mark.asyncio
+    async def test_writes_bump_graph_version(self, ci_service):
+        class WriteConnection(FakeConnection):
+            def answer(self, query, parameters):
+                return [{"ci": parameters["properties"]}]
+
+        ci_service.connection = WriteConnection()
+        before = graph_version.value
+
+        await ci_service.create_ci({"name": "app"})
+
+        assert graph_version.value == before + 1
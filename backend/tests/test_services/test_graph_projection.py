@@ -0,0 +1,422 @@
+"""
+Tests for the in-memory dependency graph projection.
+"""
+
+import asyncio
+import importlib
+import random
+import time
+
+import pytest
+
+from app.config import Settings
+from app.services import queries
+from app.services.graph_projection import GraphProjection, SnapshotBuilder
+from app.services.graph_version import graph_version
+from tests.conftest import FakeConnection
+from tests.test_services.test_traversal import DIAMOND, GraphConnection
+
+
+def build(edges, cis=None):
+    builder = SnapshotBuilder()
+    names = cis or sorted({ci for edge in edges for ci in edge[:2]})
+    for ci_id in names:
+        builder.add_ci(ci_id, ci_id.upper(), "MEDIUM")
+    for from_ci_id, to_ci_id, rel_type in edges:
+        builder.add_edge(from_ci_id, to_ci_id, rel_type)
+    return builder.build()
+
+
+def distances(snapshot, source, max_depth, impact=True):
+    levels = snapshot.traverse([source], max_depth, impact)
+    return {
+        snapshot.ids[node]: distance
+        for distance, (nodes, _, _) in enumerate(levels, start=1)
+        for node in nodes
+    }
+
+
+class ProjectionConnection(FakeConnection):
+    """Connection stand-in streaming a graph and answering consistency checks."""
+
+    def __init__(self, cis, edges):
+        super().__init__()
+        self.cis = cis
+        self.edges = edges
+
+    def answer(self, query, parameters):
+        if query == queries.PROJECTION_CIS:
+            return [
+                {"ci_id": ci_id, "ci_name": ci_id.upper(), "criticality": "HIGH"}
+                for ci_id in self.cis
+            ]
+        if query == queries.PROJECTION_RELATIONSHIPS:
+            return [
+                {"from_ci_id": source, "to_ci_id": target, "rel_type": rel_type}
+                for source, target, rel_type in self.edges
+            ]
+        if query == queries.PROJECTION_COUNTS:
+            counts = {}
+            for _, _, rel_type in self.edges:
+                counts[rel_type] = counts.get(rel_type, 0) + 1
+            return [{"ci_count": len(self.cis), "edge_counts": list(counts.items())}]
+        return [
+            {
+                "ci_id": ci_id,
+                "edges": [
+                    [target, rel_type]
+                    for source, target, rel_type in self.edges
+                    if source == ci_id
+                ],
+            }
+            for ci_id in parameters["ids"]
+            if ci_id in self.cis
+        ]
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    module = importlib.import_module("app.services.graph_projection")
+    monkeypatch.setattr(
+        module,
+        "get_settings",
+        lambda: Settings(graph_projection_enabled=True, graph_projection_max_delta=3),
+    )
+
+
+@pytest.fixture
+def projection(enabled):
+    projection = GraphProjection()
+    projection.connection = ProjectionConnection(
+        ["hub", "a", "b", "c", "d", "e"], DIAMOND
+    )
+    projection.snapshot = build(DIAMOND)
+    projection.version = graph_version.value
+    return projection
+
+
+class TestSnapshot:
+    """Test the CSR snapshot and its breadth-first search."""
+
+    def test_impact_at_minimal_distance(self):
+        snapshot = build(DIAMOND)
+
+        assert distances(snapshot, "hub", 5) == {
+            "a": 1,
+            "b": 1,
+            "c": 1,
+            "d": 2,
+            "e": 3,
+        }
+
+    def test_dependencies_follow_outgoing_edges(self):
+        snapshot = build(DIAMOND)
+
+        assert distances(snapshot, "d", 2, impact=False) == {
+            "a": 1,
+            "b": 1,
+            "c": 1,
+            "hub": 2,
+        }
+
+    def test_only_dependency_types_are_projected(self):
+        snapshot = build([("a", "b", "OWNS"), ("c", "b", "DEPENDS_ON")])
+
+        assert distances(snapshot, "b", 3) == {"c": 1}
+
+    def test_added_and_removed_edges(self):
+        snapshot = build(DIAMOND)
+
+        snapshot.remove_edge("e", "d", 3)
+        snapshot.add_edge("e", "a", 0)
+        snapshot.remove_edge("d", "a", 0)
+
+        assert distances(snapshot, "hub", 5) == {
+            "a": 1,
+            "b": 1,
+            "c": 1,
+            "d": 2,
+            "e": 2,
+        }
+        assert snapshot.out_edges("e") == [("a", "DEPENDS_ON")]
+
+    def test_removed_ci_is_not_traversed(self):
+        snapshot = build(DIAMOND)
+
+        snapshot.remove_ci("d")
+
+        assert distances(snapshot, "hub", 5) == {"a": 1, "b": 1, "c": 1}
+        assert snapshot.edge_counts()["USES"] == 0
+
+    def test_added_ci(self):
+        snapshot = build(DIAMOND)
+
+        snapshot.add_ci("f", "F", "LOW")
+        snapshot.add_edge("f", "e", 1)
+
+        assert distances(snapshot, "hub", 5)["f"] == 4
+
+    def test_compaction_keeps_the_graph(self):
+        snapshot = build(DIAMOND)
+        snapshot.add_ci("f", "F", "LOW")
+        snapshot.add_edge("f", "e", 1)
+        snapshot.remove_ci("b")
+        snapshot.remove_edge("d", "c", 0)
+
+        compacted = snapshot.compact()
+
+        assert compacted.delta == 0
+        assert not compacted.outgoing.added
+        assert compacted.edge_counts() == snapshot.edge_counts()
+        for ci_id in ("hub", "a", "c", "d", "e", "f"):
+            assert distances(compacted, ci_id, 5) == distances(snapshot, ci_id, 5)
+
+    @pytest.mark.asyncio
+    async def test_matches_cypher_traversal(self, relationship_service):
+        rng = random.Random(7)
+        cis = [f"ci-{index}" for index in range(60)]
+        edges = [
+            (rng.choice(cis), rng.choice(cis), rng.choice(["DEPENDS_ON", "USES"]))
+            for _ in range(150)
+        ]
+        snapshot = build(edges, cis)
+        relationship_service.connection = GraphConnection(edges)
+
+        for source in cis[:10]:
+            for impact in (True, False):
+                expected = {
+                    record["ci_id"]: record["distance"]
+                    for record in await relationship_service._traverse_distinct(
+                        source, 4, impact
+                    )
+                }
+                assert distances(snapshot, source, 4, impact) == expected
+
+    @pytest.mark.asyncio
+    async def test_reach_matches_cypher_batch_traversal(
+        self, enabled, relationship_service
+    ):
+        rng = random.Random(11)
+        cis = [f"ci-{index}" for index in range(60)]
+        edges = [
+            (rng.choice(cis), rng.choice(cis), rng.choice(["DEPENDS_ON", "USES"]))
+            for _ in range(150)
+        ]
+        projection = GraphProjection()
+        projection.snapshot = build(edges, cis)
+        projection.version = graph_version.value
+        relationship_service.connection = GraphConnection(edges)
+
+        for sources in (cis[:2], cis[10:15], cis[20:21]):
+            expected = {
+                record["ci_id"]: (record["distance"], record["sources"])
+                for record in await relationship_service._traverse_batch(sources, 4)
+            }
+            assert {
+                record["ci_id"]: (record["distance"], record["sources"])
+                for record in projection.reach(sources, 4)
+            } == expected
+
+    def test_reach_with_more_than_64_sources(self):
+        cis = [f"ci-{index:03d}" for index in range(100)]
+        snapshot = build(
+            [(ci_id, "hub", "DEPENDS_ON") for ci_id in cis]
+            + [("top", cis[-1], "USES")],
+            cis + ["hub", "top"],
+        )
+
+        levels, origins = snapshot.reach(cis + ["hub"], 2, impact=True)
+
+        top = snapshot.index["top"]
+        assert levels[0][0] == [top]
+        assert [snapshot.ids[node] for node in origins[top]] == ["ci-099", "hub"]
+
+
+class TestProjection:
+    """Test building, write hooks and freshness."""
+
+    @pytest.mark.asyncio
+    async def test_rebuild(self, enabled):
+        projection = GraphProjection()
+        projection.connection = ProjectionConnection(
+            ["hub", "a", "b", "c", "d", "e"], DIAMOND
+        )
+
+        await projection.rebuild()
+
+        assert projection.is_current
+        assert projection.stats()["cis"] == 6
+        assert projection.stats()["edges"] == len(DIAMOND)
+        assert projection.connection.statements == [
+            queries.PROJECTION_CIS,
+            queries.PROJECTION_RELATIONSHIPS,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_traverse_records(self, projection):
+        records = projection.traverse(["hub"], 5, impact=True)
+
+        by_id = {record["ci_id"]: record for record in records}
+        assert by_id["e"]["distance"] == 3
+        assert by_id["e"]["relationship_chain"] == ["DEPENDS_ON", "DEPENDS_ON", "USES"]
+        assert by_id["d"]["ci_name"] == "D"
+
+    @pytest.mark.asyncio
+    async def test_hooks_keep_projection_current(self, projection):
+        projection.add_ci(graph_version.bump(), "f", "F", "LOW")
+        version = graph_version.bump()
+        projection.add_relationship(version, "f", "e", "RUNS_ON")
+        projection.add_relationship(version, "f", "hub", "OWNS")
+
+        assert projection.is_current
+        assert {r["ci_id"] for r in projection.traverse(["e"], 1, True)} == {"hub", "f"}
+
+    @pytest.mark.asyncio
+    async def test_compacts_past_max_delta(self, projection):
+        for ci_id in ("a", "b", "c"):
+            projection.remove_relationship(
+                graph_version.bump(), "d", ci_id, "DEPENDS_ON"
+            )
+        await projection._compaction_task
+
+        assert projection.snapshot.delta == 0
+        assert projection.traverse(["hub"], 5, True)[-1]["ci_id"] == "c"
+
+    @pytest.mark.asyncio
+    async def test_compaction_does_not_block_requests(self, projection, monkeypatch):
+        module = importlib.import_module("app.services.graph_projection")
+        compacted = module._compacted
+
+        def slow_compacted(*inputs):
+            time.sleep(0.3)
+            return compacted(*inputs)
+
+        monkeypatch.setattr(module, "_compacted", slow_compacted)
+        for ci_id in ("a", "b", "c"):
+            projection.remove_relationship(
+                graph_version.bump(), "d", ci_id, "DEPENDS_ON"
+            )
+        compacting = projection.snapshot
+
+        # Other requests are served while the arrays are built
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        projection.add_ci(graph_version.bump(), "f", "F", "LOW")
+        projection.add_relationship(graph_version.bump(), "f", "hub", "USES")
+        records = projection.traverse(["hub"], 1, True)
+        assert time.perf_counter() - started < 0.2
+        assert projection.stats()["compacting"]
+        assert "f" in {record["ci_id"] for record in records}
+
+        await projection._compaction_task
+
+        assert projection.snapshot is not compacting
+        assert projection.is_current
+        # Changes made while compacting were replayed onto the new snapshot
+        assert projection.snapshot.out_edges("f") == [("hub", "USES")]
+        assert projection.snapshot.out_edges("d") == []
+
+    @pytest.mark.asyncio
+    async def test_missed_write_makes_projection_stale(self, projection):
+        graph_version.bump()
+        projection.add_ci(graph_version.bump(), "f", "F", "LOW")
+
+        assert not projection.is_current
+        assert projection.traverse(["hub"], 3, True) is None
+        assert "f" not in projection.snapshot.index
+
+    @pytest.mark.asyncio
+    async def test_stale_projection_is_rebuilt(self, projection):
+        graph_version.bump()
+        projection._last_rebuild = 0
+
+        assert projection.traverse(["hub"], 3, True) is None
+        await projection._rebuild_task
+
+        assert projection.is_current
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, projection, monkeypatch):
+        module = importlib.import_module("app.services.graph_projection")
+        monkeypatch.setattr(module, "get_settings", lambda: Settings())
+
+        assert projection.traverse(["hub"], 3, True) is None
+
+
+class TestConsistency:
+    """Test check_consistency."""
+
+    @pytest.mark.asyncio
+    async def test_consistent(self, projection):
+        result = await projection.check_consistency()
+
+        assert result["consistent"]
+        assert result["sampled_cis"] == 6
+        assert projection.is_current
+
+    @pytest.mark.asyncio
+    async def test_drift_marks_projection_stale(self, projection):
+        projection.connection.edges = DIAMOND[:-1]
+
+        result = await projection.check_consistency()
+
+        assert not result["consistent"]
+        assert result["edges"]["DEPENDS_ON"] == {"projection": 6, "database": 5}
+        assert result["mismatched_cis"] == ["hub"]
+        assert not projection.is_current
+
+
+class TestServiceIntegration:
+    """Test that distinct traversals are answered from a current projection."""
+
+    @pytest.mark.asyncio
+    async def test_no_queries_when_current(
+        self, projection, monkeypatch, relationship_service
+    ):
+        module = importlib.import_module("app.services.relationship_service")
+        monkeypatch.setattr(module, "graph_projection", projection)
+        relationship_service.connection = GraphConnection(DIAMOND)
+
+        analysis = await relationship_service.get_impact_analysis(
+            "hub", 5, traversal="distinct"
+        )
+
+        assert relationship_service.connection.calls == []
+        assert analysis["total_impacted"] == 5
+        assert [ci["distance"] for ci in analysis["impacted_cis"]] == [1, 1, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_batch_impact_without_queries(
+        self, projection, monkeypatch, relationship_service
+    ):
+        module = importlib.import_module("app.services.relationship_service")
+        monkeypatch.setattr(module, "graph_projection", projection)
+        relationship_service.connection = GraphConnection(DIAMOND)
+
+        analysis = await relationship_service.get_batch_impact_analysis(["a", "b"], 5)
+
+        assert relationship_service.connection.calls == []
+        assert [ci["ci_id"] for ci in analysis["impacted_cis"]] == [
+            "d",
+            "e",
+            "hub",
+            "c",
+        ]
+        assert analysis["impacted_cis"][0]["sources"] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_cypher_when_stale(
+        self, projection, monkeypatch, relationship_service
+    ):
+        module = importlib.import_module("app.services.relationship_service")
+        monkeypatch.setattr(module, "graph_projection", projection)
+        projection.version = None
+        projection._last_rebuild = float("inf")
+        relationship_service.connection = GraphConnection(DIAMOND)
+
+        analysis = await relationship_service.get_impact_analysis(
+            "hub", 5, traversal="distinct"
+        )
+
+        assert len(relationship_service.connection.calls) == 4
+        assert analysis["total_impacted"] == 5
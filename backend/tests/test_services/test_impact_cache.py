@@ -0,0 +1,187 @@
+"""
+Tests for the impact and dependency result cache.
+"""
+
+import importlib
+
+import pytest
+
+from app.config import Settings
+from app.services.graph_version import GraphVersion, graph_version
+from tests.test_services.test_traversal import DIAMOND, GraphConnection
+
+
+def configure(monkeypatch, **overrides):
+    module = importlib.import_module("app.services.impact_cache")
+    monkeypatch.setattr(module, "get_settings", lambda: Settings(**overrides))
+
+
+@pytest.fixture
+def connection():
+    return GraphConnection(DIAMOND)
+
+
+async def impact(relationship_service, ci_id="hub", max_depth=2):
+    return await relationship_service.get_impact_analysis(
+        ci_id, max_depth, traversal="distinct"
+    )
+
+
+class TestGraphVersion:
+    """Test the touched CIs recorded by graph_version."""
+
+    def test_changes_since(self):
+        version = GraphVersion()
+        version.bump(["a", "b"])
+        version.bump(["c"])
+
+        assert version.changes_since(0) == {"a", "b", "c"}
+        assert version.changes_since(1) == {"c"}
+        assert version.changes_since(2) == set()
+
+    def test_unreported_write_is_unknown(self):
+        version = GraphVersion()
+        version.bump(["a"])
+        version.bump()
+        version.bump(["c"])
+
+        assert version.changes_since(0) is None
+        assert version.changes_since(2) == {"c"}
+
+    def test_forgotten_writes_are_unknown(self):
+        version = GraphVersion(history=2)
+        for ci_id in ("a", "b", "c"):
+            version.bump([ci_id])
+
+        assert version.changes_since(0) is None
+        assert version.changes_since(1) == {"b", "c"}
+
+
+class TestImpactCache:
+    """Test caching in RelationshipService._traverse."""
+
+    @pytest.mark.asyncio
+    async def test_hit_without_queries(self, relationship_service):
+        first = await impact(relationship_service)
+        queries_run = len(relationship_service.connection.calls)
+
+        second = await impact(relationship_service)
+
+        assert second == first
+        assert len(relationship_service.connection.calls) == queries_run
+        stats = relationship_service.get_impact_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_key_includes_depth_direction_and_mode(self, relationship_service):
+        await impact(relationship_service, max_depth=2)
+        await impact(relationship_service, max_depth=3)
+        await relationship_service.get_dependencies("hub", 2, traversal="distinct")
+
+        assert relationship_service.get_impact_cache_stats()["misses"] == 3
+
+    @pytest.mark.asyncio
+    async def test_any_write_invalidates_by_version(self, relationship_service):
+        await impact(relationship_service)
+        graph_version.bump(["unrelated"])
+
+        await impact(relationship_service)
+
+        stats = relationship_service.get_impact_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["invalidations"]) == (0, 2, 1)
+
+    @pytest.mark.asyncio
+    async def test_targeted_keeps_unrelated_results(
+        self, relationship_service, monkeypatch
+    ):
+        configure(monkeypatch, impact_cache_invalidation="targeted")
+        await impact(relationship_service)
+
+        # e is three hops from the hub, beyond the depth analyzed
+        graph_version.bump(["unrelated", "e"])
+        await impact(relationship_service)
+
+        stats = relationship_service.get_impact_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 1, 0)
+
+    @pytest.mark.asyncio
+    async def test_targeted_drops_results_that_reached_a_touched_ci(
+        self, relationship_service, monkeypatch
+    ):
+        configure(monkeypatch, impact_cache_invalidation="targeted")
+        await impact(relationship_service)
+        await impact(relationship_service, ci_id="e")
+
+        graph_version.bump(["d"])
+        await impact(relationship_service)
+        await impact(relationship_service, ci_id="e")
+
+        stats = relationship_service.get_impact_cache_stats()
+        # d is two hops from the hub; e's impact (hub, a, b, c) misses it
+        assert (stats["hits"], stats["invalidations"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_targeted_drops_all_after_unreported_write(
+        self, relationship_service, monkeypatch
+    ):
+        configure(monkeypatch, impact_cache_invalidation="targeted")
+        await impact(relationship_service)
+
+        graph_version.bump()
+        await impact(relationship_service)
+
+        assert relationship_service.get_impact_cache_stats()["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self, relationship_service, monkeypatch):
+        module = importlib.import_module("app.services.impact_cache")
+        configure(monkeypatch, impact_cache_ttl=30.0)
+        now = [1000.0]
+        monkeypatch.setattr(module, "monotonic", lambda: now[0])
+        await impact(relationship_service)
+
+        # A write made by another worker does not bump this worker's version
+        now[0] += 29.0
+        await impact(relationship_service)
+        now[0] += 2.0
+        await impact(relationship_service)
+
+        stats = relationship_service.get_impact_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 2, 1)
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_is_evicted(
+        self, relationship_service, monkeypatch
+    ):
+        configure(monkeypatch, impact_cache_size=2)
+        await impact(relationship_service, ci_id="a")
+        await impact(relationship_service, ci_id="b")
+        await impact(relationship_service, ci_id="a")
+
+        await impact(relationship_service, ci_id="c")
+        await impact(relationship_service, ci_id="a")
+
+        stats = relationship_service.get_impact_cache_stats()
+        assert (stats["entries"], stats["evictions"], stats["hits"]) == (2, 1, 2)
+
+    @pytest.mark.asyncio
+    async def test_large_results_are_not_cached(
+        self, relationship_service, monkeypatch
+    ):
+        configure(monkeypatch, impact_cache_max_records=2)
+
+        await impact(relationship_service)
+        await impact(relationship_service)
+
+        assert relationship_service.get_impact_cache_stats()["entries"] == 0
+        assert relationship_service.get_impact_cache_stats()["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, relationship_service, monkeypatch):
+        configure(monkeypatch, impact_cache_size=0)
+
+        await impact(relationship_service)
+        await impact(relationship_service)
+
+        assert relationship_service.get_impact_cache_stats()["entries"] == 0
+        assert not relationship_service.get_impact_cache_stats()["enabled"]
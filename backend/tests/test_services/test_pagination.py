@@ -0,0 +1,157 @@
+"""
+Tests for keyset pagination of CI and relationship listings.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from neo4j.time import DateTime
+
+from app.models.ci import CIType
+from app.services import queries
+from app.services.pagination import InvalidCursorError, decode_cursor
+from tests.conftest import FakeConnection
+
+
+def ci_row(ci_id, name):
+    return {"ci": {"id": ci_id, "name": name}}
+
+
+def relationship_row(rel_id, created_at):
+    return {
+        "rel_id": rel_id,
+        "rel_type": "DEPENDS_ON",
+        "rel_created_at": created_at,
+        "from_ci_id": "a",
+        "from_ci_name": "A",
+        "to_ci_id": "b",
+        "to_ci_name": "B",
+    }
+
+
+class TestCIKeyset:
+    """Test cursor paging of get_all_cis."""
+
+    @pytest.mark.asyncio
+    async def test_first_page_returns_cursor(self, ci_service):
+        ci_service.connection = FakeConnection(
+            [ci_row("1", "alpha"), ci_row("2", "beta"), ci_row("3", "gamma")]
+        )
+
+        cis, next_cursor, total_count = await ci_service.get_all_cis(limit=2)
+
+        assert [ci.id for ci in cis] == ["1", "2"]
+        assert decode_cursor(next_cursor) == {"name": "beta", "id": "2"}
+        query, parameters = ci_service.connection.calls[0]
+        assert query == queries.list_cis_query([])
+        assert parameters["offset"] == 0
+        assert total_count is None
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self, ci_service):
+        ci_service.connection = FakeConnection([ci_row("1", "alpha")])
+
+        _, next_cursor, _ = await ci_service.get_all_cis(limit=2)
+
+        assert next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_cursor_uses_keyset_query(self, ci_service):
+        ci_service.connection = FakeConnection(
+            [ci_row("1", "alpha"), ci_row("2", "beta")]
+        )
+        _, next_cursor, _ = await ci_service.get_all_cis(limit=1)
+
+        await ci_service.get_all_cis(limit=1, cursor=next_cursor)
+
+        query, parameters = ci_service.connection.calls[-1]
+        assert query == queries.list_cis_query([], after_cursor=True)
+        assert parameters["cursor_name"] == "alpha"
+        assert parameters["cursor_id"] == "1"
+        assert "offset" not in parameters
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, ci_service):
+        ci_service.connection = FakeConnection([])
+
+        with pytest.raises(InvalidCursorError):
+            await ci_service.get_all_cis(cursor="garbage!")
+
+
+class TestCICount:
+    """Test the count modes of get_all_cis."""
+
+    @pytest.mark.asyncio
+    async def test_exact_count_in_one_query(self, ci_service):
+        ci_service.connection = FakeConnection(
+            [ci_row("1", "alpha"), ci_row("2", "beta"), ci_row("3", "gamma")], 42
+        )
+
+        cis, next_cursor, total_count = await ci_service.get_all_cis(
+            ci_type=CIType.DATABASE, limit=2, count="exact"
+        )
+
+        assert len(ci_service.connection.calls) == 1
+        query, _ = ci_service.connection.calls[0]
+        assert query == queries.list_cis_query(["ci_type"], with_count=True)
+        assert [ci.id for ci in cis] == ["1", "2"]
+        assert next_cursor is not None
+        assert total_count == 42
+
+    @pytest.mark.asyncio
+    async def test_estimated_count_without_filters_uses_count_store(self, ci_service):
+        ci_service.connection = FakeConnection([ci_row("1", "alpha")], 1_000_000)
+
+        _, _, total_count = await ci_service.get_all_cis(count="estimated")
+
+        assert total_count == 1_000_000
+        assert ci_service.connection.calls[-1][0] == queries.COUNT_CIS
+        assert ci_service.connection.explained == []
+
+    @pytest.mark.asyncio
+    async def test_estimated_count_with_filters_uses_plan(self, ci_service):
+        ci_service.connection = FakeConnection([], 0, estimated_rows=1234.6)
+
+        _, _, total_count = await ci_service.get_all_cis(
+            ci_type=CIType.DATABASE, count="estimated"
+        )
+
+        assert total_count == 1235
+        query, parameters, _ = ci_service.connection.explained[0]
+        assert query == queries.stream_cis_query(["ci_type"])
+        assert parameters == {"ci_type": "DATABASE"}
+
+    @pytest.mark.asyncio
+    async def test_unknown_count_mode(self, ci_service):
+        ci_service.connection = FakeConnection([], 0)
+
+        with pytest.raises(ValueError):
+            await ci_service.get_all_cis(count="approximate")
+
+
+class TestRelationshipKeyset:
+    """Test cursor paging of get_all_relationships."""
+
+    @pytest.mark.asyncio
+    async def test_cursor_holds_created_at_and_id(self, relationship_service):
+        created_at = DateTime.from_native(
+            datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+        )
+        relationship_service.connection = FakeConnection(
+            [relationship_row("r2", created_at), relationship_row("r1", created_at)]
+        )
+
+        relationships, next_cursor = await relationship_service.get_all_relationships(
+            limit=1
+        )
+
+        assert [r["id"] for r in relationships] == ["r2"]
+        position = decode_cursor(next_cursor)
+        assert position["id"] == "r2"
+        assert position["created_at"].startswith("2024-05-01T12:00:00")
+
+        await relationship_service.get_all_relationships(limit=1, cursor=next_cursor)
+        query, parameters = relationship_service.connection.calls[-1]
+        assert query == queries.LIST_RELATIONSHIPS_AFTER
+        assert parameters["cursor_id"] == "r2"
+        assert parameters["cursor_created_at"] == position["created_at"]
@@ -0,0 +1,85 @@
+"""
+Tests for sparse fieldsets on CI listings and search.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from neo4j.time import DateTime
+
+from app.models.ci import CISummary
+from app.services import queries
+from app.services.pagination import decode_cursor
+from tests.conftest import FakeConnection
+
+
+class TestListProjection:
+    """Test get_all_cis with a sparse fieldset."""
+
+    @pytest.mark.asyncio
+    async def test_projected_query_and_summaries(self, ci_service):
+        ci_service.connection = FakeConnection(
+            [{"ci": ["1", "alpha", "PROD"]}, {"ci": ["2", "beta", None]}]
+        )
+
+        cis, next_cursor, _ = await ci_service.get_all_cis(
+            limit=1, fields=["environment"]
+        )
+
+        query, parameters = ci_service.connection.calls[0]
+        assert query == queries.list_cis_query([], projected=True)
+        assert parameters["fields"] == ["id", "name", "environment"]
+        assert cis == [CISummary(id="1", name="alpha", environment="PROD")]
+        assert decode_cursor(next_cursor) == {"name": "alpha", "id": "1"}
+
+    @pytest.mark.asyncio
+    async def test_projected_with_exact_count(self, ci_service):
+        updated_at = DateTime.from_native(datetime(2024, 5, 1, tzinfo=timezone.utc))
+        ci_service.connection = FakeConnection(
+            [{"ci": ["1", "alpha", updated_at]}], total_count=7
+        )
+
+        cis, _, total_count = await ci_service.get_all_cis(
+            count="exact", fields=["updated_at", "id"]
+        )
+
+        query, parameters = ci_service.connection.calls[0]
+        assert query == queries.list_cis_query([], with_count=True, projected=True)
+        assert parameters["fields"] == ["id", "name", "updated_at"]
+        assert cis[0].updated_at == updated_at.to_native()
+        assert total_count == 7
+
+    @pytest.mark.asyncio
+    async def test_unknown_field(self, ci_service):
+        ci_service.connection = FakeConnection([])
+
+        with pytest.raises(ValueError):
+            await ci_service.get_all_cis(fields=["custom_attributes"])
+
+
+class TestSearchProjection:
+    """Test search_cis with a sparse fieldset."""
+
+    @pytest.mark.asyncio
+    async def test_projected_search_keeps_score(self, ci_service):
+        ci_service.connection = FakeConnection(
+            [
+                {"ci": ["1", "alpha", "10.0.0.1"], "score": 2.5},
+                {"ci": ["2", "beta", "10.0.0.2"], "score": 1.5},
+            ]
+        )
+
+        cis, next_cursor = await ci_service.search_cis(
+            "alpha", limit=1, fields=["ip_address"]
+        )
+
+        query, parameters = ci_service.connection.calls[0]
+        assert query == queries.SEARCH_CIS_PROJECTED
+        assert parameters["fields"] == ["id", "name", "ip_address"]
+        assert cis[0].model_dump() == {
+            "id": "1",
+            "name": "alpha",
+            "ip_address": "10.0.0.1",
+            "score": 2.5,
+        }
+        assert decode_cursor(next_cursor) == {"score": 2.5, "id": "1"}
@@ -0,0 +1,107 @@
+"""
+Tests for the canonical query registry.
+"""
+
+import pytest
+
+from app.models.base import CriticalityLevel, EnvironmentType
+from app.models.ci import CIType
+from app.services import queries
+
+
+class TestRegistry:
+    """Test the registry contents."""
+
+    def test_registry_is_bounded(self):
+        # 8 filter combinations for list (first page or after cursor, with
+        # or without count, whole or projected), stream and facets,
+        # 2 traversals x 2 orderings x 2 relationship storage modes x
+        # MAX_TRAVERSAL_DEPTH, plus the fixed statements
+        assert len(queries.all_queries()) < 175
+        assert len(set(queries.all_queries())) == len(queries.QUERIES)
+
+    def test_statements_use_parameters_only(self):
+        for text in queries.all_queries():
+            assert "{max_depth}" not in text
+            assert "'DEPENDS_ON'" not in text
+
+    def test_traversal_depth_is_validated(self):
+        with pytest.raises(ValueError):
+            queries.impact_query(0)
+        with pytest.raises(ValueError):
+            queries.dependencies_query(queries.MAX_TRAVERSAL_DEPTH + 1)
+
+    def test_unknown_filter_is_rejected(self):
+        with pytest.raises(ValueError):
+            queries.list_cis_query({"hostname"})
+
+    def test_filter_order_does_not_matter(self):
+        assert queries.list_cis_query(
+            ["environment", "ci_type"]
+        ) == queries.list_cis_query(["ci_type", "environment"])
+
+
+class TestServiceQueries:
+    """Test that the services only send registered statements."""
+
+    @pytest.mark.asyncio
+    async def test_ci_list_variants_are_bounded(self, ci_service, connection):
+        for ci_type in (None, CIType.HARDWARE, CIType.APPLICATION):
+            for environment in (
+                None,
+                EnvironmentType.PRODUCTION,
+                EnvironmentType.DEVELOPMENT,
+            ):
+                for criticality in (None, CriticalityLevel.HIGH):
+                    for offset in (0, 50, 100):
+                        await ci_service.get_all_cis(
+                            ci_type, environment, criticality, 50, offset
+                        )
+
+        # Values vary freely, but only one text per filter combination is used
+        assert len(set(connection.statements)) == 8
+        assert set(connection.statements) <= set(queries.all_queries())
+
+    @pytest.mark.asyncio
+    async def test_update_uses_single_statement(self, ci_service, connection):
+        await ci_service.update_ci("ci-1", {"name": "a"})
+        await ci_service.update_ci(
+            "ci-1", {"description": "b", "criticality": CriticalityLevel.LOW}
+        )
+
+        assert set(connection.statements) == {queries.UPDATE_CI}
+        _, parameters = connection.calls[-1]
+        assert parameters["properties"] == {"description": "b", "criticality": "LOW"}
+
+    @pytest.mark.asyncio
+    async def test_traversals_are_bounded(self, relationship_service, connection):
+        for depth in range(1, queries.MAX_TRAVERSAL_DEPTH + 1):
+            for ci_id in ("ci-1", "ci-2"):
+                await relationship_service.get_impact_analysis(ci_id, depth)
+                await relationship_service.get_dependencies(ci_id, depth)
+
+        assert len(set(connection.statements)) == 2 * queries.MAX_TRAVERSAL_DEPTH
+        assert set(connection.statements) <= set(queries.all_queries())
+        for _, parameters in connection.calls:
+            assert parameters["relationship_types"] == (
+                queries.DEPENDENCY_RELATIONSHIP_TYPES
+            )
+
+    @pytest.mark.asyncio
+    async def test_all_operations_use_registry(
+        self, ci_service, relationship_service, connection
+    ):
+        await ci_service.get_ci("ci-1")
+        await ci_service.delete_ci("ci-1")
+        await ci_service.search_cis("web")
+        await ci_service.get_ci_count()
+        async for _ in ci_service.stream_all_cis(ci_type=CIType.HARDWARE):
+            pass
+        for direction in ("outgoing", "incoming", "both"):
+            await relationship_service.get_ci_relationships("ci-1", direction)
+        await relationship_service.delete_relationship("rel-1")
+        await relationship_service.get_all_relationships()
+        await relationship_service.get_graph_statistics()
+        await relationship_service.get_busfactor_analysis()
+
+        assert set(connection.statements) <= set(queries.all_queries())
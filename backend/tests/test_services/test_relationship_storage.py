@@ -0,0 +1,141 @@
+"""
+Tests for native relationship types and the legacy edge migration.
+"""
+
+import importlib
+
+import pytest
+
+from app.config import Settings
+from app.services import queries
+from app.services.schema import SCHEMA_STATEMENTS
+from tests.conftest import FakeConnection
+
+
+class MigrationConnection(FakeConnection):
+    """Connection stand-in migrating a fixed number of legacy edges."""
+
+    def __init__(self, legacy, unknown=0):
+        super().__init__()
+        self.legacy = legacy
+        self.unknown = unknown
+        self.batches = []
+
+    def answer(self, query, parameters):
+        if query == queries.COUNT_LEGACY_RELATIONSHIPS:
+            return [{"legacy_count": self.legacy + self.unknown}]
+        assert query == queries.MIGRATE_RELATIONSHIP_TYPES
+        migrated = min(self.legacy, parameters["batch_size"])
+        self.legacy -= migrated
+        self.batches.append(migrated)
+        return [{"migrated_count": migrated}]
+
+
+@pytest.fixture
+def native_storage(monkeypatch):
+    module = importlib.import_module("app.services.relationship_service")
+    monkeypatch.setattr(
+        module, "get_settings", lambda: Settings(relationship_storage="native")
+    )
+
+
+class TestQueries:
+    """Test the statements for each relationship storage mode."""
+
+    def test_native_traversal_uses_typed_expansion(self):
+        query = queries.impact_query(3, storage="native")
+
+        assert "[:DEPENDS_ON|RUNS_ON|HOSTS|USES*1..3]" in query
+        assert "RELATED" not in query
+        assert "$relationship_types" not in query
+
+    def test_dual_traversal_reads_legacy_and_native_edges(self):
+        query = queries.dependencies_query(3)
+
+        assert "[:RELATED|DEPENDS_ON|RUNS_ON|HOSTS|USES*1..3]" in query
+        assert "r.type IN $relationship_types" in query
+
+    def test_unknown_storage_is_rejected(self):
+        with pytest.raises(ValueError):
+            queries.impact_query(3, storage="legacy")
+
+    def test_writes_use_native_types(self):
+        for query in (
+            queries.CREATE_RELATIONSHIP,
+            queries.BULK_CREATE_RELATIONSHIPS,
+            queries.CREATE_CI_WITH_RELATIONSHIPS,
+        ):
+            assert "apoc.create.relationship" in query
+            assert ":RELATED" not in query
+
+    def test_delete_looks_up_every_type(self):
+        for rel_type in [queries.LEGACY_RELATIONSHIP_TYPE] + queries.RELATIONSHIP_TYPES:
+            assert f"[r:{rel_type} {{id: $relationship_id}}]" in (
+                queries.DELETE_RELATIONSHIP
+            )
+
+    def test_every_type_has_an_id_index(self):
+        statements = " ".join(statement for _, statement in SCHEMA_STATEMENTS)
+        for rel_type in queries.RELATIONSHIP_TYPES:
+            assert f"FOR ()-[r:{rel_type}]-() ON (r.id)" in statements
+
+    def test_listing_reads_every_type_in_index_order(self):
+        statements = " ".join(statement for _, statement in SCHEMA_STATEMENTS)
+        for query in (queries.LIST_RELATIONSHIPS, queries.LIST_RELATIONSHIPS_AFTER):
+            assert "-[r]->" not in query
+            for rel_type in [queries.LEGACY_RELATIONSHIP_TYPE] + (
+                queries.RELATIONSHIP_TYPES
+            ):
+                assert f"(from_ci:CI)-[r:{rel_type}]->(to_ci:CI)" in query
+                assert f"FOR ()-[r:{rel_type}]-() ON (r.created_at, r.id)" in statements
+
+
+class TestStorageSetting:
+    """Test that RelationshipService reads with the configured storage."""
+
+    @pytest.mark.asyncio
+    async def test_dual_by_default(self, relationship_service, connection):
+        await relationship_service.get_impact_analysis("ci-1", 2)
+        await relationship_service.get_busfactor_analysis()
+
+        assert connection.statements == [
+            queries.impact_query(2, storage="dual"),
+            queries.BUSFACTOR["dual"],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_native(self, relationship_service, connection, native_storage):
+        await relationship_service.get_impact_analysis("ci-1", 2)
+        await relationship_service.get_dependencies("ci-1", 2, traversal="distinct")
+        await relationship_service.get_busfactor_analysis()
+
+        assert connection.statements == [
+            queries.impact_query(2, storage="native"),
+            queries.DEPENDENCIES_LEVEL["native"],
+            queries.BUSFACTOR["native"],
+        ]
+
+    def test_setting_is_validated(self):
+        with pytest.raises(ValueError):
+            Settings(relationship_storage="RELATED")
+
+
+class TestMigration:
+    """Test migrate_relationship_types."""
+
+    @pytest.mark.asyncio
+    async def test_migrates_in_batches(self, relationship_service):
+        relationship_service.connection = MigrationConnection(legacy=25)
+
+        result = await relationship_service.migrate_relationship_types(batch_size=10)
+
+        assert result == {"migrated": 25, "remaining": 0}
+        assert relationship_service.connection.batches == [10, 10, 5, 0]
+
+    @pytest.mark.asyncio
+    async def test_reports_unknown_types_as_remaining(self, relationship_service):
+        relationship_service.connection = MigrationConnection(legacy=3, unknown=2)
+
+        result = await relationship_service.migrate_relationship_types(batch_size=10)
+
+        assert result == {"migrated": 3, "remaining": 2}
@@ -0,0 +1,58 @@
+"""
+Tests for the schema bootstrap.
+"""
+
+import pytest
+
+from app.services.schema import SCHEMA_STATEMENTS, ensure_schema
+from tests.conftest import FakeConnection
+
+
+class SchemaConnection(FakeConnection):
+    """Connection stand-in failing the schema statements of some names."""
+
+    def __init__(self, failing=()):
+        super().__init__()
+        self.failing = set(failing)
+
+    async def execute_write_query(self, query, parameters=None):
+        if any(name in query for name in self.failing):
+            raise RuntimeError("constraint violated")
+        return await super().execute_write_query(query, parameters)
+
+
+class TestSchema:
+    """Test creating constraints and indexes."""
+
+    def test_statements_are_idempotent(self):
+        for _, statement in SCHEMA_STATEMENTS:
+            assert "IF NOT EXISTS" in statement
+
+    def test_statement_names_match_schema_names(self):
+        names = [name for name, _ in SCHEMA_STATEMENTS]
+        assert len(names) == len(set(names))
+        for name, statement in SCHEMA_STATEMENTS:
+            assert f" {name} IF NOT EXISTS" in statement
+
+    def test_covers_lookup_and_filter_properties(self):
+        statements = " ".join(statement for _, statement in SCHEMA_STATEMENTS)
+        assert "REQUIRE ci.id IS UNIQUE" in statements
+        for prop in ("r.id", "r.type", "ci.name", "ci.ci_type", "ci.environment"):
+            assert f"({prop})" in statements
+        assert "(ci.ci_type, ci.environment, ci.criticality)" in statements
+
+    @pytest.mark.asyncio
+    async def test_applies_every_statement(self, connection):
+        failed = await ensure_schema(connection)
+
+        assert failed == []
+        assert connection.statements == [s for _, s in SCHEMA_STATEMENTS]
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_stop_bootstrap(self):
+        connection = SchemaConnection(failing=["ci_id_unique"])
+
+        failed = await ensure_schema(connection)
+
+        assert failed == ["ci_id_unique"]
+        assert len(connection.statements) == len(SCHEMA_STATEMENTS) - 1
@@ -0,0 +1,89 @@
+"""
+Tests for full-text CI search and pagination cursors.
+"""
+
+import pytest
+
+from app.services import queries
+from app.services.ci_service import build_fulltext_query
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from tests.conftest import FakeConnection
+
+
+def search_row(ci_id, score):
+    return {"ci": {"id": ci_id, "name": f"server-{ci_id}"}, "score": score}
+
+
+class TestFulltextQuery:
+    """Test building Lucene queries from user input."""
+
+    def test_terms_match_exact_prefix_and_fuzzy(self):
+        assert build_fulltext_query("Server") == "(server^2 OR server* OR server~1)"
+
+    def test_short_terms_are_not_fuzzy(self):
+        assert build_fulltext_query("db") == "(db^2 OR db*)"
+
+    def test_all_terms_are_required(self):
+        assert build_fulltext_query("web prod").count(" AND ") == 1
+
+    def test_special_characters_are_escaped(self):
+        query = build_fulltext_query('srv-01 a:b "x"')
+        assert "srv\\-01" in query
+        assert "a\\:b" in query
+        assert '\\"x\\"' in query
+
+    def test_operators_are_plain_terms(self):
+        assert build_fulltext_query("OR") == "(or^2 OR or*)"
+
+    def test_blank_input(self):
+        assert build_fulltext_query("   ") == ""
+
+
+class TestCursor:
+    """Test opaque pagination cursors."""
+
+    def test_round_trip(self):
+        position = {"score": 1.5, "id": "ci-1"}
+        assert decode_cursor(encode_cursor(position)) == position
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor!", "bnVsbA", "W10"])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+
+class TestSearchCIs:
+    """Test the full-text backed search."""
+
+    @pytest.mark.asyncio
+    async def test_returns_scored_results(self, ci_service):
+        ci_service.connection = FakeConnection([search_row("a", 2.0)])
+
+        cis, next_cursor = await ci_service.search_cis("server", limit=10)
+
+        assert [(ci.id, ci.score) for ci in cis] == [("a", 2.0)]
+        assert next_cursor is None
+        query, parameters = ci_service.connection.calls[0]
+        assert query == queries.SEARCH_CIS
+        assert parameters["cursor_score"] is None
+
+    @pytest.mark.asyncio
+    async def test_next_cursor_continues_after_last_row(self, ci_service):
+        rows = [search_row("a", 3.0), search_row("b", 2.0), search_row("c", 1.0)]
+        ci_service.connection = FakeConnection(rows)
+
+        cis, next_cursor = await ci_service.search_cis("server", limit=2)
+        assert [ci.id for ci in cis] == ["a", "b"]
+        assert decode_cursor(next_cursor) == {"score": 2.0, "id": "b"}
+
+        await ci_service.search_cis("server", limit=2, cursor=next_cursor)
+        _, parameters = ci_service.connection.calls[-1]
+        assert parameters["cursor_score"] == 2.0
+        assert parameters["cursor_id"] == "b"
+
+    @pytest.mark.asyncio
+    async def test_blank_query_skips_database(self, ci_service):
+        ci_service.connection = FakeConnection([])
+
+        assert await ci_service.search_cis("  ") == ([], None)
+        assert ci_service.connection.calls == []
@@ -0,0 +1,249 @@
+"""
+Tests for the distinct breadth-first impact and dependency traversal.
+"""
+
+import pytest
+
+from app.services import queries
+from tests.conftest import FakeConnection
+
+
+class GraphConnection(FakeConnection):
+    """Connection stand-in answering traversal levels from an edge list."""
+
+    def __init__(self, edges, criticality=None):
+        super().__init__()
+        # (from_ci_id, to_ci_id, type): from_ci_id depends on to_ci_id
+        self.edges = edges
+        self.criticality = criticality or {}
+
+    def answer(self, query, parameters):
+        if query in queries.IMPACT_BATCH_LEVEL.values():
+            return [
+                {
+                    "ci_id": source,
+                    "ci_name": source.upper(),
+                    "criticality": self.criticality.get(source, "MEDIUM"),
+                    "parent_id": target,
+                    "relationship_type": rel_type,
+                }
+                for source, target, rel_type in self.edges
+                if target in parameters["frontier"]
+                and rel_type in parameters["relationship_types"]
+            ]
+        impact = query in queries.IMPACT_LEVEL.values()
+        assert impact or query in queries.DEPENDENCIES_LEVEL.values()
+
+        reached = {}
+        for source, target, rel_type in self.edges:
+            parent, child = (target, source) if impact else (source, target)
+            if (
+                parent in parameters["frontier"]
+                and rel_type in parameters["relationship_types"]
+            ):
+                reached.setdefault(child, (parent, rel_type))
+        return [
+            {
+                "ci_id": child,
+                "ci_name": child.upper(),
+                "criticality": self.criticality.get(child, "MEDIUM"),
+                "parent_id": parent,
+                "relationship_type": rel_type,
+            }
+            for child, (parent, rel_type) in reached.items()
+        ]
+
+
+# a, b and c all depend on hub; d depends on a, b and c; e depends on d
+DIAMOND = [
+    ("a", "hub", "DEPENDS_ON"),
+    ("b", "hub", "RUNS_ON"),
+    ("c", "hub", "DEPENDS_ON"),
+    ("d", "a", "DEPENDS_ON"),
+    ("d", "b", "DEPENDS_ON"),
+    ("d", "c", "DEPENDS_ON"),
+    ("e", "d", "USES"),
+    ("hub", "e", "DEPENDS_ON"),
+]
+
+
+class TestDistinctImpact:
+    """Test get_impact_analysis with traversal=distinct."""
+
+    @pytest.mark.asyncio
+    async def test_each_ci_once_at_minimal_distance(self, relationship_service):
+        relationship_service.connection = GraphConnection(DIAMOND, {"d": "CRITICAL"})
+
+        analysis = await relationship_service.get_impact_analysis(
+            "hub", 5, traversal="distinct"
+        )
+
+        distances = {ci["ci_id"]: ci["distance"] for ci in analysis["impacted_cis"]}
+        assert distances == {"a": 1, "b": 1, "c": 1, "d": 2, "e": 3}
+        assert analysis["total_impacted"] == 5
+        assert analysis["criticality_breakdown"]["CRITICAL"] == 1
+        assert analysis["risk_score"] == 10 + 4 * 2
+
+    @pytest.mark.asyncio
+    async def test_one_level_query_per_depth(self, relationship_service):
+        relationship_service.connection = GraphConnection(DIAMOND)
+
+        await relationship_service.get_impact_analysis("hub", 5, traversal="distinct")
+
+        frontiers = [
+            params["frontier"] for _, params in relationship_service.connection.calls
+        ]
+        # The source is visited, so the cycle through e stops after level 3
+        assert frontiers == [["hub"], ["a", "b", "c"], ["d"], ["e"]]
+        # Visited CIs are filtered here, not sent with every level
+        assert all(
+            set(params) == {"frontier", "relationship_types"}
+            for _, params in relationship_service.connection.calls
+        )
+
+    @pytest.mark.asyncio
+    async def test_representative_chain(self, relationship_service):
+        relationship_service.connection = GraphConnection(DIAMOND)
+
+        analysis = await relationship_service.get_impact_analysis(
+            "hub", 5, traversal="distinct"
+        )
+
+        chains = {
+            ci["ci_id"]: ci["relationship_chain"] for ci in analysis["impacted_cis"]
+        }
+        assert chains["e"] == ["DEPENDS_ON", "DEPENDS_ON", "USES"]
+        assert len(chains["d"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_depth_limit(self, relationship_service):
+        relationship_service.connection = GraphConnection(DIAMOND)
+
+        analysis = await relationship_service.get_impact_analysis(
+            "hub", 1, traversal="distinct"
+        )
+
+        assert [ci["ci_id"] for ci in analysis["impacted_cis"]] == ["a", "b", "c"]
+        assert len(relationship_service.connection.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_ordered_by_distance_then_criticality(self, relationship_service):
+        relationship_service.connection = GraphConnection(
+            DIAMOND, {"a": "LOW", "c": "HIGH"}
+        )
+
+        analysis = await relationship_service.get_impact_analysis(
+            "hub", 2, traversal="distinct"
+        )
+
+        assert [ci["ci_id"] for ci in analysis["impacted_cis"]] == [
+            "b",
+            "a",
+            "c",
+            "d",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments(self, relationship_service):
+        relationship_service.connection = GraphConnection(DIAMOND)
+
+        with pytest.raises(ValueError):
+            await relationship_service.get_impact_analysis("hub", 3, traversal="walk")
+        with pytest.raises(ValueError):
+            await relationship_service.get_impact_analysis(
+                "hub", queries.MAX_TRAVERSAL_DEPTH + 1, traversal="distinct"
+            )
+
+
+class TestDistinctDependencies:
+    """Test get_dependencies with traversal=distinct."""
+
+    @pytest.mark.asyncio
+    async def test_follows_outgoing_edges(self, relationship_service):
+        relationship_service.connection = GraphConnection(DIAMOND)
+
+        result = await relationship_service.get_dependencies(
+            "d", 2, traversal="distinct"
+        )
+
+        assert (
+            relationship_service.connection.calls[0][0]
+            == queries.DEPENDENCIES_LEVEL["dual"]
+        )
+        assert {ci["ci_id"]: ci["distance"] for ci in result["dependencies"]} == {
+            "a": 1,
+            "b": 1,
+            "c": 1,
+            "hub": 2,
+        }
+        assert result["total_dependencies"] == 4
+
+
+class TestBatchImpact:
+    """Test get_batch_impact_analysis."""
+
+    @pytest.mark.asyncio
+    async def test_sources_reaching_each_ci(self, relationship_service):
+        relationship_service.connection = GraphConnection(DIAMOND)
+
+        analysis = await relationship_service.get_batch_impact_analysis(["a", "b"], 5)
+
+        impacted = {ci["ci_id"]: ci for ci in analysis["impacted_cis"]}
+        assert {ci_id: ci["distance"] for ci_id, ci in impacted.items()} == {
+            "d": 1,
+            "e": 2,
+            "hub": 3,
+            "c": 4,
+        }
+        assert all(ci["sources"] == ["a", "b"] for ci in impacted.values())
+        assert analysis["source_cis"] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_shared_dependents_counted_once(self, relationship_service):
+        relationship_service.connection = GraphConnection(DIAMOND, {"d": "CRITICAL"})
+
+        analysis = await relationship_service.get_batch_impact_analysis(
+            ["a", "b", "c"], 2
+        )
+
+        assert [ci["ci_id"] for ci in analysis["impacted_cis"]] == ["d", "e"]
+        assert analysis["total_impacted"] == 2
+        assert analysis["criticality_breakdown"]["CRITICAL"] == 1
+        assert analysis["risk_score"] == 10 + 2
+
+    @pytest.mark.asyncio
+    async def test_minimal_distance_to_any_source(self, relationship_service):
+        relationship_service.connection = GraphConnection(DIAMOND)
+
+        analysis = await relationship_service.get_batch_impact_analysis(["hub", "e"], 2)
+
+        impacted = {ci["ci_id"]: ci for ci in analysis["impacted_cis"]}
+        # d is one hop from e's failure (a, b, c) and two from the hub's
+        assert impacted["a"]["distance"] == 1
+        assert impacted["a"]["sources"] == ["e", "hub"]
+        assert impacted["d"]["distance"] == 2
+        assert impacted["d"]["sources"] == ["hub"]
+        assert impacted["a"]["relationship_chain"] == ["DEPENDS_ON"]
+
+    @pytest.mark.asyncio
+    async def test_traverses_through_other_sources(self, relationship_service):
+        relationship_service.connection = GraphConnection(DIAMOND)
+
+        analysis = await relationship_service.get_batch_impact_analysis(["hub", "d"], 3)
+
+        impacted = {ci["ci_id"]: ci for ci in analysis["impacted_cis"]}
+        assert set(impacted) == {"a", "b", "c", "e"}
+        assert impacted["e"]["distance"] == 1
+        assert impacted["e"]["sources"] == ["d", "hub"]
+
+    @pytest.mark.asyncio
+    async def test_each_ci_expanded_once_per_source(self, relationship_service):
+        relationship_service.connection = GraphConnection(DIAMOND)
+
+        await relationship_service.get_batch_impact_analysis(["a", "a", "b"], 5)
+
+        frontiers = [
+            params["frontier"] for _, params in relationship_service.connection.calls
+        ]
+        # a and b are expanded again once each has reached the other
+        assert frontiers == [["a", "b"], ["d"], ["e"], ["hub"], ["a", "b", "c"]]
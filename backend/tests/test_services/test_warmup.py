@@ -0,0 +1,77 @@
+"""
+Tests for the query plan warm-up.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services import queries
+from app.services.warmup import warm_up_query_plans
+from tests.conftest import FakeConnection
+
+
+class ExplainingConnection(FakeConnection):
+    """Connection stand-in planning slowly, failing to plan some statements."""
+
+    def __init__(self, delay=0.0, failing=()):
+        super().__init__()
+        self.delay = delay
+        self.failing = set(failing)
+
+    async def explain(self, query, parameters=None, access_mode="READ"):
+        await asyncio.sleep(self.delay)
+        if query in self.failing:
+            raise RuntimeError("planning failed")
+        return await super().explain(query, parameters, access_mode)
+
+
+class TestWarmup:
+    """Test warming up the plan cache."""
+
+    @pytest.mark.asyncio
+    async def test_explains_every_registered_query(self, connection):
+
+        timings = await warm_up_query_plans(connection, timeout=5)
+
+        assert set(timings) == set(queries.QUERIES)
+        assert all(t is not None for t in timings.values())
+        assert [q for q, _, _ in connection.explained] == queries.all_queries()
+
+    @pytest.mark.asyncio
+    async def test_uses_write_access_for_write_queries(self, connection):
+
+        await warm_up_query_plans(connection, timeout=5)
+
+        modes = {query: mode for query, _, mode in connection.explained}
+        assert modes[queries.UPDATE_CI] == "WRITE"
+        assert modes[queries.GET_CI] == "READ"
+
+    @pytest.mark.asyncio
+    async def test_passes_parameters_used_by_query(self, connection):
+
+        await warm_up_query_plans(connection, timeout=5)
+
+        parameters = {query: params for query, params, _ in connection.explained}
+        assert set(parameters[queries.impact_query(3)]) == {
+            "ci_id",
+            "relationship_types",
+        }
+        assert parameters[queries.COUNT_CIS] == {}
+
+    @pytest.mark.asyncio
+    async def test_failures_do_not_stop_warmup(self):
+        connection = ExplainingConnection(failing=[queries.GET_CI])
+
+        timings = await warm_up_query_plans(connection, timeout=5)
+
+        assert timings["ci.get"] is None
+        assert len(connection.explained) == len(queries.QUERIES) - 1
+
+    @pytest.mark.asyncio
+    async def test_stops_at_timeout(self):
+        connection = ExplainingConnection(delay=0.05)
+
+        timings = await warm_up_query_plans(connection, timeout=0.12)
+
+        assert 0 < len(timings) < len(queries.QUERIES)